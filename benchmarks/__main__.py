@@ -0,0 +1,303 @@
+"""
+Benchmark the stages of the validation pipeline on synthetic data.
+
+Run from the repository's root directory, for example:
+
+    python -m benchmarks run --standard-zip standard.zip -o report.json
+    python -m benchmarks compare before.json after.json
+"""
+
+import copy
+import datetime as dt
+import functools
+import gc
+import http.server
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+import tracemalloc
+from importlib.metadata import PackageNotFoundError, version
+
+import click
+
+from benchmarks.generate import package, write_package
+from libcoveocds.api import ocds_json_output
+from libcoveocds.common_checks import common_checks_ocds
+from libcoveocds.config import LibCoveOCDSConfig
+from libcoveocds.lib.additional_checks import CHECKS, run_additional_checks
+from libcoveocds.lib.api import context_api_transform
+from libcoveocds.schema import SchemaOCDS, schema_cache_clear
+from libcoveocds.util import compact, load
+
+EXTENSION_DIRECTORY = os.path.join(os.path.dirname(os.path.realpath(__file__)), "fixtures", "extension")
+KEY_FIELDS = ("package", "size", "extensions", "errors", "stream", "stage")
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002 # http.server API
+        pass
+
+
+def serve_extension():
+    """Serve the local extension fixture in a background thread, and return its extension.json URL."""
+    handler = functools.partial(_QuietHandler, directory=EXTENSION_DIRECTORY)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/extension.json"
+
+
+def measure(function, *, setup=None, memory=True):
+    """
+    Call the function, and return its wall time, CPU time and, if ``memory`` is set, peak and retained allocation.
+
+    The peak allocation is measured by calling the function again with tracemalloc, which slows it down. The retained
+    allocation is the memory still allocated when the function returns, like the memory of the data that it loads.
+    If ``setup`` is set, its return value is passed to the function, and it is called before each call, outside the
+    measurement.
+    """
+    args = () if setup is None else (setup(),)
+    gc.collect()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    result = function(*args)
+    measurement = {
+        "wall": time.perf_counter() - wall,
+        "cpu": time.process_time() - cpu,
+        "peak_memory": None,
+        "retained_memory": None,
+    }
+
+    if memory:
+        args = () if setup is None else (setup(),)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            retained = function(*args)  # noqa: F841 # retain the return value while measuring
+            gc.collect()
+            measurement["retained_memory"], measurement["peak_memory"] = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return result, measurement
+
+
+def benchmark(config, package_type, size, *, errors, extensions, stream, memory):
+    """Yield the stage name and measurement for each stage, for one synthetic package."""
+    with tempfile.TemporaryDirectory(prefix="lib-cove-ocds-benchmarks-") as directory:
+        path = os.path.join(directory, "package.json")
+        with open(path, "w") as f:
+            write_package(f, package_type, size, errors=errors, extensions=extensions)
+        metadata = package(package_type, 0, extensions=extensions)
+        record_pkg = package_type == "record"
+
+        def schema():
+            schema_cache_clear()
+            schema_obj = SchemaOCDS(package_data=metadata, lib_cove_ocds_config=config, record_pkg=record_pkg)
+            schema_obj.get_pkg_schema_obj(deref=True)
+            return schema_obj
+
+        schema_obj, measurement = measure(schema, memory=memory)
+        yield "get_pkg_schema_obj", measurement
+
+        # The in-memory stages are skipped in streaming mode, to benchmark sizes that don't fit in memory.
+        if not stream:
+
+            def read():
+                data = load(path)
+                if config.config["compact_data"]:
+                    compact(data)
+                return data
+
+            data, measurement = measure(read, memory=memory)
+            yield "load", measurement
+
+            context, measurement = measure(
+                lambda context: common_checks_ocds(context, directory, data, schema_obj, cache=False),
+                setup=lambda: {"file_type": "json"},
+                memory=memory,
+            )
+            yield "common_checks_ocds", measurement
+
+            _, measurement = measure(lambda: run_additional_checks(data, CHECKS["all"]), memory=memory)
+            yield "run_additional_checks", measurement
+
+            _, measurement = measure(context_api_transform, setup=lambda: copy.deepcopy(context), memory=memory)
+            yield "context_api_transform", measurement
+
+            del data
+
+        _, measurement = measure(
+            lambda: ocds_json_output(directory, path, lib_cove_ocds_config=config, stream=stream), memory=memory
+        )
+        yield "ocds_json_output", measurement
+
+
+@click.group()
+def main():
+    pass
+
+
+@main.command()
+@click.option(
+    "--standard-zip",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Path to a ZIP file containing the standard repository",
+)
+@click.option(
+    "-n", "--size", "sizes", multiple=True, type=click.IntRange(min=1), default=(1_000, 10_000), show_default=True
+)
+@click.option(
+    "-t",
+    "--package-type",
+    "package_types",
+    multiple=True,
+    type=click.Choice(("release", "record")),
+    default=("release", "record"),
+    show_default=True,
+)
+@click.option(
+    "-e",
+    "--errors",
+    "errors_choices",
+    multiple=True,
+    type=click.Choice(("few", "many")),
+    default=("few", "many"),
+    show_default=True,
+    help="Whether the data has few or many errors",
+)
+@click.option(
+    "-x",
+    "--extensions",
+    "extensions_choices",
+    multiple=True,
+    type=click.Choice(("no", "yes")),
+    default=("no", "yes"),
+    show_default=True,
+    help="Whether the data declares the local extension fixture",
+)
+@click.option(
+    "--stream", is_flag=True, help="Read the data one release or record at a time, and skip in-memory stages"
+)
+@click.option("-w", "--workers", default=1, type=click.IntRange(min=1), help="The workers configuration")
+@click.option("--compact-data", is_flag=True, help="The compact_data configuration")
+@click.option("--no-memory", is_flag=True, help="Don't measure peak allocation (halves the duration)")
+@click.option("-o", "--output", type=click.File("w"), default="-", help="The file to which to write the JSON report")
+def run(
+    standard_zip,
+    sizes,
+    package_types,
+    errors_choices,
+    extensions_choices,
+    stream,
+    workers,
+    compact_data,
+    no_memory,
+    output,
+):
+    """Benchmark each stage on synthetic data, and write a JSON report."""
+    config = LibCoveOCDSConfig()
+    config.config["standard_zip"] = f"file://{os.path.realpath(standard_zip)}"
+    config.config["workers"] = workers
+    config.config["compact_data"] = compact_data
+    config.config["context"] = "api"
+
+    extension_url = serve_extension()
+
+    try:
+        libcoveocds_version = version("libcoveocds")
+    except PackageNotFoundError:
+        libcoveocds_version = None
+
+    results = []
+    for size in sizes:
+        for package_type in package_types:
+            for extensions in extensions_choices:
+                for errors in errors_choices:
+                    for stage, measurement in benchmark(
+                        config,
+                        package_type,
+                        size,
+                        errors=errors == "many",
+                        extensions=[extension_url] if extensions == "yes" else [],
+                        stream=stream,
+                        memory=not no_memory,
+                    ):
+                        result = {
+                            "package": package_type,
+                            "size": size,
+                            "extensions": extensions == "yes",
+                            "errors": errors,
+                            "stream": stream,
+                            "workers": workers,
+                            "stage": stage,
+                            **measurement,
+                        }
+                        results.append(result)
+                        click.echo(_format(result), err=True)
+
+    report = {
+        "libcoveocds": libcoveocds_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": dt.datetime.now(tz=dt.timezone.utc).isoformat(),
+        "results": results,
+    }
+    json.dump(report, output, indent=2)
+    output.write("\n")
+
+
+@main.command()
+@click.argument("before", type=click.File())
+@click.argument("after", type=click.File())
+def compare(before, after):
+    """Compare the wall time, peak allocation and retained allocation of each stage in two JSON reports."""
+    before = {_key(result): result for result in json.load(before)["results"]}
+    for result in json.load(after)["results"]:
+        if (previous := before.get(_key(result))) is None:
+            continue
+        line = f"{_label(result)}  wall {previous['wall']:.3f}s -> {result['wall']:.3f}s"
+        line += f" ({_ratio(result['wall'], previous['wall'])})"
+        if previous["peak_memory"] is not None and result["peak_memory"] is not None:
+            line += f"  peak {_megabytes(previous['peak_memory'])} -> {_megabytes(result['peak_memory'])}"
+            line += f" ({_ratio(result['peak_memory'], previous['peak_memory'])})"
+        # Reports from before retained allocation was measured don't have the field.
+        if previous.get("retained_memory") is not None and result.get("retained_memory") is not None:
+            line += f"  retained {_megabytes(previous['retained_memory'])} -> {_megabytes(result['retained_memory'])}"
+            line += f" ({_ratio(result['retained_memory'], previous['retained_memory'])})"
+        click.echo(line)
+
+
+def _key(result):
+    return tuple(result[field] for field in KEY_FIELDS)
+
+
+def _label(result):
+    extensions = "extensions" if result["extensions"] else "no extensions"
+    stream = ", stream" if result["stream"] else ""
+    options = f"{extensions}, {result['errors']} errors{stream}"
+    return f"{result['package']} x {result['size']} ({options}) {result['stage']:<22}"
+
+
+def _format(result):
+    line = f"{_label(result)}  wall {result['wall']:.3f}s  cpu {result['cpu']:.3f}s"
+    if result["peak_memory"] is not None:
+        line += f"  peak {_megabytes(result['peak_memory'])}  retained {_megabytes(result['retained_memory'])}"
+    return line
+
+
+def _megabytes(size):
+    return f"{size / 1_000_000:.1f} MB"
+
+
+def _ratio(value, previous):
+    if not previous:
+        return "n/a"
+    return f"{value / previous:.2f}x"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Generate synthetic release packages and record packages of any size."""
+
+import json
+
+PREFIX = "ocds-213czf-"
+PUBLISHED_DATE = "2020-01-01T00:00:00Z"
+
+
+def release(index, *, errors=False, extended=False):
+    """
+    Return a release.
+
+    If ``errors`` is set, the release has schema validation errors, additional codelist values, additional fields and
+    empty fields, and some releases have bad OCID prefixes or duplicate identifiers.
+    """
+    if errors and index % 100 == 1:
+        index -= 1  # duplicate the previous release's OCID and ID
+    ocid = f"{PREFIX}{index:08d}"
+    if errors and index % 10 == 0:
+        ocid = f"bad-prefix-{index:08d}"
+
+    data = {
+        "ocid": ocid,
+        "id": f"{ocid}-tender",
+        "date": PUBLISHED_DATE,
+        "tag": ["tender"],
+        "initiationType": "tender",
+        "parties": [
+            {"id": "GB-COH-1", "name": "Buyer", "roles": ["buyer", "procuringEntity"]},
+            {"id": "GB-COH-2", "name": "Supplier", "roles": ["supplier"]},
+        ],
+        "buyer": {"id": "GB-COH-1", "name": "Buyer"},
+        "tender": {
+            "id": "1",
+            "title": "Tender",
+            "status": "active",
+            "value": {"amount": 100.0 + index, "currency": "GBP"},
+            "items": [{"id": "1", "description": "Item", "quantity": 1}],
+            "documents": [{"id": "1", "url": "https://example.com/1.pdf", "documentType": "tenderNotice"}],
+        },
+        "awards": [{"id": "1", "status": "active", "suppliers": [{"id": "GB-COH-2", "name": "Supplier"}]}],
+    }
+
+    if extended:
+        data["parties"][1]["roles"].append("benchmarker")
+        data["tender"]["benchmarkType"] = "small"
+        data["tender"]["benchmarkScores"] = [{"id": "1", "value": 1}]
+
+    if errors:
+        data["date"] = "2020-01-01"
+        data["tender"]["title"] = ""
+        data["tender"]["status"] = "bogus"
+        data["tender"]["value"]["amount"] = "100"
+        del data["tender"]["items"][0]["id"]
+        data["tender"]["unknownField"] = index
+        data["awards"].append({"id": "1", "status": "active"})
+        if extended:
+            data["tender"]["benchmarkType"] = "huge"
+            data["tender"]["benchmarkScores"].append({})
+
+    return data
+
+
+def record(index, **kwargs):
+    """Return a record, whose compiled release is a release. See :func:`~benchmarks.generate.release`."""
+    compiled_release = release(index, **kwargs)
+    return {
+        "ocid": compiled_release["ocid"],
+        "releases": [
+            {
+                "url": f"https://example.com/{compiled_release['ocid']}.json#{compiled_release['id']}",
+                "date": compiled_release["date"],
+                "tag": compiled_release["tag"],
+            }
+        ],
+        "compiledRelease": compiled_release,
+    }
+
+
+def _metadata(extensions):
+    metadata = {
+        "uri": "https://example.com/package.json",
+        "publishedDate": PUBLISHED_DATE,
+        "publisher": {"name": "Benchmark"},
+        "version": "1.1",
+    }
+    if extensions:
+        metadata["extensions"] = list(extensions)
+    return metadata
+
+
+def package(package_type, size, *, errors=False, extensions=()):
+    """Return a release package or record package with ``size`` releases or records."""
+    function = release if package_type == "release" else record
+    extended = bool(extensions)
+    return {
+        **_metadata(extensions),
+        f"{package_type}s": [function(index, errors=errors, extended=extended) for index in range(size)],
+    }
+
+
+def write_package(f, package_type, size, *, errors=False, extensions=()):
+    """Write a package like :func:`~benchmarks.generate.package` to a text file, one release or record at a time."""
+    function = release if package_type == "release" else record
+    extended = bool(extensions)
+
+    f.write(json.dumps(_metadata(extensions))[:-1])
+    f.write(f', "{package_type}s": [')
+    for index in range(size):
+        if index:
+            f.write(",")
+        f.write(json.dumps(function(index, errors=errors, extended=extended)))
+    f.write("]}")
@@ -1,25 +1,122 @@
+import contextlib
+import itertools
 import json
 import os
 import shutil
+import signal
 import sys
 import tempfile
 from pathlib import Path
 
 import click
 
-import libcoveocds.api
 from libcoveocds.config import LibCoveOCDSConfig
-from libcoveocds.lib.additional_checks import CHECKS
+from libcoveocds.exceptions import LibCoveOCDSError
+from libcoveocds.lib.additional_checks import CHECKS, get_checks
+from libcoveocds.lib.api import iter_findings
+from libcoveocds.util import SetEncoder, dumps, link_or_copy, locate
 
 
-class SetEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, set):
-            return list(obj)
-        return json.JSONEncoder.default(self, obj)
+def _validate_additional_checks(ctx, param, value):  # noqa: ARG001 # click API
+    try:
+        get_checks(value)
+    except LibCoveOCDSError as e:
+        raise click.BadParameter(str(e)) from None
+    return value
+
+
+# The options that set the configuration, shared by all commands.
+CONFIG_OPTIONS = [
+    click.option(
+        "--additional-checks",
+        default="all",
+        show_default=True,
+        callback=_validate_additional_checks,
+        help=f"The additional checks to perform: {', '.join(CHECKS)} or comma-separated names, like empty_field",
+    ),
+    click.option("--skip-aggregates", is_flag=True, help="Skip count and unique_ocids_count"),
+    click.option(
+        "--max-errors-per-type",
+        type=click.IntRange(min=0),
+        help="Keep this many paths for each type of validation error, additional check and conformance error",
+    ),
+    click.option("--max-validation-errors", type=click.IntRange(min=0), help="Keep this many validation errors"),
+    click.option(
+        "--standard-zip",
+        type=click.Path(exists=True, dir_okay=False),
+        help="Path to a ZIP file containing the standard repository",
+    ),
+    click.option(
+        "-w",
+        "--workers",
+        default=1,
+        type=click.IntRange(min=1),
+        help="Check releases or records in this many processes",
+    ),
+    click.option(
+        "--item-cache-dir",
+        type=click.Path(file_okay=False),
+        help="Store the results for each release or record in this directory, to only check changes on later runs",
+    ),
+    click.option("--compact-data", is_flag=True, help="Share equal strings in the data, to reduce memory usage"),
+    click.option(
+        "--fast-validation", is_flag=True, help="Validate with functions compiled from the schema, before lib-cove"
+    ),
+    click.option("--profile", is_flag=True, help="Add the wall time, CPU time and peak allocation of each stage"),
+]
+
+
+class DefaultGroup(click.Group):
+    """Run the ``check`` command if the first argument isn't a command, like before commands were added."""
 
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] != "--help":
+            args = ["check", *args]
+        return super().parse_args(ctx, args)
 
-@click.command()
+
+def config_options(function):
+    for option in reversed(CONFIG_OPTIONS):
+        function = option(function)
+    return function
+
+
+def get_config(
+    additional_checks,
+    skip_aggregates,
+    max_errors_per_type,
+    max_validation_errors,
+    standard_zip,
+    workers,
+    item_cache_dir,
+    compact_data,
+    fast_validation,
+    profile,
+):
+    if standard_zip:
+        standard_zip = f"file://{standard_zip}"
+
+    config = LibCoveOCDSConfig()
+    config.config["standard_zip"] = standard_zip
+    config.config["additional_checks"] = additional_checks
+    config.config["skip_aggregates"] = skip_aggregates
+    config.config["max_errors_per_type"] = max_errors_per_type
+    config.config["max_validation_errors"] = max_validation_errors
+    config.config["workers"] = workers
+    config.config["item_cache_dir"] = item_cache_dir
+    config.config["compact_data"] = compact_data
+    config.config["fast_validation"] = fast_validation
+    config.config["profile"] = profile
+    config.config["context"] = "api"
+    return config
+
+
+@click.group(cls=DefaultGroup)
+def main():
+    """Check OCDS data. If no command is given, the check command is run."""
+
+
+@main.command()
 @click.argument("filename")
 @click.option(
     "-s",
@@ -36,34 +133,40 @@ class SetEncoder(json.JSONEncoder):
 )
 @click.option("-d", "--delete", is_flag=True, help="Delete output directory if it exists")
 @click.option("-e", "--exclude-file", is_flag=True, help="Exclude FILENAME from the output directory")
+@click.option("--stream", is_flag=True, help="Read the releases or records one at a time, to limit memory usage")
+@click.option(
+    "--lines",
+    is_flag=True,
+    help="Read FILENAME as JSON Lines, in which each line is a release, a record or a package, one line at a time",
+)
 @click.option(
-    "--additional-checks", default="all", type=click.Choice(CHECKS), help="The set of additional checks to perform"
+    "--output-format",
+    type=click.Choice(["json", "jsonl"]),
+    default="json",
+    show_default=True,
+    help="Print the results as one JSON object, or as one line of JSON per finding followed by a summary line",
 )
-@click.option("--skip-aggregates", is_flag=True, help="Skip count and unique_ocids_count")
 @click.option(
-    "--standard-zip",
-    type=click.Path(exists=True, dir_okay=False),
-    help="Path to a ZIP file containing the standard repository",
+    "--valid-only",
+    is_flag=True,
+    help="Only check whether the data is valid, stopping at the first error. Exits with 1 if invalid.",
 )
-def main(
+@config_options
+def check(
     filename,
     output_dir,
     convert,
     schema_version,
     delete,
     exclude_file,
-    additional_checks,
-    skip_aggregates,
-    standard_zip,
+    stream,
+    lines,
+    output_format,
+    valid_only,
+    **kwargs,
 ):
-    if standard_zip:
-        standard_zip = f"file://{standard_zip}"
-
-    config = LibCoveOCDSConfig()
-    config.config["standard_zip"] = standard_zip
-    config.config["additional_checks"] = additional_checks
-    config.config["skip_aggregates"] = skip_aggregates
-    config.config["context"] = "api"
+    """Check the data in FILENAME, and print the results as JSON."""
+    config = get_config(**kwargs)
 
     keep_files = convert or output_dir
     if keep_files:
@@ -78,23 +181,122 @@ def main(
         output_dir.mkdir(parents=True)
 
         if not exclude_file:
-            shutil.copy2(filename, output_dir)
+            # If FILENAME is a member of a ZIP archive, the archive is copied.
+            link_or_copy(locate(filename)[0], output_dir)
     else:
         output_dir = tempfile.mkdtemp(prefix="lib-cove-ocds-cli-", dir=tempfile.gettempdir())
 
+    # The checks' dependencies are imported only by commands that check data, so that --help is fast.
+    import libcoveocds.api  # noqa: PLC0415
+
     try:
         result = libcoveocds.api.ocds_json_output(
-            output_dir, filename, schema_version, convert=convert, lib_cove_ocds_config=config
+            output_dir,
+            filename,
+            schema_version,
+            convert=convert,
+            lib_cove_ocds_config=config,
+            lines=lines,
+            stream=stream,
+            valid_only=valid_only,
         )
     finally:
         if not keep_files:
             shutil.rmtree(output_dir)
 
-    output = json.dumps(result, indent=2, cls=SetEncoder)
-    if keep_files:
-        with open(os.path.join(output_dir, "results.json"), "w") as f:
-            f.write(output)
-    click.echo(output)
+    if output_format == "jsonl":
+        # Write each line as it is serialized, instead of serializing all the results at once.
+        with open(os.path.join(output_dir, "results.jsonl"), "wb") if keep_files else contextlib.nullcontext() as f:
+            for finding in iter_findings(result):
+                line = dumps(finding) + b"\n"
+                if f:
+                    f.write(line)
+                click.echo(line, nl=False)
+    else:
+        output = json.dumps(result, indent=2, cls=SetEncoder)
+        if keep_files:
+            with open(os.path.join(output_dir, "results.json"), "w") as f:
+                f.write(output)
+        click.echo(output)
+
+    if valid_only and not result["valid"]:
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("patterns", nargs=-1)
+@click.option(
+    "-s",
+    "--schema-version",
+    type=click.Choice(LibCoveOCDSConfig().config["schema_version_choices"]),
+    help="Version of the schema to validate the data, eg '1.0'",
+)
+@click.option(
+    "-f",
+    "--files-from",
+    type=click.File(),
+    help="Read filenames from this file, one per line, or from standard input if '-'",
+)
+@click.option(
+    "-j", "--jobs", default=1, type=click.IntRange(min=1), help="Check this many files in parallel processes"
+)
+@click.option("--stream", is_flag=True, help="Read the releases or records one at a time, to limit memory usage")
+@config_options
+def batch(patterns, files_from, schema_version, jobs, stream, **kwargs):
+    """
+    Check the data in many files, and print one line of JSON per file.
+
+    PATTERNS are filenames or glob patterns, like 'data/**/*.json'. Each line has a "file" and either a "result" or an
+    "error". Files with the same version and extensions reuse the same schemas. Exits with 1 if any file has an error.
+    """
+    from libcoveocds.batch import expand_paths, iter_results  # noqa: PLC0415
+
+    config = get_config(**kwargs)
+
+    paths = expand_paths(patterns)
+    if files_from:
+        paths = itertools.chain(paths, (line.strip() for line in files_from if line.strip()))
+
+    failed = False
+    for line in iter_results(paths, config, schema_version, stream=stream, jobs=jobs):
+        failed |= "error" in line
+        click.echo(json.dumps(line, cls=SetEncoder))
+
+    if failed:
+        sys.exit(1)
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="The host on which to listen")
+@click.option("-p", "--port", default=8000, show_default=True, type=click.IntRange(0, 65535), help="The port")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Listen on a Unix socket at this path, instead of the host and port",
+)
+@config_options
+def serve(host, port, socket_path, **kwargs):
+    """
+    Run a validation service, which reuses schemas across requests.
+
+    POST a package to /validate to get the same JSON as the check command. GET /status to get the schema cache's state.
+    """
+    from libcoveocds.server import make_server  # noqa: PLC0415
+
+    server = make_server(get_config(**kwargs), host, port, socket_path)
+    address = socket_path or "http://{}:{}".format(*server.server_address[:2])
+    click.echo(f"Listening on {address}", err=True)
+    # Stop cleanly if terminated, like if interrupted.
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path:
+            os.remove(socket_path)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,22 @@
 import warnings
 
-from libcoveocds.common_checks import common_checks_ocds
+from libcoveocds.common_checks import common_checks_ocds, is_valid_ocds
 from libcoveocds.config import LibCoveOCDSConfig
+from libcoveocds.exceptions import LibCoveOCDSError
 from libcoveocds.lib.api import context_api_transform
+from libcoveocds.profiling import Profiler
 from libcoveocds.schema import SchemaOCDS
-from libcoveocds.util import json
-
-try:
-    from flattentool.exceptions import FlattenToolWarning
-    from libcove.lib.converters import convert_json
-except ImportError:
-    pass
+from libcoveocds.stream import (
+    STREAM_EXTRA_INSTALLED,
+    common_checks_ocds_stream,
+    is_valid_ocds_stream,
+    iter_items,
+    iter_lines,
+    read_lines_metadata,
+    read_metadata,
+    split_package,
+)
+from libcoveocds.util import compact, is_compressed, load
 
 
 def ocds_json_output(
@@ -21,7 +27,10 @@ def ocds_json_output(
     convert: bool = False,
     json_data=None,  # : dict | None
     lib_cove_ocds_config=None,  # : LibCoveOCDSConfig | None
+    lines: bool = False,
     record_pkg=None,  # : bool | None
+    stream: bool = False,
+    valid_only: bool = False,
 ):
     """
     If flattentool is not installed, ``convert`` must be falsy.
@@ -30,6 +39,26 @@ def ocds_json_output(
 
     ``output_dir`` is required if ``convert`` is truthy.
 
+    If ijson is not installed, ``stream`` must be falsy.
+
+    If orjson is installed, the ``file`` is parsed from a memory mapping, without copying its contents. See
+    :func:`~libcoveocds.util.load`.
+
+    The ``file`` can be compressed with gzip or Zstandard, or be a ZIP archive or a member of one, like
+    ``archive.zip/file.json``, unless ``convert`` is truthy. It is decompressed while it is read. See
+    :func:`~libcoveocds.util.open_file`.
+
+    If the ``compact_data`` configuration is set, equal strings in the data read from the ``file`` are shared, to
+    reduce its memory usage. See :func:`~libcoveocds.util.compact`.
+
+    If the ``workers`` configuration is greater than 1, the releases or records are checked in that many processes.
+
+    If the ``item_cache_dir`` configuration is set, the results for each release or record are reused across calls, so
+    that only new or changed releases or records are checked. See :class:`~libcoveocds.item_cache.ItemCache`.
+
+    If the ``profile`` configuration is set, a ``timings`` object is added to the result. See
+    :class:`~libcoveocds.profiling.Profiler`.
+
     :param output_dir: The output directory
     :param file: The input data as a file
     :param schema_version: The major.minor version, e.g. "1.1". If not provided, it is determined by the ``version``
@@ -37,31 +66,110 @@ def ocds_json_output(
     :param convert: Whether to convert from JSON to XLSX
     :param json_data: The input data. If not provided, it is read from the ``file``.
     :param lib_cove_ocds_config: A custom configuration of lib-cove-ocds
+    :param lines: Whether the ``file`` is in JSON Lines format, in which each line is a release, a record or a package.
+                  The lines are read one at a time, like with ``stream``, and the results are the same as for one
+                  package of all the releases or records. If each line is a release or record, its index in the
+                  results is its line's index. If each line is a package, the first package's metadata is used.
     :param record_pkg: Whether the input data is a record package. If not provided, it is determined by the presence of
                        the ``records`` field.
+    :param stream: Whether to read the releases or records from the ``file`` one at a time, to limit memory usage. If
+                   the data is not a package, or if it has both ``releases`` and ``records`` arrays, it is read whole.
+    :param valid_only: Whether to only determine whether the data is valid against the schema, stopping at the first
+                       validation error. The result has ``file_type``, ``version_used``, ``schema_url`` and a boolean
+                       ``valid`` (and ``json_deref_error``, if raised). No other checks are performed.
     """
     if not lib_cove_ocds_config:
         lib_cove_ocds_config = LibCoveOCDSConfig()
         lib_cove_ocds_config.config["context"] = "api"
 
-    if not json_data:
-        with open(file, "rb") as f:
-            json_data = json.loads(f.read())
+    profiler = Profiler(lib_cove_ocds_config.config)
+    context = {"file_type": "json"}
+    try:
+        _ocds_json_output(
+            context,
+            profiler,
+            output_dir,
+            file,
+            schema_version,
+            convert=convert,
+            json_data=json_data,
+            lib_cove_ocds_config=lib_cove_ocds_config,
+            lines=lines,
+            record_pkg=record_pkg,
+            stream=stream,
+            valid_only=valid_only,
+        )
+    finally:
+        profiler.finish(context)
 
-    if record_pkg is None:
-        record_pkg = "records" in json_data
+    return context
 
-    schema_obj = SchemaOCDS(schema_version, json_data, lib_cove_ocds_config, record_pkg=record_pkg)
 
-    # Used in conversions.
-    if schema_obj.extensions:
-        schema_obj.create_extended_schema_file(output_dir, "")
-    schema_url = schema_obj.extended_schema_file or schema_obj.schema_url
+def _ocds_json_output(
+    context,
+    profiler,
+    output_dir,
+    file,
+    schema_version,
+    *,
+    convert,
+    json_data,
+    lib_cove_ocds_config,
+    lines,
+    record_pkg,
+    stream,
+    valid_only,
+):
+    if convert and is_compressed(file):
+        raise LibCoveOCDSError("A compressed file or archive member can't be converted. Decompress it first.")
+    if convert and lines:
+        raise LibCoveOCDSError("A JSON Lines file can't be converted.")
+
+    # A tuple of the package metadata, the key of the releases or records array, and the releases or records.
+    parts = None
+    with profiler.stage("read"):
+        if lines and not json_data:
+            metadata, key, packages = read_lines_metadata(file, record_pkg)
+            parts = (metadata, key, iter_lines(file, key, packages=packages) if key else [])
+            if record_pkg is None:
+                record_pkg = key == "records"
+        elif stream and not json_data:
+            if not STREAM_EXTRA_INSTALLED:
+                raise LibCoveOCDSError("ijson is not installed. Run: pip install libcoveocds[stream]")
+            if streamed := read_metadata(file):
+                metadata, key = streamed
+                parts = (metadata, key, iter_items(file, key) if key else [])
+
+        if parts:
+            package_data = parts[0]
+        else:
+            config = lib_cove_ocds_config.config
+            if not json_data:
+                json_data = load(file)
+                if config["compact_data"]:
+                    compact(json_data)
+            package_data = json_data
+            # The fast path stops at the first error, so it doesn't use workers.
+            if (config["workers"] > 1 or config["item_cache_dir"]) and not valid_only:
+                parts = split_package(json_data)
 
-    context = {"file_type": "json"}
+    if record_pkg is None:
+        record_pkg = "records" in package_data
+
+    with profiler.stage("schema"):
+        schema_obj = SchemaOCDS(schema_version, package_data, lib_cove_ocds_config, record_pkg=record_pkg)
+
+        # Used in conversions.
+        if schema_obj.extensions:
+            schema_obj.create_extended_schema_file(output_dir, "")
+        schema_url = schema_obj.extended_schema_file or schema_obj.schema_url
 
     if convert:
-        with warnings.catch_warnings():
+        # Import the conversion dependencies only if converting.
+        from flattentool.exceptions import FlattenToolWarning  # noqa: PLC0415
+        from libcove.lib.converters import convert_json  # noqa: PLC0415
+
+        with profiler.stage("convert"), warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=FlattenToolWarning)
 
             context.update(
@@ -76,19 +184,33 @@ def ocds_json_output(
                 )
             )
 
+    if valid_only:
+        with profiler.stage("validation"):
+            if parts:
+                is_valid_ocds_stream(context, *parts, schema_obj)
+            else:
+                is_valid_ocds(context, json_data, schema_obj)
+        if schema_obj.json_deref_error:
+            context["json_deref_error"] = schema_obj.json_deref_error
+        return
+
     # context is edited in-place.
-    context_api_transform(
-        common_checks_ocds(
-            context,
-            output_dir,
-            json_data,
-            schema_obj,
-            # common_checks_context(cache=True) caches the results to a file, which is not needed in API context.
-            cache=False,
-        )
-    )
+    with profiler.stage("common_checks"):
+        if parts:
+            common_checks_ocds_stream(context, *parts, schema_obj, profiler)
+        else:
+            common_checks_ocds(
+                context,
+                output_dir,
+                json_data,
+                schema_obj,
+                # common_checks_context(cache=True) caches the results to a file, which is not needed in API context.
+                cache=False,
+                profiler=profiler,
+            )
+
+    with profiler.stage("transform"):
+        context_api_transform(context)
 
     if schema_obj.json_deref_error:
         context["json_deref_error"] = schema_obj.json_deref_error
-
-    return context
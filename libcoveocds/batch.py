@@ -0,0 +1,65 @@
+import glob
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import libcoveocds.api
+from libcoveocds.exceptions import LibCoveOCDSError
+
+
+def expand_paths(patterns):
+    """
+    Yield the paths matching each pattern, in order.
+
+    A pattern without glob characters is yielded as-is, even if no file exists at that path. A pattern with glob
+    characters is expanded, with ``**`` matching any number of directories. If it matches no file, it is yielded as-is,
+    so that the error is reported.
+    """
+    for pattern in patterns:
+        if glob.escape(pattern) == pattern:
+            yield pattern
+        elif paths := sorted(glob.glob(pattern, recursive=True)):
+            yield from paths
+        else:
+            yield pattern
+
+
+def check_file(path, lib_cove_ocds_config, schema_version=None, *, stream=False):
+    """
+    Check the data in a file, and return an object with the ``file`` and either its ``result`` or its ``error``.
+
+    Any exception is reported as an error, so that one file's error doesn't stop a batch.
+    """
+    output_dir = tempfile.mkdtemp(prefix="lib-cove-ocds-batch-", dir=tempfile.gettempdir())
+    try:
+        result = libcoveocds.api.ocds_json_output(
+            output_dir, path, schema_version, lib_cove_ocds_config=lib_cove_ocds_config, stream=stream
+        )
+    except LibCoveOCDSError as e:
+        return {"file": path, "error": str(e)}
+    except Exception as e:  # noqa: BLE001 # one file's error mustn't stop the batch
+        return {"file": path, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        shutil.rmtree(output_dir)
+    return {"file": path, "result": result}
+
+
+def _check_file(args):
+    return check_file(*args[:3], stream=args[3])
+
+
+def iter_results(paths, lib_cove_ocds_config, schema_version=None, *, stream=False, jobs=1):
+    """
+    Check the data in each file, and yield the return value of :func:`~libcoveocds.batch.check_file`, in order.
+
+    Files with the same version, extensions and package schema reuse the same schemas, via the process-wide cache of
+    :mod:`libcoveocds.schema`. If ``jobs`` is greater than 1, files are checked in that many processes, each with its
+    own cache.
+    """
+    if jobs <= 1:
+        for path in paths:
+            yield check_file(path, lib_cove_ocds_config, schema_version, stream=stream)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(_check_file, ((path, lib_cove_ocds_config, schema_version, stream) for path in paths))
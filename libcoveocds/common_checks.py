@@ -1,44 +1,54 @@
+import importlib.util
 import json
 import re
-import typing
+import threading
+from itertools import islice
 from textwrap import dedent
 
+import jsonschema
+from jsonschema import FormatChecker
 from jsonschema.exceptions import ValidationError, _RefResolutionError
-from libcove.lib.common import common_checks_context, get_additional_codelist_values, unique_ids, validator
+from libcove.lib.common import common_checks_context, get_schema_validation_errors, unique_ids, validator
 from referencing.exceptions import Unresolvable
 
 from libcoveocds.exceptions import LibCoveOCDSError
-from libcoveocds.lib.additional_checks import CHECKS, run_additional_checks
-from libcoveocds.lib.common_checks import get_bad_ocid_prefixes
-
-try:
-    import bleach
-    from django.utils.html import conditional_escape, escape, format_html, mark_safe
-    from markdown_it import MarkdownIt
-
-    md = MarkdownIt()
-
-    validation_error_lookup = {
-        "date-time": mark_safe(
-            "Incorrect date format. Dates should use the form YYYY-MM-DDT00:00:00Z. Learn more about "
-            '<a href="https://standard.open-contracting.org/latest/en/schema/reference/#date">dates in OCDS</a>.'
-        ),
-    }
-
-    WEB_EXTRA_INSTALLED = True
-except ImportError:
-    WEB_EXTRA_INSTALLED = False
-
-
-def unique_ids_or_ocids(validator, ui, instance, schema):
+from libcoveocds.lib.additional_checks import (
+    get_additional_checks_results,
+    get_additional_checks_truncated,
+    get_checks,
+)
+from libcoveocds.lib.common_checks import AdditionalCodelistValues, Aggregates, BadOcidPrefixes
+from libcoveocds.lib.limits import Limiter, add_truncated
+from libcoveocds.lib.traversal import traverse
+from libcoveocds.profiling import Profiler
+
+# The dependencies of the web context are imported by libcoveocds.lib.web, only if the data is checked in a web
+# context, to not slow down the import of this module in an API context.
+WEB_EXTRA_INSTALLED = all(importlib.util.find_spec(name) for name in ("bleach", "django", "markdown_it"))
+
+# The number of validation errors to format at once, if validation errors are limited.
+VALIDATION_CHUNK_SIZE = 1000
+
+# jsonschema's validator for draft 4 is process-wide. lib-cove's get_schema_validation_errors() and this module's
+# functions set it to lib-cove's validator while validating, and then restore jsonschema's. Hold this lock while
+# validating, so that one thread doesn't restore it while another thread is validating, like in the serve command.
+VALIDATION_LOCK = threading.RLock()
+
+
+def get_id_names(schema):
+    """Return the names of the fields whose values must be unique across the items of the array."""
     # `records` key from the JSON schema doesn't get passed through to here, so
     # we look out for this $ref — this may change if the way the schema files
     # are structured changes.
     if schema.get("items") == {"$ref": "#/definitions/record"}:
-        return unique_ids(validator, ui, instance, schema, id_names=["ocid"])
+        return ["ocid"]
     if "$ref" in schema.get("items", {}) and schema["items"]["$ref"].endswith("release-schema.json"):
-        return unique_ids(validator, ui, instance, schema, id_names=["ocid", "id"])
-    return unique_ids(validator, ui, instance, schema, id_names=["id"])
+        return ["ocid", "id"]
+    return ["id"]
+
+
+def unique_ids_or_ocids(validator, ui, instance, schema):
+    return unique_ids(validator, ui, instance, schema, id_names=get_id_names(schema))
 
 
 def one_of_draft4(validator, one_of, instance, schema):
@@ -117,21 +127,105 @@ validator.VALIDATORS["uniqueItems"] = unique_ids_or_ocids
 validator.VALIDATORS["oneOf"] = one_of_draft4
 
 
-# ref_info is used calculate the HTML anchor for the field in the OCDS documentation.
-def _lookup_schema(schema, path, ref_info=None):
-    if not path:
-        return schema, ref_info
+class _ErrorsSchema:
+    """
+    Proxy a schema, so that lib-cove's get_schema_validation_errors() formats the given errors.
+
+    Other attributes are read from the schema, so that lib-cove's common_checks_context() can use the proxy.
+    """
+
+    def __init__(self, schema_obj, errors):
+        self.schema_obj = schema_obj
+        self.errors = errors
+
+    def __getattr__(self, name):
+        return getattr(self.schema_obj, name)
+
+    def validator(self, validator, format_checker):  # noqa: ARG002 # lib-cove API
+        return self
+
+    def iter_errors(self, instance):  # noqa: ARG002 # jsonschema API
+        return iter(self.errors)
+
+
+def get_limited_validation_errors(json_data, schema_obj, limiter):
+    """
+    Add the validation errors to the limiter, like lib-cove's get_schema_validation_errors().
+
+    The errors are formatted in chunks, so that only the errors within the limits and one chunk are in memory at once.
+    """
+    # lib-cove's get_schema_validation_errors() creates the validator in the same way.
+    errors = schema_obj.validator(validator, FormatChecker()).iter_errors(json_data)
+    with VALIDATION_LOCK:
+        try:
+            while True:
+                # Force jsonschema to use lib-cove's validator while iterating, like get_schema_validation_errors(),
+                # which restores the default validator when it returns.
+                # https://github.com/python-jsonschema/jsonschema/issues/994
+                jsonschema.validators.validates("http://json-schema.org/draft-04/schema#")(validator)
+                if not (chunk := list(islice(errors, VALIDATION_CHUNK_SIZE))):
+                    break
+                for json_key, values in get_schema_validation_errors(
+                    None, _ErrorsSchema(schema_obj, chunk), "-", {}, {}
+                ).items():
+                    limiter.add(json_key, values)
+        finally:
+            jsonschema.validators.validates("http://json-schema.org/draft-04/schema#")(
+                jsonschema.validators.Draft4Validator
+            )
+
+
+def is_valid(our_validator, instance):
+    """
+    Return whether the instance is valid, stopping at the first validation error that lib-cove would report.
+
+    :param our_validator: a validator returned by ``schema_obj.validator(validator, FormatChecker())``, or evolved from
+                          one
+    """
+    with VALIDATION_LOCK:
+        # Force jsonschema to use lib-cove's validator, like get_schema_validation_errors().
+        jsonschema.validators.validates("http://json-schema.org/draft-04/schema#")(validator)
+        try:
+            # lib-cove's get_schema_validation_errors() ignores "enum" errors for codelist fields.
+            return not any(
+                not (error.validator == "enum" and "isCodelist" in error.schema)
+                for error in our_validator.iter_errors(instance)
+            )
+        finally:
+            jsonschema.validators.validates("http://json-schema.org/draft-04/schema#")(
+                jsonschema.validators.Draft4Validator
+            )
+
+
+def is_fast_valid(schema_obj, instance, key=None):
+    """
+    Return whether the schema's fast validator determines that the instance is valid.
+
+    If ``False``, the instance might still be valid. See :meth:`~libcoveocds.schema.SchemaOCDS.get_fast_validators`.
 
-    if hasattr(schema, "__reference__"):
-        ref_info = {"path": path, "reference": schema.__reference__}
+    :param key: "releases" or "records", if the instance is a release or record, or ``None`` if it is a package
+    """
+    fast_validators = schema_obj.get_fast_validators()
+    return bool(fast_validators) and key in fast_validators and fast_validators[key](instance)
 
-    if "items" in schema:
-        return _lookup_schema(schema["items"], path, ref_info)
-    if "properties" in schema:
-        head, *tail = path
-        if head in schema["properties"]:
-            return _lookup_schema(schema["properties"][head], tail, ref_info)
-    return None, None
+
+def is_valid_ocds(context, json_data, schema_obj):
+    """
+    Add whether the data is valid against the schema to the context, as ``valid``, without collecting errors.
+
+    The validation stops at the first error. No other checks are performed. If a reference is unresolvable, ``valid``
+    is ``False`` and ``schema_obj.json_deref_error`` is set.
+    """
+    context["version_used"] = schema_obj.version
+    context["schema_url"] = schema_obj.pkg_schema_url
+    try:
+        context["valid"] = is_fast_valid(schema_obj, json_data) or is_valid(
+            schema_obj.validator(validator, FormatChecker()), json_data
+        )
+    except (Unresolvable, _RefResolutionError) as e:
+        schema_obj.json_deref_error = re.sub(r" within .+", "", str(e))
+        context["valid"] = False
+    return context
 
 
 def common_checks_ocds(
@@ -141,29 +235,92 @@ def common_checks_ocds(
     schema_obj,
     *,
     cache=True,
+    profiler=None,
 ):
     """
     Perform all checks.
 
     param skip_aggregates: whether to skip "count" and "unique_ocids_count"
+    param profiler: the caller's :class:`~libcoveocds.profiling.Profiler`. If not provided, a profiler is created from
+                    the configuration, and its timings are added to the context.
     """
-    skip_aggregates = schema_obj.config.config["skip_aggregates"]
-    additional_checks = CHECKS[schema_obj.config.config["additional_checks"]]
+    if profiler is None:
+        profiler = Profiler(schema_obj.config.config)
+        try:
+            common_checks_ocds(context, upload_dir, json_data, schema_obj, cache=cache, profiler=profiler)
+        finally:
+            profiler.finish(context)
+        return context
+
+    config = schema_obj.config.config
+    skip_aggregates = config["skip_aggregates"]
+    additional_checks = get_checks(config["additional_checks"])
+    per_type = config["max_errors_per_type"]
+    total = config["max_validation_errors"]
 
     # Pass "-" as the schema name. The associated logic is not required by lib-cove-ocds.
     try:
-        common_checks = common_checks_context(
-            upload_dir, json_data, schema_obj, "-", context, fields_regex=True, api=schema_obj.api, cache=cache
-        )
+        # lib-cove's common_checks_context() calls get_schema_validation_errors().
+        with profiler.stage("validation"), VALIDATION_LOCK:
+            # If the data is valid, skip lib-cove's validation.
+            fast = is_fast_valid(schema_obj, json_data)
+            if per_type is None and total is None:
+                common_checks = common_checks_context(
+                    upload_dir,
+                    json_data,
+                    _ErrorsSchema(schema_obj, []) if fast else schema_obj,
+                    "-",
+                    context,
+                    fields_regex=True,
+                    api=schema_obj.api,
+                    cache=cache,
+                )
+            else:
+                # lib-cove keeps all validation errors. Instead, validate the data here, and skip its validation.
+                limiter = Limiter(per_type, total)
+                if not fast:
+                    get_limited_validation_errors(json_data, schema_obj, limiter)
+                common_checks = common_checks_context(
+                    upload_dir,
+                    json_data,
+                    _ErrorsSchema(schema_obj, []),
+                    "-",
+                    context,
+                    fields_regex=True,
+                    api=schema_obj.api,
+                    # lib-cove would cache no validation errors.
+                    cache=False,
+                )
+                common_checks["context"]["validation_errors"] = sorted(limiter.outputs.items())
+                common_checks["context"]["validation_errors_count"] = limiter.count()
+                add_truncated(context, "validation_errors", limiter.truncated())
     except (Unresolvable, _RefResolutionError) as e:
         # For example: "PointerToNowhere: '/definitions/Unresolvable' does not exist within {big JSON blob}"
         schema_obj.json_deref_error = re.sub(r" within .+", "", str(e))
         return context
 
+    # AdditionalCodelistValues calls this, but it is called here to measure it separately.
+    with profiler.stage("codelists"):
+        schema_obj.get_codelist_table()
+
+    # The data is traversed once for all other checks.
+    bad_ocid_prefixes = BadOcidPrefixes(per_type)
+    checks = [bad_ocid_prefixes]
+    if not skip_aggregates:
+        checks.append(Aggregates())
+    checks.append(AdditionalCodelistValues(schema_obj))
+    additional_checks = [check(per_type) for check in additional_checks]
+    costs = {} if profiler.enabled else None
+    with profiler.stage("traversal"):
+        traverse(json_data, checks + additional_checks, costs)
+    if costs is not None:
+        for check in additional_checks:
+            profiler.add(
+                f"additional_checks/{check.name}", {"wall": costs.get(type(check), 0), "findings": check.count}
+            )
+
     # Note: Pelican checks whether the OCID prefix is registered.
-    ocds_prefixes_bad_format = get_bad_ocid_prefixes(json_data)
-    if ocds_prefixes_bad_format:
-        context["conformance_errors"] = {"ocds_prefixes_bad_format": ocds_prefixes_bad_format}
+    bad_ocid_prefixes.finish(context)
 
     if not schema_obj.api and not WEB_EXTRA_INSTALLED:
         raise LibCoveOCDSError(
@@ -187,77 +344,18 @@ def common_checks_ocds(
     # - Skip the schema description and reference URL for OCID prefix conformance errors.
     # - Skip the formatted message, schema title, schema description and reference URL for validation errors.
     if not schema_obj.api:
-        if "conformance_errors" in context:
-            ocid_description = schema_obj.get_schema_obj()["properties"]["ocid"]["description"]
-            # The last sentence of the `ocid` description is assumed to contain a guidance URL in all OCDS versions.
-            index = ocid_description.rindex(". ") + 1
-            context["conformance_errors"]["ocid_description"] = ocid_description[:index]
-            context["conformance_errors"]["ocid_info_url"] = re.search(r"\((\S+)\)", ocid_description[index:]).group(1)
-
-        new_validation_errors = []
-        for json_key, values in common_checks["context"]["validation_errors"]:
-            error = json.loads(json_key)
-
-            new_message = validation_error_lookup.get(error["message_type"])
-            if new_message:
-                error["message_safe"] = conditional_escape(new_message)
-            elif "message_safe" in error:
-                error["message_safe"] = mark_safe(error["message_safe"])
-            else:
-                error["message_safe"] = conditional_escape(error["message"])
+        with profiler.stage("format"):
+            from libcoveocds.lib.web import format_web  # noqa: PLC0415 # the web extra is slow to import
 
-            schema_block, ref_info = _lookup_schema(
-                schema_obj.get_pkg_schema_obj(deref=True, proxies=True), error["path_no_number"].split("/")
-            )
-            if schema_block and error["message_type"] != "required":
-                if "description" in schema_block:
-                    error["schema_title"] = escape(schema_block.get("title", ""))
-                    error["schema_description_safe"] = mark_safe(
-                        bleach.clean(
-                            md.render(schema_block["description"]), tags=bleach.sanitizer.ALLOWED_TAGS | {"p"}
-                        )
-                    )
-                if ref_info:
-                    ref = ref_info["reference"]["$ref"]
-                    ref = "" if ref.endswith("release-schema.json") else ref.strip("#")
-                    ref_path = "/".join(ref_info["path"])
-                    schema = "record-package-schema.json" if ref == "/definitions/record" else "release-schema.json"
-                else:
-                    ref = ""
-                    ref_path = error["path_no_number"]
-                    schema = schema_obj.package_schema_name
-                error["docs_ref"] = format_html("{},{},{}", schema, ref, ref_path)
-
-            new_validation_errors.append([json.dumps(error, sort_keys=True), values])
-        common_checks["context"]["validation_errors"] = new_validation_errors
+            format_web(context, schema_obj, common_checks)
 
     context.update(common_checks["context"])
 
-    if not skip_aggregates and isinstance(json_data, dict):
-        count = 0
-        unique_ocids = set()
-
-        releases_or_records = json_data.get("records", []) or json_data.get("releases", [])
-        if isinstance(releases_or_records, list):
-            for release_or_record in releases_or_records:
-                if not isinstance(release_or_record, dict):
-                    continue
-                count += 1
-                if (ocid := release_or_record.get("ocid")) and isinstance(ocid, typing.Hashable):
-                    unique_ocids.add(release_or_record["ocid"])
-
-        context["count"] = count
-        context["unique_ocids_count"] = len(unique_ocids)
-
-    additional_codelist_values = get_additional_codelist_values(schema_obj, json_data)
-    context["additional_closed_codelist_values"] = {
-        key: value for key, value in additional_codelist_values.items() if not value["isopen"]
-    }
-    context["additional_open_codelist_values"] = {
-        key: value for key, value in additional_codelist_values.items() if value["isopen"]
-    }
+    for check in checks[1:]:
+        check.finish(context)
 
     if additional_checks:
-        context["additional_checks"] = run_additional_checks(json_data, additional_checks)
+        context["additional_checks"] = get_additional_checks_results(additional_checks)
+        add_truncated(context, "additional_checks", get_additional_checks_truncated(additional_checks))
 
     return context
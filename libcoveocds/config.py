@@ -19,6 +19,19 @@ LIB_COVE_OCDS_CONFIG_DEFAULT = {
     "current_language": "en",
     # Path to ZIP file of standard repository.
     "standard_zip": None,
+    # The maximum number of schema profiles (version, extensions, package schema, language, standard ZIP and context)
+    # whose patched schemas, registries and validators are cached across SchemaOCDS instances. 0 disables the cache.
+    "schema_cache_size": 32,
+    # The number of threads in which to fetch extensions' files. 1 disables concurrency. ocdsextensionregistry pools up
+    # to 10 connections per host, by default.
+    "fetch_workers": 10,
+    # Path to a directory in which to cache patched schemas and codelists across processes. None disables the cache.
+    # The files are trusted, so the directory must only be writable by the users that run lib-cove-ocds.
+    "schema_cache_dir": None,
+    # The number of seconds after which a file in the directory expires. 0 disables expiry.
+    "schema_cache_ttl": 86400,
+    # The maximum size of the files in the directory, in bytes. The oldest files are removed first.
+    "schema_cache_max_bytes": 100_000_000,
     #
     # Flatten Tool options
     #
@@ -33,10 +46,35 @@ LIB_COVE_OCDS_CONFIG_DEFAULT = {
     #
     # lib-cove-ocds options
     #
-    # Which additional checks to perform ("all" or "none", per libcoveocds.lib.additional_checks.CHECKS).
+    # Which additional checks to perform: "all", "none", or a comma-separated string or list of the names of checks
+    # registered with libcoveocds.lib.additional_checks.register(), like "empty_field".
     "additional_checks": "all",
     # Whether to add "count" and "unique_ocids_count" to the context.
     "skip_aggregates": False,
+    # The maximum number of paths to keep for each type of validation error, each additional check and each type of
+    # conformance error. All are counted, and the counts of truncated types are added to the context, as "truncated".
+    # None disables the limit.
+    "max_errors_per_type": None,
+    # The maximum number of validation errors to keep, across all types. None disables the limit.
+    "max_validation_errors": None,
+    # Path to a directory in which to store the results of the checks of each release or record, in an API context, to
+    # only check new or changed releases or records on later runs. None disables the cache.
+    "item_cache_dir": None,
+    # The number of seconds after which results expire, from when they are stored. 0 disables expiry.
+    "item_cache_ttl": 604800,
+    # Whether to first validate the data with functions compiled from the package schema, which determine quickly
+    # whether the data is valid, so that lib-cove's validator only reports the errors of invalid data. The functions
+    # are compiled once per schema profile, and aren't persisted. See libcoveocds.fast_validator.
+    "fast_validation": False,
+    # Whether to share equal strings in the data that ocds_json_output() reads, to reduce its memory usage. See
+    # libcoveocds.util.compact.
+    "compact_data": False,
+    # The number of processes in which to check releases or records, in an API context. 1 disables multiprocessing.
+    "workers": 1,
+    # Whether to add the wall time, CPU time and peak allocation of each stage to the context, as "timings".
+    "profile": False,
+    # A function to call with the name and measurements of each stage, as each stage ends. See libcoveocds.profiling.
+    "profile_hook": None,
     # The context in which lib-cove-ocds is used ("web" or "api").
     "context": "web",
 }
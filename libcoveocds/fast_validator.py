@@ -0,0 +1,506 @@
+"""
+Compile a package schema into Python functions, to determine quickly whether data has no validation errors.
+
+The functions answer a narrower question than lib-cove's validator: whether it would report no errors. If a function
+returns ``False``, the data might still be valid, and the caller validates it with lib-cove's validator, to report the
+errors. Keywords that aren't compiled, like ``multipleOf``, return ``False``, so that the data is validated by
+lib-cove's validator instead.
+
+The functions follow lib-cove's validator, as modified by :mod:`libcoveocds.common_checks`:
+
+- ``$ref`` is resolved with the validator's registry, and its siblings are ignored, like in JSON Schema Draft 4.
+- ``patternProperties`` is ignored, except to determine the additional properties.
+- ``enum`` is ignored if its schema has an ``isCodelist`` property, because lib-cove doesn't report such errors. The
+  ``codelist`` and ``openCodelist`` properties are annotations.
+- ``uniqueItems`` calls lib-cove's ``unique_ids`` with the identifier fields from
+  :func:`~libcoveocds.common_checks.get_id_names`.
+- ``oneOf`` follows :func:`~libcoveocds.common_checks.one_of_draft4`, which reports errors for the releases in a
+  record, if it assumes they are linked or embedded releases.
+
+The subschemas of ``oneOf``, ``anyOf`` and ``not`` are compiled a second time, to count ``enum`` errors for codelists,
+like jsonschema does in these keywords.
+
+The generated source is loaded with :func:`load`, which executes it. Only load source that :func:`generate` returned
+in the same process: don't persist it anywhere that others can write.
+"""
+
+import numbers
+import re
+from collections import deque
+
+from jsonschema import Draft4Validator, FormatChecker
+from jsonschema._utils import equal
+from libcove.lib.common import (
+    TypeChecker,
+    additionalItems_extra_data,
+    additionalProperties_extra_data,
+    required_draft4,
+    unique_ids,
+    validator,
+)
+from referencing.exceptions import Unresolvable
+from referencing.jsonschema import DRAFT4
+
+from libcoveocds.common_checks import get_id_names, one_of_draft4, unique_ids_or_ocids
+
+# one_of_draft4() identifies the releases in a record by this title or description.
+RELEASES_DESCRIPTION = "An array of linking identifiers or releases"
+DRAFT4_SCHEMAS = {"http://json-schema.org/draft-04/schema#", "http://json-schema.org/draft-04/schema"}
+
+# The implementations of the keywords that are compiled.
+KEYWORDS = {
+    **{
+        keyword: Draft4Validator.VALIDATORS[keyword]
+        for keyword in (
+            "$ref",
+            "allOf",
+            "anyOf",
+            "enum",
+            "format",
+            "items",
+            "maxItems",
+            "maxLength",
+            "maxProperties",
+            "maximum",
+            "minItems",
+            "minLength",
+            "minProperties",
+            "minimum",
+            "not",
+            "pattern",
+            "properties",
+            "type",
+        )
+    },
+    "additionalItems": additionalItems_extra_data,
+    "additionalProperties": additionalProperties_extra_data,
+    "oneOf": one_of_draft4,
+    "required": required_draft4,
+    "uniqueItems": unique_ids_or_ocids,
+}
+
+# Like lib-cove's TypeChecker.
+TYPES = {
+    "string": "isinstance(x, str)",
+    "array": "isinstance(x, list)",
+    "object": "isinstance(x, dict)",
+    "integer": "(isinstance(x, int) and not isinstance(x, bool))",
+    "number": "(isinstance(x, Number) and not isinstance(x, bool))",
+    "boolean": "isinstance(x, bool)",
+    "null": "x is None",
+}
+
+# The comparison operators of the minimum and maximum keywords, without and with "exclusiveMinimum" and
+# "exclusiveMaximum".
+BOUNDS = {
+    "minimum": ("<", "<=", "exclusiveMinimum"),
+    "maximum": (">", ">=", "exclusiveMaximum"),
+}
+LENGTHS = {
+    "minLength": ("str", "<"),
+    "maxLength": ("str", ">"),
+    "minItems": ("list", "<"),
+    "maxItems": ("list", ">"),
+    "minProperties": ("dict", "<"),
+    "maxProperties": ("dict", ">"),
+}
+
+
+class _Unsupported(Exception):  # noqa: N818
+    pass
+
+
+def _literal(value):
+    """Return the source of a JSON value, or raise if it isn't a JSON value."""
+    if value is None or isinstance(value, (bool, str, int)):
+        return repr(value)
+    if isinstance(value, float) and value == value and value not in {float("inf"), float("-inf")}:  # noqa: PLR0124
+        return repr(value)
+    if isinstance(value, list):
+        return f"[{', '.join(_literal(item) for item in value)}]"
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return f"{{{', '.join(f'{key!r}: {_literal(item)}' for key, item in value.items())}}}"
+    raise _Unsupported
+
+
+def _tuple(names):
+    return f"({''.join(f'{name}, ' for name in names)})"
+
+
+def _number(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise _Unsupported
+    return _literal(value)
+
+
+class _Generator:
+    def __init__(self, package_validator):
+        self.validators = type(package_validator).VALIDATORS
+        # Names of the functions, by the identity of their schema, their base URI and whether they are strict.
+        self.names = {}
+        # The schemas are kept, so that their identities aren't reused.
+        self.schemas = []
+        self.pending = deque()
+        self.lines = []
+        # Constants that refer to functions are assigned after all functions are defined.
+        self.tables = []
+        self.count = 0
+
+    def constant(self, source, tables=None):
+        self.count += 1
+        name = f"C{self.count}"
+        (self.tables if tables else self.lines).append(f"{name} = {source}")
+        return name
+
+    def function(self, schema, resolver, *, strict):
+        """
+        Return the name of the function for the schema, and queue it for compilation.
+
+        :param strict: whether errors that lib-cove doesn't report are counted, like within ``oneOf``
+        """
+        key = (id(schema), resolver._base_uri, strict)  # noqa: SLF001 # like jsonschema
+        if key not in self.names:
+            self.names[key] = f"{'s' if strict else 'r'}{len(self.names)}"
+            self.schemas.append(schema)
+            self.pending.append((self.names[key], schema, resolver, strict))
+        return self.names[key]
+
+    def descend(self, schema, resolver, *, strict):
+        """Return the name of the function for a subschema, like jsonschema's ``descend()``."""
+        if isinstance(schema, dict):
+            resolver = resolver.in_subresource(DRAFT4.create_resource(schema))
+        return self.function(schema, resolver, strict=strict)
+
+    def evolve(self, schema, resolver, *, strict):
+        """Return the name of the function for a subschema, like jsonschema's ``evolve()``, which keeps the scope."""
+        if isinstance(schema, dict) and DRAFT4.id_of(schema):
+            raise _Unsupported
+        return self.function(schema, resolver, strict=strict)
+
+    def generate(self, entries):
+        names = {key: self.function(schema, resolver, strict=False) for key, (schema, resolver) in entries.items()}
+
+        while self.pending:
+            name, schema, resolver, strict = self.pending.popleft()
+            if schema is True:
+                body = ["return True"]
+            elif not isinstance(schema, dict):
+                body = ["return False"]
+            else:
+                try:
+                    body = [*self.body(schema, resolver, strict=strict), "return True"]
+                except _Unsupported:
+                    body = ["return False"]
+            self.lines.extend(["", "", f"def {name}(x):", *(f"    {line}" for line in body)])
+
+        entries = ", ".join(f"{key!r}: {name}" for key, name in names.items())
+        return "\n".join([*self.lines, "", "", *self.tables, f"VALIDATORS = {{{entries}}}", ""])
+
+    def body(self, schema, resolver, *, strict):
+        # jsonschema changes the validator class, if the schema declares another dialect.
+        if "$schema" in schema and schema["$schema"] not in DRAFT4_SCHEMAS:
+            raise _Unsupported
+
+        ref = schema.get("$ref")
+        keywords = [("$ref", ref)] if ref is not None else list(schema.items())
+
+        lines = []
+        # Whether to compile properties and additionalProperties, after the other keywords.
+        objects = False
+        for keyword, value in keywords:
+            implementation = self.validators.get(keyword)
+            if implementation is None:
+                continue
+            if implementation is not KEYWORDS.get(keyword):
+                raise _Unsupported
+
+            if keyword == "$ref":
+                try:
+                    resolved = resolver.lookup(value)
+                except Unresolvable:
+                    raise _Unsupported from None
+                return [f"return {self.function(resolved.contents, resolved.resolver, strict=strict)}(x)"]
+
+            if keyword == "type":
+                types = [value] if isinstance(value, str) else value
+                if not isinstance(types, list) or not all(isinstance(name, str) and name in TYPES for name in types):
+                    raise _Unsupported
+                lines.append(f"if not ({' or '.join(TYPES[name] for name in types) or 'False'}): return False")
+
+            elif keyword == "enum":
+                # lib-cove doesn't report "enum" errors for codelists.
+                if not strict and "isCodelist" in schema:
+                    continue
+                if not isinstance(value, list):
+                    raise _Unsupported
+                strings = sorted({item for item in value if isinstance(item, str)})
+                others = [item for item in value if not isinstance(item, str)]
+                lines.extend(
+                    [
+                        "if isinstance(x, str):",
+                        f"    if x not in {self.constant(f'frozenset({_literal(strings)})')}: return False",
+                    ]
+                )
+                if not others:
+                    lines.append("else: return False")
+                elif others == [None]:
+                    lines.append("elif x is not None: return False")
+                else:
+                    lines.append(f"elif not _equal_any(x, {self.constant(_literal(others))}): return False")
+
+            elif keyword == "pattern":
+                if not isinstance(value, str):
+                    raise _Unsupported
+                try:
+                    re.compile(value)
+                except re.error:
+                    raise _Unsupported from None
+                search = self.constant(f"_re.compile({value!r}).search")
+                lines.append(f"if isinstance(x, str) and not {search}(x): return False")
+
+            elif keyword == "format":
+                if not isinstance(value, str):
+                    raise _Unsupported
+                lines.append(f"if not _conforms(x, {value!r}): return False")
+
+            elif keyword in LENGTHS:
+                cls, operator = LENGTHS[keyword]
+                lines.append(f"if isinstance(x, {cls}) and len(x) {operator} {_number(value)}: return False")
+
+            elif keyword in BOUNDS:
+                inclusive, exclusive, flag = BOUNDS[keyword]
+                operator = exclusive if schema.get(flag, False) else inclusive
+                lines.append(
+                    f"if isinstance(x, Number) and not isinstance(x, bool) and x {operator} {_number(value)}: "
+                    "return False"
+                )
+
+            elif keyword == "required":
+                if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+                    raise _Unsupported
+                if value:
+                    condition = " and ".join(f"{name!r} in x" for name in value)
+                    lines.append(f"if isinstance(x, dict) and not ({condition}): return False")
+
+            elif keyword in {"properties", "additionalProperties"}:
+                objects = True
+
+            elif keyword == "items":
+                if isinstance(value, dict):
+                    function = self.descend(value, resolver, strict=strict)
+                    lines.extend(
+                        ["if isinstance(x, list):", "    for i in x:", f"        if not {function}(i): return False"]
+                    )
+                elif isinstance(value, list):
+                    functions = [self.descend(item, resolver, strict=strict) for item in value]
+                    table = self.constant(_tuple(functions), tables=True)
+                    lines.extend(
+                        [
+                            "if isinstance(x, list):",
+                            f"    for i, f in zip(x, {table}):",
+                            "        if not f(i): return False",
+                        ]
+                    )
+                else:
+                    raise _Unsupported
+
+            elif keyword == "additionalItems":
+                # lib-cove's additionalItems_extra_data() does nothing if "items" is an object.
+                if not isinstance(schema.get("items", {}), dict):
+                    raise _Unsupported
+
+            elif keyword == "uniqueItems":
+                if value:
+                    try:
+                        id_names = get_id_names(schema)
+                    except (AttributeError, TypeError):
+                        raise _Unsupported from None
+                    lines.append(
+                        f"if isinstance(x, list) and not _unique(x, {self.constant(_literal(id_names))}): return False"
+                    )
+
+            elif keyword in {"allOf", "anyOf", "oneOf"}:
+                if not isinstance(value, list):
+                    raise _Unsupported
+                # jsonschema counts all errors to determine which subschemas are valid, in anyOf and oneOf.
+                functions = [self.descend(item, resolver, strict=strict or keyword != "allOf") for item in value]
+                if keyword == "allOf":
+                    lines.extend(f"if not {function}(x): return False" for function in functions)
+                elif keyword == "anyOf":
+                    condition = " or ".join(f"{function}(x)" for function in functions) or "False"
+                    lines.append(f"if not ({condition}): return False")
+                else:
+                    arguments = self.one_of(schema, value, functions, resolver, strict=strict)
+                    lines.append(f"if not _one_of(x, {arguments}): return False")
+
+            elif keyword == "not":
+                lines.append(f"if {self.evolve(value, resolver, strict=True)}(x): return False")
+
+        if objects:
+            lines.extend(self.properties(schema, resolver, strict=strict))
+
+        return lines
+
+    def properties(self, schema, resolver, *, strict):
+        properties = schema.get("properties", {})
+        if not isinstance(properties, dict):
+            raise _Unsupported
+
+        functions = {name: self.descend(subschema, resolver, strict=strict) for name, subschema in properties.items()}
+        table = self.constant(
+            f"{{{', '.join(f'{name!r}: {function}' for name, function in functions.items())}}}", tables=True
+        )
+
+        # Like lib-cove's additionalProperties_extra_data(). An additional property is invalid if these are true.
+        conditions = None
+        if "additionalProperties" in schema:
+            additional = schema["additionalProperties"]
+            if isinstance(additional, dict):
+                conditions = [f"not {self.descend(additional, resolver, strict=strict)}(v)"]
+            elif not additional:
+                conditions = []
+        if conditions is not None:
+            try:
+                patterns = "|".join(schema.get("patternProperties", {}))
+                re.compile(patterns)
+            except (TypeError, re.error):
+                raise _Unsupported from None
+            if patterns:
+                conditions.insert(0, f"not {self.constant(f'_re.compile({patterns!r}).search')}(k)")
+
+        if not functions and conditions is None:
+            return []
+        if conditions is None:
+            extra = "continue"
+        elif conditions:
+            extra = f"if {' and '.join(conditions)}: return False"
+        else:
+            extra = "return False"
+        return [
+            "if isinstance(x, dict):",
+            "    for k, v in x.items():",
+            f"        f = {table}.get(k)",
+            "        if f is None:",
+            f"            {extra}",
+            "        elif not f(v): return False",
+        ]
+
+    def one_of(self, schema, subschemas, functions, resolver, *, strict):
+        """Return the name of the constant with the arguments of ``_one_of()``, like ``one_of_draft4()``."""
+        # more_valid evolves the validator, which keeps the scope, instead of descending into the subschemas.
+        if any(isinstance(subschema, dict) and DRAFT4.id_of(subschema) for subschema in subschemas):
+            raise _Unsupported
+
+        flags = None
+        if schema.get("title") == "Releases" or schema.get("description") == RELEASES_DESCRIPTION:
+            try:
+                flags = [
+                    (
+                        "properties" in subschema.get("items", {}) and "id" not in subschema["items"]["properties"],
+                        "id" in subschema.get("items", {}).get("properties", {})
+                        or subschema.get("items", {}).get("$ref", "").endswith("release-schema.json"),
+                    )
+                    for subschema in subschemas
+                ]
+            except (AttributeError, TypeError):
+                raise _Unsupported from None
+
+        # If one_of_draft4() assumes that releases are linked or embedded, it yields the errors of the subschema, which
+        # lib-cove filters.
+        reported = [self.descend(subschema, resolver, strict=strict) for subschema in subschemas] if flags else []
+
+        return self.constant(f"({_tuple(functions)}, {_tuple(reported)}, {flags!r})", tables=True)
+
+
+def generate(package_validator, keys):
+    """
+    Return the source of the functions for the package schema and for the items of the arrays.
+
+    The source defines ``VALIDATORS``, a dict whose ``None`` key is the function for the package, and whose other keys
+    are the keys of the arrays, like "releases", with the functions for their items.
+
+    :param package_validator: a validator returned by ``schema_obj.validator(validator, FormatChecker())``
+    :param keys: the keys of the arrays, whose items are validated with their items subschema
+    """
+    # Like jsonschema, to resolve references within the package schema and to other schemas in the registry.
+    resolver = package_validator._resolver  # noqa: SLF001
+    package_schema = package_validator.schema
+
+    entries = {None: (package_schema, resolver)}
+    for key in keys:
+        items = package_schema.get("properties", {}).get(key, {}).get("items")
+        if isinstance(items, dict):
+            # ItemChecks evolves the package validator, which keeps the scope.
+            entries[key] = (items, resolver)
+
+    return _Generator(package_validator).generate(entries)
+
+
+def supported(package_validator):
+    """Return whether the validator's class and type checker are those that the generated source follows."""
+    cls = type(package_validator)
+    return (
+        cls.VALIDATORS is validator.VALIDATORS
+        and type(cls.TYPE_CHECKER) is TypeChecker
+        and cls.META_SCHEMA.get("$schema") in DRAFT4_SCHEMAS
+    )
+
+
+def _equal_any(instance, values):
+    return any(equal(value, instance) for value in values)
+
+
+def _unique(instance, id_names):
+    return next(unique_ids(_UNIQUE_VALIDATOR, ui=True, instance=instance, schema={}, id_names=id_names), None) is None
+
+
+def _one_of(instance, arguments):
+    # Like one_of_draft4(), which returns an error as soon as it assumes that releases are linked or embedded.
+    functions, reported, flags = arguments
+    for index, function in enumerate(functions):
+        if function(instance):
+            return not any(other(instance) for other in functions[index + 1 :])
+        if flags is not None:
+            linked, embedded = flags[index]
+            if type(instance) is not list or all("id" not in release for release in instance):
+                if linked:
+                    return reported[index](instance)
+            elif all("id" in release for release in instance):
+                if embedded:
+                    return reported[index](instance)
+            else:
+                return False
+    return False
+
+
+def _safe(function):
+    def wrapper(instance):
+        # If lib-cove's validator would raise an error, like RecursionError, let it.
+        try:
+            return function(instance)
+        except Exception:  # noqa: BLE001
+            return False
+
+    return wrapper
+
+
+# unique_ids() only calls the validator's is_type(), with "array".
+_UNIQUE_VALIDATOR = validator({})
+
+
+def load(source):
+    """
+    Compile the source from :func:`generate`, and return its ``VALIDATORS``.
+
+    The source is executed, so it must be trusted.
+    """
+    namespace = {
+        "Number": numbers.Number,
+        "_re": re,
+        "_conforms": FormatChecker().conforms,
+        "_equal_any": _equal_any,
+        "_unique": _unique,
+        "_one_of": _one_of,
+    }
+    exec(compile(source, "<libcoveocds.fast_validator>", "exec"), namespace)  # noqa: S102 # generated by generate()
+    return {key: _safe(function) for key, function in namespace["VALIDATORS"].items()}
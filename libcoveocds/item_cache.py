@@ -0,0 +1,101 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from importlib.metadata import PackageNotFoundError, version
+
+logger = logging.getLogger(__name__)
+
+FILENAME = "items.sqlite3"
+# The number of results to write before committing, so that other processes aren't blocked for long.
+COMMIT_SIZE = 1000
+
+
+def _version(name):
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+class ItemCache:
+    """
+    Store the results of the checks of each release or record in a SQLite database, to reuse them on later runs.
+
+    Results are keyed by the release's or record's digest and by the profile of the checks: that is, the schema's
+    profile key (version, extensions, package schema, language, standard ZIP and context), the array's key, the
+    selected additional checks, and the versions of lib-cove-ocds and lib-cove. Results expire ``ttl`` seconds after
+    they are stored, even if they are used, so that changes to the extensions and codelists at the same URLs are
+    eventually reflected. Expired results are removed when the cache is closed.
+
+    The database is read with :mod:`pickle`, so it must only be written by lib-cove-ocds.
+    """
+
+    def __init__(self, directory, profile, ttl):
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(directory, FILENAME), timeout=60)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(profile TEXT, digest BLOB, result BLOB, written REAL, PRIMARY KEY (profile, digest))"
+        )
+        self.connection.commit()
+        self.profile = hashlib.sha256(json.dumps(profile).encode()).hexdigest()
+        self.ttl = ttl
+        self.pending = 0
+
+    @classmethod
+    def open(cls, checks):
+        """
+        Return the cache for the checks of a :class:`~libcoveocds.stream.ItemChecks`, or ``None`` if disabled.
+
+        The cache is also disabled if fetching the schema's extensions or codelists failed with a network or server
+        error, because the results would differ once the fetch succeeds.
+        """
+        config = checks.schema_obj.config.config
+        if not config["item_cache_dir"] or not checks.key or checks.schema_obj.has_transient_errors():
+            return None
+
+        profile = [
+            checks.schema_obj.profile_key,
+            checks.key,
+            [check.name for check in checks.additional_checks],
+            _version("libcoveocds"),
+            _version("libcove"),
+        ]
+        return cls(config["item_cache_dir"], profile, config["item_cache_ttl"])
+
+    def get(self, digest):
+        """Return the results for the release or record with the digest, or ``None`` if missing."""
+        row = self.connection.execute(
+            "SELECT result FROM results WHERE profile = ? AND digest = ? AND written >= ?",
+            (self.profile, digest, time.time() - self.ttl if self.ttl else 0),
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0])  # noqa: S301 # written by set()
+
+    def set(self, result):
+        """Store the results for a release or record. The time spent in each additional check isn't stored."""
+        value = {key: value for key, value in result.items() if key != "costs"}
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (self.profile, result["hash"], pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time()),
+        )
+        self.pending += 1
+        if self.pending >= COMMIT_SIZE:
+            self.connection.commit()
+            self.pending = 0
+
+    def close(self):
+        """Remove expired results, and close the database."""
+        try:
+            if self.ttl:
+                self.connection.execute("DELETE FROM results WHERE written < ?", (time.time() - self.ttl,))
+            self.connection.commit()
+        except sqlite3.Error:
+            logger.exception("Couldn't update the item cache")
+        finally:
+            self.connection.close()
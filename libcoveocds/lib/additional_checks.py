@@ -1,54 +1,137 @@
-from collections import defaultdict
-
-
-def flatten_dict(data, path=""):
-    for key, value in data.items():
-        if not value:
-            yield (f"{path}/{key}", value)
-        elif isinstance(value, dict):
-            yield from flatten_dict(value, f"{path}/{key}")
-        elif isinstance(value, list):
-            for i, item in enumerate(value):
-                if isinstance(item, dict):
-                    yield from flatten_dict(item, f"{path}/{key}/{i}")
-                else:
-                    yield (f"{path}/{key}/{i}", item)
-        else:
-            yield (f"{path}/{key}", value)
-
-
-def empty_field(_data, flat):
-    """Yield fields, objects and arrays that are set but empty or containing only whitespace."""
-    for key, value in flat.items():
-        if (isinstance(value, str) and not value.strip()) or (isinstance(value, (dict, list)) and not value):
-            yield {"json_location": key}
-
-
-CHECKS = {"all": [empty_field], "none": []}
-
-
-def run_additional_checks(package, functions):
-    if "records" in package:
-        key = "records"
-    elif "releases" in package:
-        key = "releases"
-    else:
-        return {}
-
-    releases_or_records = package[key]
-    if not isinstance(releases_or_records, list):
-        return {}
-
-    results = defaultdict(list)
-
-    for i, release_or_record in enumerate(releases_or_records):
-        if not isinstance(release_or_record, dict):
-            continue
-        flat = dict(flatten_dict(release_or_record, f"{key}/{i}"))
-        for function in functions:
-            for output in function(release_or_record, flat):
-                results[function.__name__].append(output)
-
-    # https://stackoverflow.com/a/12842716/244258
-    results.default_factory = None
-    return results
+from libcoveocds.exceptions import LibCoveOCDSError
+from libcoveocds.lib.traversal import Check, traverse
+
+
+class AdditionalCheck(Check):
+    """
+    A check that is performed on each release or record, and whose results are added to "additional_checks".
+
+    Subclasses set ``name`` and call ``report()`` with their outputs while ``active`` is true. To make a check
+    selectable by the ``additional_checks`` configuration, decorate it with
+    :func:`~libcoveocds.lib.additional_checks.register`.
+
+    Outputs locate findings with a ``json_location``. If not, override ``relocate()``.
+    """
+
+    name = None
+
+    def __init__(self, limit=None):
+        """
+        Initialize the check.
+
+        :param limit: the maximum number of outputs to keep in ``results``. All outputs are counted in ``count``.
+        """
+        self.limit = limit
+
+    def start(self, data):
+        self.results = []
+        self.count = 0
+        self.key = None
+        # Whether a release or record is being traversed.
+        self.active = False
+
+        if isinstance(data, dict):
+            if "records" in data:
+                key = "records"
+            elif "releases" in data:
+                key = "releases"
+            else:
+                return
+            if isinstance(data[key], list):
+                self.key = key
+
+    def enter(self, key, index, item):  # noqa: ARG002
+        self.active = key == self.key and isinstance(item, dict)
+
+    def leave(self, key, index, item):  # noqa: ARG002
+        self.active = False
+
+    def report(self, output):
+        """Count an output, and add it to the results, within the limit."""
+        self.count += 1
+        if self.limit is None or len(self.results) < self.limit:
+            self.results.append(output)
+
+    @staticmethod
+    def relocate(output, old, new):
+        """
+        Return the output for a release or record at the path ``old`` (like ``releases/0``), as if it were at ``new``.
+
+        This is used to reuse the outputs of unchanged releases or records that moved. See
+        :class:`~libcoveocds.item_cache.ItemCache`.
+        """
+        if "json_location" not in output:
+            return output
+        return {**output, "json_location": new + output["json_location"][len(old) :]}
+
+
+def _is_empty(value):
+    return (isinstance(value, str) and not value.strip()) or (isinstance(value, (dict, list)) and not value)
+
+
+# Sets of additional checks, by name. "all" contains all registered checks.
+CHECKS = {"all": [], "none": []}
+
+
+def register(check):
+    """Register an additional check, replacing any with the same name. Use as a class decorator."""
+    CHECKS["all"][:] = [*(registered for registered in CHECKS["all"] if registered.name != check.name), check]
+    return check
+
+
+def get_checks(selection):
+    """
+    Return the additional checks for the ``additional_checks`` configuration.
+
+    :param selection: the name of a set of checks in ``CHECKS``, like "all" or "none", or a comma-separated string or
+                      list of the names of registered checks
+    :raises LibCoveOCDSError: if a name is not registered
+    """
+    if isinstance(selection, str):
+        if selection in CHECKS:
+            return CHECKS[selection]
+        selection = selection.split(",")
+
+    registered = {check.name: check for check in CHECKS["all"]}
+    checks = []
+    for name in selection:
+        if name.strip() not in registered:
+            raise LibCoveOCDSError(f"{name.strip()!r} is not a registered check: {', '.join(registered)}")
+        checks.append(registered[name.strip()])
+    return checks
+
+
+def _join(path, key):
+    return "/".join(map(str, (*path, key)))
+
+
+@register
+class EmptyField(AdditionalCheck):
+    """Report fields, objects and arrays that are set but empty or containing only whitespace."""
+
+    name = "empty_field"
+
+    def field(self, path, generic_path, key, value):  # noqa: ARG002
+        if self.active and _is_empty(value):
+            self.report({"json_location": _join(path, key)})
+
+    def array_item(self, path, generic_path, index, value):  # noqa: ARG002
+        # Objects in arrays are traversed, instead.
+        if self.active and not isinstance(value, dict) and _is_empty(value):
+            self.report({"json_location": _join(path, index)})
+
+
+def get_additional_checks_results(checks):
+    """Return the results of the additional checks, for the "additional_checks" context."""
+    return {check.name: check.results for check in checks if check.results}
+
+
+def get_additional_checks_truncated(checks):
+    """Return a mapping from the name of each check whose outputs weren't all kept to its number of outputs."""
+    return {check.name: check.count for check in checks if check.count > len(check.results)}
+
+
+def run_additional_checks(package, checks):
+    checks = [check() for check in checks]
+    traverse(package, checks)
+    return get_additional_checks_results(checks)
@@ -1,5 +1,14 @@
 import json
 
+# The keys of the context whose values are findings.
+FINDINGS = (
+    "validation_errors",
+    "conformance_errors",
+    "additional_checks",
+    "additional_closed_codelist_values",
+    "additional_open_codelist_values",
+)
+
 
 def context_api_transform(context):
     """
@@ -21,6 +30,8 @@ def context_api_transform(context):
        -  ``value`` from the list of dicts
        -  Ignore other keys
 
+    -  Reformat ``truncated/validation_errors``, if present, from { "{..}": count, ..} to [ {..}, ..], with ``type``,
+       ``field`` and ``description`` as above, and ``count``
     -  Reformat ``extensions``:
 
        -  Reformat ``extensions`` from a dict to a list of its values, for the keys not in ``invalid_extensions``
@@ -53,6 +64,20 @@ def context_api_transform(context):
         )
     context["validation_errors"] = validation_errors
 
+    if "validation_errors" in context.get("truncated", {}):
+        truncated = []
+        for json_error, count in context["truncated"]["validation_errors"].items():
+            error = json.loads(json_error)
+            truncated.append(
+                {
+                    "type": error["message_type"],
+                    "field": error["path_no_number"],
+                    "description": error["message"],
+                    "count": count,
+                }
+            )
+        context["truncated"]["validation_errors"] = truncated
+
     extensions = context["extensions"]
     if extensions:
         invalid_extension = extensions["invalid_extension"]
@@ -63,3 +88,30 @@ def context_api_transform(context):
 
     # Context is edited in-place, but existing callers might expect a return value.
     return context
+
+
+def iter_findings(context):
+    """
+    Yield the findings in a context that is reformatted for use in an API context, one at a time, then a summary.
+
+    Each finding is an object with one key: the key of the context under which it is. Its value is:
+
+    -  For ``validation_errors``, one validation error
+    -  For ``conformance_errors`` and ``additional_checks``, an object with one key and one item of its list
+    -  For ``additional_closed_codelist_values`` and ``additional_open_codelist_values``, an object with one key and
+       its value
+
+    The summary is an object with a ``summary`` key, whose value is the context without these keys. The context is not
+    modified.
+    """
+    for error in context.get("validation_errors", []):
+        yield {"validation_errors": error}
+    for name in ("conformance_errors", "additional_checks"):
+        for key, values in (context.get(name) or {}).items():
+            for value in values:
+                yield {name: {key: value}}
+    for name in ("additional_closed_codelist_values", "additional_open_codelist_values"):
+        for key, value in (context.get(name) or {}).items():
+            yield {name: {key: value}}
+
+    yield {"summary": {key: value for key, value in context.items() if key not in FINDINGS}}
@@ -1,4 +1,10 @@
 import re
+import typing
+
+from libcoveocds.lib.limits import add_truncated, room
+from libcoveocds.lib.traversal import Check
+
+PREFIX_REGEX = re.compile(r"^ocds-[a-z0-9]{6}")
 
 
 def _update_documents_counter(obj, counter):
@@ -7,50 +13,194 @@ def _update_documents_counter(obj, counter):
     return len(documents)
 
 
+def _is_bad_prefix(item):
+    if (
+        isinstance(item, dict)
+        and (ocid := item.get("ocid"))
+        and isinstance(ocid, str)
+        and not PREFIX_REGEX.match(ocid)
+    ):
+        return ocid
+    return None
+
+
 def get_bad_ocid_prefixes(json_data):
     """Yield tuples with ('ocid', 'path/to/ocid') for ocids with malformed prefixes."""
     if not isinstance(json_data, dict):
         return []
 
-    prefix_regex = re.compile(r"^ocds-[a-z0-9]{6}")
-
-    def _is_bad_prefix(item):
-        if (
-            isinstance(item, dict)
-            and (ocid := item.get("ocid"))
-            and isinstance(ocid, str)
-            and not prefix_regex.match(ocid)
-        ):
-            return ocid
-        return None
-
     if records := json_data.get("records"):
         bad_prefixes = []
         if isinstance(records, list):
             for i, record in enumerate(records):
-                if not isinstance(record, dict):
-                    continue
-
-                if ocid := _is_bad_prefix(record):
-                    bad_prefixes.append((ocid, f"records/{i}/ocid"))
-
-                releases = record.get("releases")
-                if isinstance(releases, list):
-                    for j, release in enumerate(releases):
-                        if ocid := _is_bad_prefix(release):
-                            bad_prefixes.append((ocid, f"records/{i}/releases/{j}/ocid"))
-
-                compiled_release = record.get("compiledRelease")
-                if ocid := _is_bad_prefix(compiled_release):
-                    bad_prefixes.append((ocid, f"records/{i}/compiledRelease/ocid"))
+                bad_prefixes.extend(get_bad_ocid_prefixes_item("records", i, record))
         return bad_prefixes
 
     if releases := json_data.get("releases"):
         bad_prefixes = []
         if isinstance(releases, list):
             for j, release in enumerate(releases):
-                if ocid := _is_bad_prefix(release):
-                    bad_prefixes.append((ocid, f"releases/{j}/ocid"))
+                bad_prefixes.extend(get_bad_ocid_prefixes_item("releases", j, release))
         return bad_prefixes
 
     return []
+
+
+def get_bad_ocid_prefixes_item(key, i, release_or_record):
+    """Return tuples with ('ocid', 'path/to/ocid') for ocids with malformed prefixes in one release or record."""
+    if key == "releases":
+        if ocid := _is_bad_prefix(release_or_record):
+            return [(ocid, f"releases/{i}/ocid")]
+        return []
+
+    record = release_or_record
+    if not isinstance(record, dict):
+        return []
+
+    bad_prefixes = []
+
+    if ocid := _is_bad_prefix(record):
+        bad_prefixes.append((ocid, f"records/{i}/ocid"))
+
+    releases = record.get("releases")
+    if isinstance(releases, list):
+        for j, release in enumerate(releases):
+            if ocid := _is_bad_prefix(release):
+                bad_prefixes.append((ocid, f"records/{i}/releases/{j}/ocid"))
+
+    compiled_release = record.get("compiledRelease")
+    if ocid := _is_bad_prefix(compiled_release):
+        bad_prefixes.append((ocid, f"records/{i}/compiledRelease/ocid"))
+
+    return bad_prefixes
+
+
+class BadOcidPrefixes(Check):
+    """Collect tuples with ('ocid', 'path/to/ocid') for ocids with malformed prefixes, like get_bad_ocid_prefixes()."""
+
+    def __init__(self, limit=None):
+        """
+        Initialize the check.
+
+        :param limit: the maximum number of tuples to keep in ``results``. All tuples are counted in ``count``.
+        """
+        self.limit = limit
+
+    def start(self, data):
+        self.results = []
+        self.count = 0
+        self.key = None
+
+        if isinstance(data, dict):
+            if records := data.get("records"):
+                self.key = "records" if isinstance(records, list) else None
+            elif releases := data.get("releases"):
+                self.key = "releases" if isinstance(releases, list) else None
+
+    def enter(self, key, index, item):
+        if key == self.key:
+            results = get_bad_ocid_prefixes_item(key, index, item)
+            self.count += len(results)
+            self.results.extend(results[: room(self.limit, len(self.results))])
+
+    def finish(self, context):
+        if self.results:
+            context["conformance_errors"] = {"ocds_prefixes_bad_format": self.results}
+        if self.count > len(self.results):
+            add_truncated(context, "conformance_errors", {"ocds_prefixes_bad_format": self.count})
+
+
+class Aggregates(Check):
+    """Count the releases or records, and their unique OCIDs that are hashable."""
+
+    def start(self, data):
+        self.count = 0
+        self.unique_ocids = set()
+        self.key = None
+        self.is_package = isinstance(data, dict)
+
+        if self.is_package:
+            key = "records" if data.get("records", []) else "releases"
+            if isinstance(data.get(key, []), list):
+                self.key = key
+
+    def enter(self, key, index, item):  # noqa: ARG002
+        if key == self.key and isinstance(item, dict):
+            self.count += 1
+            if (ocid := item.get("ocid")) and isinstance(ocid, typing.Hashable):
+                self.unique_ocids.add(ocid)
+
+    def finish(self, context):
+        if self.is_package:
+            context["count"] = self.count
+            context["unique_ocids_count"] = len(self.unique_ocids)
+
+
+class AdditionalCodelistValues(Check):
+    """Collect the values of codelist fields that aren't in the codelist, like get_additional_codelist_values()."""
+
+    def __init__(self, schema_obj):
+        self.schema_obj = schema_obj
+
+    def start(self, data):  # noqa: ARG002
+        self.table = self.schema_obj.get_codelist_table()
+        # Only the fields on the way to codelist fields are traversed.
+        self.paths = self.schema_obj.extended_codelist_schema_paths
+        self.results = {}
+        # The path of the last array whose first item isn't an object.
+        self.skipped = None
+
+    def _skipped(self, path):
+        if self.skipped:
+            if path[: len(self.skipped)] == self.skipped:
+                return True
+            self.skipped = None
+        return False
+
+    def _skip(self, path):
+        # lib-cove doesn't traverse the items of an array whose first item isn't an object.
+        if not self._skipped(path):
+            self.skipped = path
+
+    def field(self, path, generic_path, key, value):
+        if not value:
+            return
+
+        fields = self.table.get(generic_path)
+        if fields is None or key not in fields:
+            if isinstance(value, list) and not isinstance(value[0], dict):
+                self._skip((*path, key))
+            return
+
+        # A field is never the skipped array itself, so it is in the skipped array if its object is.
+        if self._skipped(path) or isinstance(value, dict):
+            return
+        if isinstance(value, list):
+            if isinstance(value[0], dict):
+                return
+            self._skip((*path, key))
+            values = value
+        else:
+            values = (value,)
+
+        codes, path_string, info = fields[key]
+        for item in values:
+            code = str(item)
+            if code in codes:
+                continue
+
+            if path_string not in self.results:
+                # "codelist_amend_urls" is shared with the table, and isn't modified.
+                self.results[path_string] = {**info, "values": set()}
+            self.results[path_string]["values"].add(code)
+
+    def finish(self, context):
+        for info in self.results.values():
+            info["values"] = sorted(info["values"])
+
+        context["additional_closed_codelist_values"] = {
+            key: value for key, value in self.results.items() if not value["isopen"]
+        }
+        context["additional_open_codelist_values"] = {
+            key: value for key, value in self.results.items() if value["isopen"]
+        }
@@ -0,0 +1,46 @@
+def room(limit, used):
+    """Return the number of outputs that can be added within the limit, or ``None`` if there is no limit."""
+    if limit is None:
+        return None
+    return max(limit - used, 0)
+
+
+def add_truncated(context, name, truncated):
+    """Add the counts of the truncated types to the context, if any."""
+    if truncated:
+        context.setdefault("truncated", {})[name] = truncated
+
+
+class Limiter:
+    """
+    Keep the first outputs of each type, within a per-type limit and a total limit, and count all outputs.
+
+    ``outputs`` maps each type to its kept outputs, and ``counts`` maps each type to its number of outputs. A type is
+    kept even if none of its outputs are, so that the order of types doesn't depend on the limits.
+    """
+
+    def __init__(self, per_type=None, total=None):
+        self.per_type = per_type
+        self.total = total
+        self.kept = 0
+        self.outputs = {}
+        self.counts = {}
+
+    def add(self, key, values):
+        """Add a list of outputs of a type."""
+        outputs = self.outputs.setdefault(key, [])
+        self.counts[key] = self.counts.get(key, 0) + len(values)
+
+        rooms = [n for n in (room(self.per_type, len(outputs)), room(self.total, self.kept)) if n is not None]
+        if rooms:
+            values = values[: min(rooms)]
+        outputs.extend(values)
+        self.kept += len(values)
+
+    def count(self):
+        """Return the number of outputs, including those that weren't kept."""
+        return sum(self.counts.values())
+
+    def truncated(self):
+        """Return a mapping from each type for which some outputs weren't kept to its number of outputs."""
+        return {key: count for key, count in self.counts.items() if count > len(self.outputs[key])}
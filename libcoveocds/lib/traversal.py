@@ -0,0 +1,240 @@
+import time
+
+KEYS = ("records", "releases")
+
+
+class Check:
+    """
+    A check that is performed during a single traversal of the data, by :func:`~libcoveocds.lib.traversal.traverse`.
+
+    Subclasses override the methods for the events they need, and add their results to the context in ``finish()``.
+
+    Subclasses can set ``paths`` to limit the ``field()`` and ``array_item()`` events to some generic paths, like
+    ``{("releases", "tender", "items")}``. The check then receives the events for the fields within these paths, and
+    for the fields on the way to them, like ``tender``. A subtree that no check needs isn't traversed. If ``paths`` is
+    set in ``start()``, set it to the same object on each call, so that it is compiled once.
+    """
+
+    paths = None
+
+    def start(self, data):
+        """Prepare the check, before the data is traversed."""
+
+    def enter(self, key, index, item):
+        """Check a release or record, before its fields are traversed. ``key`` is "releases" or "records"."""
+
+    def leave(self, key, index, item):
+        """Check a release or record, after its fields are traversed."""
+
+    def field(self, path, generic_path, key, value):
+        """
+        Check a field of an object.
+
+        ``path`` is a tuple of the keys and indices to the object, and ``generic_path`` is the same without indices.
+        ``key`` is the field's name. The path to the field, ``(*path, key)``, is not built during the traversal, to not
+        allocate a tuple for every field. Build it only if needed, like when reporting a result.
+        """
+
+    def array_item(self, path, generic_path, index, value):
+        """
+        Check an item of an array.
+
+        ``path`` is a tuple of the keys and indices to the array, and ``generic_path`` is the same without indices.
+        The items of nested arrays are not traversed. The releases or records are instead checked by ``enter()``.
+        """
+
+    def finish(self, context):
+        """Add the results to the context."""
+
+
+# The position in a check's paths, if all fields within it are needed.
+_ALL = object()
+# Compiled paths, by the identity of the paths. The paths are kept, so that the identity isn't reused.
+_tries = {}
+
+
+def _compile(paths):
+    if (cached := _tries.get(id(paths))) is None:
+        trie = {}
+        for path in sorted(paths, key=len):
+            node = trie
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+                if node is _ALL:
+                    break
+            else:
+                node[path[-1]] = _ALL
+        if len(_tries) >= 128:  # noqa: PLR2004
+            _tries.clear()
+        cached = _tries[id(paths)] = (paths, trie)
+    return cached[1]
+
+
+def _timed(method, costs, cls):
+    def wrapper(*args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            costs[cls] = costs.get(cls, 0) + time.perf_counter() - start
+
+    return wrapper
+
+
+class _Node:
+    """
+    The callbacks for a field's events, at a generic path.
+
+    ``visit`` is whether the field's object or array is traversed. ``children`` are the nodes for the fields of the
+    objects at this generic path, which are built as the fields are found.
+    """
+
+    __slots__ = ("array_item", "children", "field", "generic_path", "positions", "visit")
+
+    def __init__(self, generic_path, positions, field, array_item, visit):
+        self.generic_path = generic_path
+        # The positions of the scoped checks in their compiled paths.
+        self.positions = positions
+        self.field = field
+        self.array_item = array_item
+        self.visit = visit
+        self.children = {}
+
+
+class _Callbacks:
+    def __init__(self, checks, costs=None):
+        def callbacks(check, name):
+            method = getattr(check, name)
+            if getattr(type(check), name) is getattr(Check, name):
+                return None
+            if costs is not None:
+                return _timed(method, costs, type(check))
+            return method
+
+        # Skip the events that no check overrides.
+        self.enter = [method for check in checks if (method := callbacks(check, "enter"))]
+        self.leave = [method for check in checks if (method := callbacks(check, "leave"))]
+
+        self.field = []
+        self.array_item = []
+        # The field() and array_item() callbacks of checks that set paths.
+        self.scoped = []
+        tries = []
+        for check in checks:
+            field = callbacks(check, "field")
+            array_item = callbacks(check, "array_item")
+            if not field and not array_item:
+                continue
+            if check.paths is None:
+                if field:
+                    self.field.append(field)
+                if array_item:
+                    self.array_item.append(array_item)
+            else:
+                self.scoped.append((field, array_item))
+                tries.append(_compile(check.paths))
+
+        self.root = _Node((), tuple(tries), [], [], visit=True)
+
+    def child(self, node, key):
+        """Return the node for a field of the objects at the node's generic path."""
+        positions = tuple(
+            position if position is None or position is _ALL else position.get(key) for position in node.positions
+        )
+        field = self.field.copy()
+        array_item = self.array_item.copy()
+        for (field_callback, array_item_callback), position in zip(self.scoped, positions):
+            if position is not None:
+                if field_callback:
+                    field.append(field_callback)
+                if array_item_callback:
+                    array_item.append(array_item_callback)
+        visit = bool(self.field or self.array_item) or any(position is not None for position in positions)
+
+        child = node.children[key] = _Node((*node.generic_path, key), positions, field, array_item, visit)
+        return child
+
+
+def traverse(data, checks, costs=None):
+    """
+    Start the checks, and then traverse the data once, calling each check for each event.
+
+    If ``costs`` is a dict, the time spent in each check's methods is added to it, in seconds, by the check's class.
+    """
+    _start(data, checks, costs)
+
+    if not isinstance(data, dict):
+        return
+
+    callbacks = _Callbacks(checks, costs)
+    root = callbacks.root
+
+    for key, value in data.items():
+        node = root.children.get(key) or callbacks.child(root, key)
+        for callback in node.field:
+            callback((), (), key, value)
+        if isinstance(value, dict):
+            if node.visit:
+                _traverse_object(value, (key,), node, callbacks)
+        elif isinstance(value, list):
+            if key in KEYS:
+                for index, item in enumerate(value):
+                    _traverse_item(key, index, item, node, callbacks)
+            elif node.visit:
+                _traverse_array(value, (key,), node, callbacks)
+
+
+def traverse_item(key, index, item, checks, costs=None):
+    """
+    Start the checks, and then traverse one release or record, like :func:`~libcoveocds.lib.traversal.traverse`.
+
+    The checks are started as if the package contained only this release or record.
+    """
+    _start({key: [item]}, checks, costs)
+
+    callbacks = _Callbacks(checks, costs)
+    _traverse_item(key, index, item, callbacks.child(callbacks.root, key), callbacks)
+
+
+def _start(data, checks, costs):
+    for check in checks:
+        if costs is None:
+            check.start(data)
+        else:
+            _timed(check.start, costs, type(check))(data)
+
+
+def _traverse_item(key, index, item, node, callbacks):
+    for callback in callbacks.enter:
+        callback(key, index, item)
+    if isinstance(item, dict) and node.visit:
+        _traverse_object(item, (key, index), node, callbacks)
+    for callback in callbacks.leave:
+        callback(key, index, item)
+
+
+def _traverse_object(data, path, node, callbacks):
+    children = node.children
+    generic_path = node.generic_path
+
+    # The paths to children are built only for objects and arrays, which are traversed.
+    for key, value in data.items():
+        child = children.get(key) or callbacks.child(node, key)
+        for callback in child.field:
+            callback(path, generic_path, key, value)
+        if child.visit:
+            if isinstance(value, dict):
+                _traverse_object(value, (*path, key), child, callbacks)
+            elif isinstance(value, list):
+                _traverse_array(value, (*path, key), child, callbacks)
+
+
+def _traverse_array(data, path, node, callbacks):
+    array_items = node.array_item
+    generic_path = node.generic_path
+
+    for index, item in enumerate(data):
+        for callback in array_items:
+            callback(path, generic_path, index, item)
+        if isinstance(item, dict):
+            _traverse_object(item, (*path, index), node, callbacks)
@@ -0,0 +1,108 @@
+import functools
+import json
+import re
+
+import bleach
+from django.utils.html import conditional_escape, escape, format_html, mark_safe
+from markdown_it import MarkdownIt
+
+md = MarkdownIt()
+
+validation_error_lookup = {
+    "date-time": mark_safe(
+        "Incorrect date format. Dates should use the form YYYY-MM-DDT00:00:00Z. Learn more about "
+        '<a href="https://standard.open-contracting.org/latest/en/schema/reference/#date">dates in OCDS</a>.'
+    ),
+}
+
+
+# ref_info is used calculate the HTML anchor for the field in the OCDS documentation.
+def _lookup_schema(schema, path, ref_info=None):
+    if not path:
+        return schema, ref_info
+
+    if hasattr(schema, "__reference__"):
+        ref_info = {"path": path, "reference": schema.__reference__}
+
+    if "items" in schema:
+        return _lookup_schema(schema["items"], path, ref_info)
+    if "properties" in schema:
+        head, *tail = path
+        if head in schema["properties"]:
+            return _lookup_schema(schema["properties"][head], tail, ref_info)
+    return None, None
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_description(description):
+    # The same descriptions recur across validation errors, profiles and calls.
+    return mark_safe(bleach.clean(md.render(description), tags=bleach.sanitizer.ALLOWED_TAGS | {"p"}))
+
+
+def _get_schema_path_info(schema_obj, path_no_number):
+    """
+    Return the title, description and documentation reference for the field at the path in the package schema.
+
+    The return value is memoized on the schema's profile, so that the schema is looked up once per path.
+    """
+    index = schema_obj.get_schema_path_index()
+    if path_no_number in index:
+        return index[path_no_number]
+
+    schema_block, ref_info = _lookup_schema(
+        schema_obj.get_pkg_schema_obj(deref=True, proxies=True), path_no_number.split("/")
+    )
+    info = None
+    if schema_block:
+        info = {}
+        if "description" in schema_block:
+            info["schema_title"] = escape(schema_block.get("title", ""))
+            info["schema_description_safe"] = _render_description(schema_block["description"])
+        if ref_info:
+            ref = ref_info["reference"]["$ref"]
+            ref = "" if ref.endswith("release-schema.json") else ref.strip("#")
+            ref_path = "/".join(ref_info["path"])
+            schema = "record-package-schema.json" if ref == "/definitions/record" else "release-schema.json"
+        else:
+            ref = ""
+            ref_path = path_no_number
+            schema = schema_obj.package_schema_name
+        info["docs_ref"] = format_html("{},{},{}", schema, ref, ref_path)
+
+    index[path_no_number] = info
+    return info
+
+
+def format_web(context, schema_obj, common_checks):
+    """
+    Reformat ``context`` and ``common_checks`` for use in a web context.
+
+    -  Add the guidance of the ``ocid`` field to ``conformance_errors``
+    -  Add the formatted message, schema title, schema description and reference URL to ``validation_errors``
+    """
+    if "conformance_errors" in context:
+        ocid_description = schema_obj.get_schema_obj()["properties"]["ocid"]["description"]
+        # The last sentence of the `ocid` description is assumed to contain a guidance URL in all OCDS versions.
+        index = ocid_description.rindex(". ") + 1
+        context["conformance_errors"]["ocid_description"] = ocid_description[:index]
+        context["conformance_errors"]["ocid_info_url"] = re.search(r"\((\S+)\)", ocid_description[index:]).group(1)
+
+    new_validation_errors = []
+    for json_key, values in common_checks["context"]["validation_errors"]:
+        error = json.loads(json_key)
+
+        new_message = validation_error_lookup.get(error["message_type"])
+        if new_message:
+            error["message_safe"] = conditional_escape(new_message)
+        elif "message_safe" in error:
+            error["message_safe"] = mark_safe(error["message_safe"])
+        else:
+            error["message_safe"] = conditional_escape(error["message"])
+
+        if error["message_type"] != "required" and (
+            info := _get_schema_path_info(schema_obj, error["path_no_number"])
+        ):
+            error.update(info)
+
+        new_validation_errors.append([json.dumps(error, sort_keys=True), values])
+    common_checks["context"]["validation_errors"] = new_validation_errors
@@ -0,0 +1,102 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# tracemalloc is process-wide, so profilers in different threads share its tracing and its peak. These are the
+# profilers that have started a stage and not finished, and whether one of them started tracing.
+_lock = threading.Lock()
+_active = set()
+_started = False
+
+
+class Profiler:
+    """
+    Measure the wall time, CPU time and peak allocation of each stage, if enabled by the configuration.
+
+    If the ``profile`` configuration is set, :meth:`~libcoveocds.profiling.Profiler.finish` adds a ``timings`` object
+    to the context. If the ``profile_hook`` configuration is set, it is called with the name and measurements of each
+    stage, as each stage ends.
+
+    Each additional check's cumulative wall time and number of findings are added, like
+    ``common_checks/additional_checks/empty_field``.
+
+    The names of nested stages are joined with a slash. The wall and CPU times are in seconds, and the peak allocation
+    is in bytes. The peak allocation is measured with :mod:`tracemalloc`, which slows down the stage. The CPU time is
+    that of the current process only.
+
+    tracemalloc has one peak per process. If profilers overlap, like in the threads of the ``serve`` command, the peak
+    allocation of the stages during which another profiler was active is ``None``.
+    """
+
+    def __init__(self, config):
+        self.hook = config["profile_hook"]
+        self.report = config["profile"]
+        self.enabled = self.report or self.hook is not None
+        self.timings = {}
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name):
+        global _started  # noqa: PLW0603
+
+        if not self.enabled:
+            yield
+            return
+
+        with _lock:
+            if self not in _active:
+                if not _active and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _started = True
+                # The other profilers' stages can't measure their peak, and this profiler's stages neither.
+                for profiler in _active:
+                    for parent in profiler._stack:  # noqa: SLF001
+                        parent["shared"] = True
+                _active.add(self)
+
+            shared = len(_active) > 1
+            # tracemalloc has one peak. Record the peak for the enclosing stages, before resetting it for this stage.
+            current, peak = tracemalloc.get_traced_memory()
+            for parent in self._stack:
+                parent["peak"] = max(parent["peak"], peak)
+            if not shared:
+                tracemalloc.reset_peak()
+
+            entry = {"name": name, "current": current, "peak": current, "shared": shared}
+            self._stack.append(entry)
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            measurement = {"wall": time.perf_counter() - wall, "cpu": time.process_time() - cpu}
+            with _lock:
+                self._stack.pop()
+                entry["peak"] = max(entry["peak"], tracemalloc.get_traced_memory()[1])
+                for parent in self._stack:
+                    parent["peak"] = max(parent["peak"], entry["peak"])
+                    parent["shared"] = parent["shared"] or entry["shared"]
+            measurement["peak_memory"] = None if entry["shared"] else entry["peak"] - entry["current"]
+            self.add(name, measurement)
+
+    def add(self, name, measurement):
+        """Add the measurements of a part of the current stage, like a check, that the caller measured."""
+        name = "/".join([*(parent["name"] for parent in self._stack), name])
+        self.timings[name] = measurement
+        if self.hook:
+            self.hook(name, measurement)
+
+    def finish(self, context):
+        """Stop tracing memory allocations, if started by a profiler and no other is active, and add the timings."""
+        global _started  # noqa: PLW0603
+
+        with _lock:
+            _active.discard(self)
+            if not _active and _started:
+                tracemalloc.stop()
+                _started = False
+        if self.report:
+            context["timings"] = self.timings
+        return context
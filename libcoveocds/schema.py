@@ -1,35 +1,290 @@
+import contextlib
 import functools
+import hashlib
 import json
 import logging
 import os
+import sys
+import tempfile
+import threading
+import time
 import warnings
 import zipfile
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from typing import NamedTuple
 from urllib.parse import urljoin
 
+import json_merge_patch
 import jsonref
 import requests
-from libcove.lib.common import get_schema_codelist_paths, schema_dict_fields_generator
+from jsonschema import FormatChecker
+from libcove.lib.common import get_schema_codelist_paths, schema_dict_fields_generator, validator
 from ocdsextensionregistry.exceptions import (
     DoesNotExist,
     ExtensionCodelistWarning,
-    ExtensionWarning,
     UnsupportedSchemeError,
 )
 from ocdsextensionregistry.profile_builder import ProfileBuilder
+from ocdsextensionregistry.util import remove_nulls
 from referencing import Registry, Resource
 
 import libcoveocds.config
+from libcoveocds import fast_validator
 from libcoveocds.exceptions import OCDSVersionError
 
 logger = logging.getLogger(__name__)
 
 
-# Note: Using lru_cache on instance methods can lead to memory leaks. However, we generally do want these to survive
-# the entire process.
-# https://beta.ruff.rs/docs/rules/cached-instance-method/
+class CodelistField(NamedTuple):
+    """A codelist field, compiled by :meth:`~libcoveocds.schema.SchemaOCDS.get_codelist_table`."""
+
+    #: The codes of the field's codelist.
+    codes: frozenset
+    #: The field's generic path, joined with slashes.
+    path: str
+    #: The information about the field, for the "additional_*_codelist_values" contexts, without its values.
+    info: dict
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+_profiles_hits = 0
+_profiles_misses = 0
+_profiles_maxsize = libcoveocds.config.LIB_COVE_OCDS_CONFIG_DEFAULT["schema_cache_size"]
+
+
+class _DiskCache:
+    """
+    A directory of JSON files that persists the profile's slow-to-compute values across processes.
+
+    Each file is named after a hash of the profile key and the name of the value. A file expires ``ttl`` seconds after
+    it is written. If the directory is larger than ``max_bytes``, the oldest files are removed.
+    """
+
+    def __init__(self, directory, key, ttl, max_bytes):
+        self.directory = directory
+        self.digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{self.digest}-{name}.json")
+
+    def get(self, name):
+        """Return the value, or ``None`` if it is missing, expired or unreadable."""
+        path = self._path(name)
+        try:
+            if self.ttl and time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, "rb") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def set(self, name, value):
+        """Write the value atomically, and remove expired and excess files. Errors are logged."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(value, f)
+                os.replace(temporary, self._path(name))
+            except BaseException:
+                os.remove(temporary)
+                raise
+            self._evict()
+        except OSError:
+            logger.exception("Couldn't write to the schema cache directory %s", self.directory)
+
+    def _evict(self):
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+                if self.ttl and now - stat.st_mtime > self.ttl:
+                    os.remove(entry.path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except FileNotFoundError:  # removed by another process
+                pass
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            size -= entry_size
+
+
+class _Profile:
+    """
+    The state of a schema that depends only on its profile key, and not on the package data.
+
+    It is shared by all :class:`~libcoveocds.schema.SchemaOCDS` instances with the same profile key.
+    """
+
+    def __init__(self, key, tag, extensions, standard_zip, disk_cache=None):
+        # The key in the process-wide cache.
+        self.key = key
+        #: The profile builder instance for this package's extensions.
+        self.builder = ProfileBuilder(tag, extensions, standard_base_url=standard_zip)
+        # Initialize extensions once and preserve locale caches.
+        self.builder_extensions = list(self.builder.extensions())
+
+        self.extensions = {extension: {} for extension in extensions}
+        self.invalid_extension = {}
+        self.extended = False
+        # The error from dereferencing the schema. Errors from validating data are set on the instances.
+        self.json_deref_error = None  # str
+        # Set by process_codelists().
+        self.core_codelists = None
+
+        # The return values of SchemaOCDS methods, by method name and arguments.
+        self.memo = {}
+        # A re-entrant lock, because memoized methods call each other.
+        self.lock = threading.RLock()
+
+        # The cache that persists values across processes, if configured.
+        self.disk_cache = disk_cache
+
+    def get(self, key, function):
+        with self.lock:
+            if key not in self.memo:
+                self.memo[key] = function()
+                # Let the next instance with this profile key retry the fetch. This instance keeps its values.
+                if self.transient():
+                    _discard_profile(self)
+            return self.memo[key]
+
+    def transient(self):
+        """Return whether fetching the extensions or codelists failed with a network or server error."""
+        return (
+            self.core_codelists == {}
+            or any(_is_transient(message) for message in self.invalid_extension.values())
+            or any(
+                _is_transient(message)
+                for details in self.extensions.values()
+                for message in details.get("failed_codelists", {}).values()
+            )
+        )
+
+    def load(self, name):
+        if self.disk_cache:
+            return self.disk_cache.get(name)
+        return None
+
+    def dump(self, name, value):
+        if self.disk_cache:
+            self.disk_cache.set(name, value)
+
+
+def _get_profile(key, tag, extensions, standard_zip, maxsize, disk_cache):
+    global _profiles_hits, _profiles_misses, _profiles_maxsize  # noqa: PLW0603
+
+    with _profiles_lock:
+        _profiles_maxsize = maxsize
+        if key in _profiles:
+            _profiles_hits += 1
+            _profiles.move_to_end(key)
+            return _profiles[key]
+        _profiles_misses += 1
+
+    # Build outside the lock, as the profile builder can perform HTTP requests.
+    profile = _Profile(key, tag, extensions, standard_zip, disk_cache)
+
+    if maxsize > 0:
+        with _profiles_lock:
+            # Another thread might have built the same profile in the meantime.
+            profile = _profiles.setdefault(key, profile)
+            _profiles.move_to_end(key)
+            while len(_profiles) > maxsize:
+                _profiles.popitem(last=False)
+
+    return profile
+
+
+def _discard_profile(profile):
+    with _profiles_lock:
+        if _profiles.get(profile.key) is profile:
+            del _profiles[profile.key]
+
+
+def schema_cache_info():
+    """Return the hits, misses, maximum size and current size of the process-wide schema cache."""
+    with _profiles_lock:
+        return CacheInfo(_profiles_hits, _profiles_misses, _profiles_maxsize, len(_profiles))
+
+
+def schema_cache_clear():
+    """Clear the process-wide schema cache and its statistics."""
+    global _profiles_hits, _profiles_misses  # noqa: PLW0603
+
+    with _profiles_lock:
+        _profiles.clear()
+        _profiles_hits = 0
+        _profiles_misses = 0
+
+
+def _is_transient(message):
+    """Return whether the error message for an extension or codelist describes a network or server error."""
+    return message in {"fetching failed", "Couldn't be retrieved"} or message.startswith("5")
+
+
+def _memoize(method):
+    """Cache the method's return value on the instance's profile, to share it with other instances."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # The test override changes the package schema, so it must not share cached values with other instances.
+        key = (method.__name__, getattr(self, "_test_override_package_schema", None), args, frozenset(kwargs.items()))
+        return self._profile.get(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+class _ProfileAttribute:
+    """Read and write the attribute on the instance's profile, to share it with other instances."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance._profile, self.name)  # noqa: SLF001
+
+    def __set__(self, instance, value):
+        setattr(instance._profile, self.name, value)  # noqa: SLF001
+
+
+# Note: Methods are memoized on a profile that is shared by instances with the same version, extensions, package
+# schema, language, standard ZIP and context. Up to "schema_cache_size" profiles survive the entire process. A profile
+# is discarded from the cache if fetching its extensions or codelists fails with a network or server error.
 class SchemaOCDS:
+    builder = _ProfileAttribute()
+    builder_extensions = _ProfileAttribute()
+    extensions = _ProfileAttribute()
+    invalid_extension = _ProfileAttribute()
+    extended = _ProfileAttribute()
+    extended_codelist_schema_paths = _ProfileAttribute()
+    core_codelists = _ProfileAttribute()
+    extended_codelists = _ProfileAttribute()
+    extended_codelist_urls = _ProfileAttribute()
+
     def __init__(self, select_version=None, package_data=None, lib_cove_ocds_config=None, *, record_pkg=False):
         """
         Build the schema object using an specific OCDS schema version.
@@ -56,10 +311,11 @@ class SchemaOCDS:
 
         # Report errors in web UI.
         self.missing_package = False
-        self.json_deref_error = None  # str
         # Errors are raised instead in API context.
         self.invalid_version_argument = False
         self.invalid_version_data = False
+        # Set by callers if a reference is unresolvable while validating the data. See the json_deref_error property.
+        self._json_deref_error = None
 
         # The selected version overrides the default version and the data version.
         if select_version:
@@ -74,10 +330,7 @@ class SchemaOCDS:
                 # If invalid, use other strategies.
                 select_version = None
 
-        # lib-cove uses extensions in common_checks_context() for "extensions"."extensions".
-        # If `self.extensions` is falsy, this logic can be skipped.
-        # cove-ocds uses extensions to render extension-related information.
-        self.extensions = {}
+        extensions = []
         if isinstance(package_data, dict):
             if "releases" not in package_data and "records" not in package_data:
                 self.missing_package = True
@@ -95,9 +348,11 @@ class SchemaOCDS:
                     else:
                         self.invalid_version_data = True
 
-            extensions = package_data.get("extensions")
-            if isinstance(extensions, list):
-                self.extensions = {extension: {} for extension in extensions if isinstance(extension, str)}
+            package_extensions = package_data.get("extensions")
+            if isinstance(package_extensions, list):
+                extensions = list(
+                    dict.fromkeys(extension for extension in package_extensions if isinstance(extension, str))
+                )
 
         base_url = self.version_choices[self.version][1]
         # cove-ocds and the CLI uses schema_url as a fallback to extended_schema_file, to convert between formats.
@@ -111,19 +366,38 @@ class SchemaOCDS:
         self.pkg_schema_url = urljoin(base_url, self.package_schema_name)
 
         tag = self.version_choices[self.version][2]
-        #: The profile builder instance for this package's extensions.
-        self.builder = ProfileBuilder(tag, list(self.extensions), standard_base_url=self.config.config["standard_zip"])
-        # Initialize extensions once and preserve locale caches.
-        self.builder_extensions = list(self.builder.extensions())
-
+        standard_zip = self.config.config["standard_zip"]
+        # The extensions are ordered, because the order in which patches are merged can matter.
+        key = (
+            tag,
+            tuple(extensions),
+            self.package_schema_name,
+            self.config.config["current_language"],
+            standard_zip,
+            self.api,
+        )
+        # The profile sets these attributes:
+        #
+        # lib-cove uses extensions in common_checks_context() for "extensions"."extensions".
+        # If `self.extensions` is falsy, this logic can be skipped.
+        # cove-ocds uses extensions to render extension-related information.
+        #
         # lib-cove uses extended in common_checks_context() for "extensions"."is_extended_schema".
         # If `self.extensions` is falsy, this logic can be skipped.
         # cove-ocds uses is_extended_schema to conditionally display content.
-        self.extended = False
+        #
         # lib-cove uses invalid_extension in common_checks_context() for "extensions"."invalid_extension".
         # If `self.extensions` is falsy, this logic can be skipped.
         # cove-ocds uses invalid_extension to render extension-related errors.
-        self.invalid_extension = {}
+        # The item cache in libcoveocds.item_cache keys results by this key.
+        self.profile_key = key
+        config = self.config.config
+        disk_cache = None
+        if config["schema_cache_dir"]:
+            disk_cache = _DiskCache(
+                config["schema_cache_dir"], key, config["schema_cache_ttl"], config["schema_cache_max_bytes"]
+            )
+        self._profile = _get_profile(key, tag, extensions, standard_zip, config["schema_cache_size"], disk_cache)
 
         # lib-cove uses extended_schema_url in common_checks_context() for "extensions"."extended_schema_url".
         # If `self.extensions` is falsy, this logic can be skipped.
@@ -133,6 +407,16 @@ class SchemaOCDS:
         # is set. The CLI uses extended_schema_file to convert between formats, and falls back to schema_url.
         self.extended_schema_file = None
 
+    # The error from validating this instance's data, if any, or else the error from dereferencing the shared schema.
+    # Errors from validating data aren't shared, because they depend on the data.
+    @property
+    def json_deref_error(self):
+        return self._json_deref_error or self._profile.json_deref_error
+
+    @json_deref_error.setter
+    def json_deref_error(self, value):
+        self._json_deref_error = value
+
     @staticmethod
     def _codelist_codes(codelist):
         if not codelist.rows:
@@ -146,17 +430,46 @@ class SchemaOCDS:
             # https://github.com/open-contracting/standard/blob/1__0__3/standard/schema/codelists/organizationIdentifierRegistrationAgency_iati.csv
             return {codelist.name: self._codelist_codes(codelist) for codelist in self.builder.standard_codelists()}
         except requests.RequestException:
-            logger.exception()
+            logger.exception("Couldn't retrieve the standard's codelists")
             return {}
 
     # Override
     #
     # lib-cove calls this from get_additional_codelist_values().
-    @functools.lru_cache  # noqa: B019
+    @_memoize
     def process_codelists(self):
         # lib-cove uses these in get_additional_codelist_values().
         # - Used to determine whether a field has a codelist, which codelist and whether it is open.
         self.extended_codelist_schema_paths = get_schema_codelist_paths(self, use_extensions=True)
+
+        cached = self._profile.load("codelists")
+        if cached:
+            self.core_codelists = {name: set(codes) for name, codes in cached["core"].items()}
+            self.extended_codelists = {name: set(codes) for name, codes in cached["extended"].items()}
+            self.extended_codelist_urls = defaultdict(list, cached["urls"])
+            for input_url, failed_codelists in cached["failed_codelists"].items():
+                self.extensions[input_url]["failed_codelists"].update(failed_codelists)
+            return
+
+        self._process_codelists()
+
+        # Don't persist codelists that might be retrieved on a later attempt.
+        if not self._profile.transient():
+            self._profile.dump(
+                "codelists",
+                {
+                    "core": {name: sorted(codes) for name, codes in self.core_codelists.items()},
+                    "extended": {name: sorted(codes) for name, codes in self.extended_codelists.items()},
+                    "urls": self.extended_codelist_urls,
+                    "failed_codelists": {
+                        input_url: details["failed_codelists"]
+                        for input_url, details in self.extensions.items()
+                        if details.get("failed_codelists")
+                    },
+                },
+            )
+
+    def _process_codelists(self):
         # - Used with the `in` operator, to determine whether a codelist is from an extension.
         self.core_codelists = self._standard_codelists()
         # - Used with get(), and the return value is used with `in`, to determine whether a code is included.
@@ -164,51 +477,50 @@ class SchemaOCDS:
         # - Used to populate "codelist_url" and "codelist_amend_urls".
         self.extended_codelist_urls = defaultdict(list)
 
-        # _standard_codelists() returns an empty dict on HTTP error. If so, don't cache this empty dict, and return.
+        # _standard_codelists() returns an empty dict on HTTP error. If so, the profile is discarded, and return.
         if not self.core_codelists:
-            self._standard_codelists.cache_clear()
             return
 
-        for extension in self.builder_extensions:
-            input_url = extension.input_url
+        # In a web context, skip extensions whose metadata is unavailable.
+        extensions = [
+            extension
+            for extension in self.builder_extensions
+            if self.extensions[extension.input_url].get("failed_codelists") is not None
+        ]
 
-            failed_codelists = self.extensions[input_url].get("failed_codelists")
+        # The warnings from all threads are recorded, and then attributed to their extensions.
+        with warnings.catch_warnings(record=True) as wlist:
+            warnings.simplefilter("always", category=ExtensionCodelistWarning)
 
-            # In a web context, skip extensions whose metadata is unavailable.
-            if failed_codelists is None:
-                continue
+            errors = self._map(self._fetch_codelists, extensions)
 
-            with warnings.catch_warnings(record=True) as wlist:
-                warnings.simplefilter("always", category=ExtensionCodelistWarning)
+        codelist_warnings = defaultdict(list)
+        for w in wlist:
+            if issubclass(w.category, ExtensionCodelistWarning):
+                codelist_warnings[id(w.message.extension)].append(w.message)
+            else:
+                warnings.warn_explicit(w.message, w.category, w.filename, w.lineno, source=w.source)
 
-                try:
-                    # An unreadable metadata file or a malformed extension URL raises an error.
-                    extension_codelists = extension.codelists
-                except (
-                    NotImplementedError,  # raised by ExtensionVersion.get_url()
-                    UnsupportedSchemeError,
-                    requests.RequestException,  # superclass of requests.HTTPError
-                    json.JSONDecodeError,
-                ):
-                    # patched_release_schema() will have recorded the metadata file being unreadable.
-                    continue
+        for extension, error in zip(extensions, errors):
+            # patched_release_schema() will have recorded the metadata file being unreadable.
+            if error:
+                continue
 
-            for w in wlist:
-                if issubclass(w.category, ExtensionCodelistWarning):
-                    exception = w.message.exc
-                    if isinstance(exception, requests.HTTPError):
-                        message = f"{exception.response.status_code}: {exception.response.reason}"
-                    elif isinstance(exception, (requests.RequestException, zipfile.BadZipFile)):
-                        message = "Couldn't be retrieved"
-                    elif isinstance(exception, UnicodeDecodeError):
-                        message = "Has non-UTF-8 characters"
-                    else:
-                        message = f"Unknown error: {exception}"
-                    failed_codelists[w.message.codelist] = message
+            failed_codelists = self.extensions[extension.input_url]["failed_codelists"]
+
+            for warning in codelist_warnings[id(extension)]:
+                exception = warning.exc
+                if isinstance(exception, requests.HTTPError):
+                    message = f"{exception.response.status_code}: {exception.response.reason}"
+                elif isinstance(exception, (requests.RequestException, zipfile.BadZipFile)):
+                    message = "Couldn't be retrieved"
+                elif isinstance(exception, UnicodeDecodeError):
+                    message = "Has non-UTF-8 characters"
                 else:
-                    warnings.warn_explicit(w.message, w.category, w.filename, w.lineno, source=w.source)
+                    message = f"Unknown error: {exception}"
+                failed_codelists[warning.codelist] = message
 
-            for name, codelist in extension_codelists.items():
+            for name, codelist in extension.codelists.items():
                 try:
                     codes = self._codelist_codes(codelist)
                 except StopIteration:
@@ -237,11 +549,49 @@ class SchemaOCDS:
                 self.extended_codelist_urls[name].append(extension.get_url(f"codelists/{name}"))
 
     # lib-cove's get_schema_validation_errors() uses this, if defined. This circumvents CustomRefResolver() logic.
-    @functools.lru_cache  # noqa: B019
+    #
+    # lib-cove creates a new format checker for each call, so the format checker's checkers are used in the key.
     def validator(self, validator, format_checker):
-        return validator(self.get_pkg_schema_obj(), format_checker=format_checker, registry=self.registry)
+        return self._profile.get(
+            (
+                "validator",
+                getattr(self, "_test_override_package_schema", None),
+                validator,
+                tuple(format_checker.checkers.items()),
+            ),
+            lambda: validator(self.get_pkg_schema_obj(), format_checker=format_checker, registry=self.registry),
+        )
+
+    # The item cache in libcoveocds.item_cache doesn't store results that were computed with such a schema.
+    def has_transient_errors(self):
+        """Return whether fetching the extensions or codelists failed with a network or server error."""
+        self._patched_release_schema()
+        self.process_codelists()
+        return self._profile.transient()
+
+    # If "fast_validation" is set, callers try these functions before lib-cove's validator. The source of the functions
+    # is generated once per profile. It isn't persisted in "schema_cache_dir", because it is executed, and generating
+    # it is fast compared to building the schema.
+    def get_fast_validators(self):
+        """
+        Return the functions that determine whether data is valid, or ``None`` if disabled or unsupported.
 
-    @functools.cached_property
+        See :mod:`libcoveocds.fast_validator`. The ``None`` key is the function for the package, and the "releases" and
+        "records" keys are the functions for the items of the package's array, if the package schema has the array.
+        """
+        if not self.config.config["fast_validation"]:
+            return None
+        return self._fast_validators()
+
+    @_memoize
+    def _fast_validators(self):
+        package_validator = self.validator(validator, FormatChecker())
+        if not fast_validator.supported(package_validator):
+            return None
+        return fast_validator.load(fast_validator.generate(package_validator, ("releases", "records")))
+
+    @property
+    @_memoize
     def registry(self):
         # lib-cove's get_schema_validation_errors() expects a non-dereferenced schema.
         # The cove-ocds test with tenders_releases_1_release_with_extension_broken_json_ref.json fails, otherwise.
@@ -250,9 +600,7 @@ class SchemaOCDS:
         # undesirable elsewhere, like in create_extended_schema_file().
         self._add_is_codelist(release_schema)
 
-        versioned_release_schema = json.loads(
-            self.builder.get_standard_file_contents("versioned-release-validation-schema.json")
-        )
+        versioned_release_schema = json.loads(self._standard_file_contents("versioned-release-validation-schema.json"))
 
         tag = self.version_choices[self.version][2]
 
@@ -304,17 +652,25 @@ class SchemaOCDS:
                 continue
             SchemaOCDS._add_is_codelist(value)
 
+    @_memoize
+    def _standard_file_contents(self, name):
+        contents = self._profile.load(f"standard-{name}")
+        if contents is None:
+            contents = self.builder.get_standard_file_contents(name)
+            self._profile.dump(f"standard-{name}", contents)
+        return contents
+
     def _get_schema(self, name):
         # The ocds_babel.translate.translate() makes these substitutions for published files.
         return json.loads(
-            self.builder.get_standard_file_contents(name)
+            self._standard_file_contents(name)
             .replace("{{lang}}", self.config.config["current_language"])
             .replace("{{version}}", self.version)
         )
 
     # Preserve "deprecated" as a sibling of "$ref", via either `merge_props=True` or `proxies=True`.
     #
-    # Proxies are required for libcoveocds.common_checks_lookup_schema() to determine the URL fragments for
+    # Proxies are required for libcoveocds.lib.web._lookup_schema() to determine the URL fragments for
     # definitions' fields (though `docs_ref` is not used in cove-ocds).
     # https://github.com/open-contracting/cove-ocds/issues/103
     @staticmethod
@@ -331,7 +687,7 @@ class SchemaOCDS:
     #
     # ProfileBuilder.release_package_schema() and record_package_schema() aren't used, because the patched release
     # schema has already been calculated and cached by patched_release_schema().
-    @functools.lru_cache  # noqa: B019
+    @_memoize
     def get_pkg_schema_obj(self, *, deref=False, use_extensions=True, proxies=False):  # noqa: ARG002 # lib-cove API
         # For tests only.
         if hasattr(self, "_test_override_package_schema"):
@@ -356,25 +712,61 @@ class SchemaOCDS:
         return schema
 
     # Override
-    @functools.lru_cache  # noqa: B019
+    @_memoize
     def get_schema_obj(self, *, deref=False, proxies=False):
-        with warnings.catch_warnings(record=True) as wlist:
-            warnings.simplefilter("always", category=ExtensionWarning)
+        # Callers like the registry property modify the returned schema.
+        schema = deepcopy(self._patched_release_schema())
 
-            schema = self.builder.patched_release_schema(schema=self._get_schema("release-schema.json"))
-            if deref:
-                try:
-                    schema = jsonref.replace_refs(schema, **self._jsonref_kwarg(proxies=proxies))
-                except jsonref.JsonRefError as e:
-                    # Callers must check json_deref_error.
-                    self.json_deref_error = e.message
-                    # This is the prior behavior, however surprising.
-                    # https://github.com/OpenDataServices/lib-cove/blob/a97f769/libcove/lib/common.py#L393-L405
-                    schema = {}
+        if deref:
+            try:
+                schema = jsonref.replace_refs(schema, **self._jsonref_kwarg(proxies=proxies))
+            except jsonref.JsonRefError as e:
+                # Callers must check json_deref_error.
+                self._profile.json_deref_error = e.message
+                # This is the prior behavior, however surprising.
+                # https://github.com/OpenDataServices/lib-cove/blob/a97f769/libcove/lib/common.py#L393-L405
+                schema = {}
 
-        for w in wlist:
-            if issubclass(w.category, ExtensionWarning):
-                exception = w.message.exc
+        return schema
+
+    # The dereferenced schemas contain jsonref proxies and shared objects, which JSON can't represent. The patched
+    # schema is persisted instead, and dereferencing is repeated in each process.
+    @_memoize
+    def _patched_release_schema(self):
+        cached = self._profile.load("patched")
+        if cached:
+            self.extensions = cached["extensions"]
+            self.invalid_extension = cached["invalid_extension"]
+            self.extended = cached["extended"]
+            return cached["schema"]
+
+        schema = self._patch_release_schema()
+
+        # Don't persist a schema whose extensions might be retrieved on a later attempt.
+        if not any(_is_transient(message) for message in self.invalid_extension.values()):
+            self._profile.dump(
+                "patched",
+                {
+                    "schema": schema,
+                    "extensions": self.extensions,
+                    "invalid_extension": self.invalid_extension,
+                    "extended": self.extended,
+                },
+            )
+
+        return schema
+
+    # This is equivalent to ProfileBuilder.patched_release_schema(), but the extensions are fetched concurrently, and
+    # each extension is fetched once. (The profile builder creates new extension instances.)
+    def _patch_release_schema(self):
+        schema = self._get_schema("release-schema.json")
+
+        results = self._map(self._fetch_extension, self.builder_extensions)
+
+        patch = {}
+        for extension, (release_schema_patch, _) in zip(self.builder_extensions, results):
+            if isinstance(release_schema_patch, Exception):
+                exception = release_schema_patch
                 if isinstance(exception, requests.HTTPError):
                     message = f"{exception.response.status_code}: {exception.response.reason.lower()}"
                 elif isinstance(exception, (requests.RequestException, zipfile.BadZipFile)):
@@ -383,13 +775,15 @@ class SchemaOCDS:
                     message = "release schema patch is not valid JSON"
                 else:
                     message = str(exception)
-                self.invalid_extension[w.message.extension.input_url] = message
+                self.invalid_extension[extension.input_url] = message
             else:
-                warnings.warn_explicit(w.message, w.category, w.filename, w.lineno, source=w.source)
+                json_merge_patch.merge(patch, release_schema_patch)
+
+        json_merge_patch.merge(schema, patch)
 
         language = self.config.config["current_language"]
 
-        for extension in self.builder_extensions:
+        for extension, (_, metadata_error) in zip(self.builder_extensions, results):
             input_url = extension.input_url
 
             # process_codelists() needs this dict.
@@ -410,6 +804,10 @@ class SchemaOCDS:
                 continue
 
             try:
+                # Raise the error from fetching the metadata file, if any.
+                if metadata_error:
+                    raise metadata_error
+
                 metadata = extension.metadata
 
                 # We *could* check its existence via HTTP, but this is for display only anyway.
@@ -441,13 +839,115 @@ class SchemaOCDS:
 
         return schema
 
+    def _map(self, function, iterable):
+        """Call the function on each item in up to ``fetch_workers`` threads, and return the results in order."""
+        items = list(iterable)
+        workers = min(self.config.config["fetch_workers"], len(items))
+        if workers <= 1:
+            return [function(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, items))
+
+    def _fetch_extension(self, extension):
+        """
+        Fetch the extension's release schema patch and, outside an API context, its metadata.
+
+        Return the patch or the error from fetching it, and the error from fetching the metadata, if any.
+        """
+        try:
+            release_schema_patch = json.loads(extension.remote("release-schema.json", default="{}"))
+            # Remove `null`, because removing fields or properties is prohibited.
+            remove_nulls(release_schema_patch)
+        except (
+            UnicodeDecodeError,
+            UnsupportedSchemeError,
+            json.JSONDecodeError,
+            requests.RequestException,
+            zipfile.BadZipFile,
+        ) as e:
+            release_schema_patch = e
+
+        metadata_error = None
+        if not self.api and (extension.base_url or extension._url_pattern):  # noqa: SLF001
+            try:
+                extension.metadata  # noqa: B018 # cached by the extension
+            except (DoesNotExist, UnsupportedSchemeError, requests.RequestException, json.JSONDecodeError) as e:
+                metadata_error = e
+
+        return release_schema_patch, metadata_error
+
+    @staticmethod
+    def _fetch_codelists(extension):
+        """Fetch the extension's codelists. Return the error from fetching its metadata, if any."""
+        try:
+            # An unreadable metadata file or a malformed extension URL raises an error.
+            extension.codelists  # noqa: B018 # cached by the extension
+        except (
+            NotImplementedError,  # raised by ExtensionVersion.get_url()
+            UnsupportedSchemeError,
+            requests.RequestException,  # superclass of requests.HTTPError
+            json.JSONDecodeError,
+        ) as e:
+            return e
+        return None
+
     # Override
     #
     # Add decorator to copy from libcove.lib.common.SchemaJsonMixin.
-    @functools.lru_cache  # noqa: B019
+    @_memoize
     def get_pkg_schema_fields(self):
         return set(schema_dict_fields_generator(self.get_pkg_schema_obj(deref=True)))
 
+    # AdditionalCodelistValues looks up a field in this table by its object's generic path and its name. The table is
+    # built once per profile: fields whose codelist has no codes are omitted, each codelist's codes are interned in a
+    # frozenset that is shared by its fields, and the information about each field is prepared.
+    @_memoize
+    def get_codelist_table(self):
+        self.process_codelists()
+
+        codes = {}
+        table = {}
+        for path, (codelist, isopen) in self.extended_codelist_schema_paths.items():
+            if codelist not in codes:
+                codes[codelist] = frozenset(sys.intern(code) for code in self.extended_codelists.get(codelist, ()))
+            if not codes[codelist]:
+                continue
+            table.setdefault(path[:-1], {})[path[-1]] = CodelistField(
+                codes[codelist], "/".join(path), self._codelist_info(path, codelist, isopen)
+            )
+        return table
+
+    def _codelist_info(self, path, codelist, isopen):
+        urls = self.extended_codelist_urls
+
+        # Replace URL if this codelist is overridden by an extension. Last one to be applied wins.
+        codelist_url = urls[codelist][-1] if urls.get(codelist) else self.codelists + codelist
+
+        codelist_amend_urls = []
+        for codelist_key, amend_urls in urls.items():
+            if codelist_key == f"+{codelist}":
+                codelist_amend_urls.extend(("+", url) for url in amend_urls)
+            if codelist_key == f"-{codelist}":
+                codelist_amend_urls.extend(("-", url) for url in amend_urls)
+
+        # The keys are in the same order as in lib-cove's get_additional_codelist_values().
+        return {
+            "path": "/".join(path[:-1]),
+            "field": path[-1],
+            "codelist": codelist,
+            "codelist_url": codelist_url,
+            "codelist_amend_urls": codelist_amend_urls,
+            "isopen": isopen,
+            "values": None,
+            "extension_codelist": codelist not in self.core_codelists,
+        }
+
+    # libcoveocds.common_checks fills this index, from a validation error's path to the information about its field in
+    # the package schema, as validation errors are formatted for a web context.
+    @_memoize
+    def get_schema_path_index(self):
+        return {}
+
     # This is always called with an `if schema_ocds.extensions` guard.
     def create_extended_schema_file(self, upload_dir, upload_url):
         basename = "extended_schema.json"
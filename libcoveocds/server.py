@@ -0,0 +1,163 @@
+import http.server
+import json
+import os
+import shutil
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import libcoveocds.api
+from libcoveocds.exceptions import LibCoveOCDSError
+from libcoveocds.schema import schema_cache_info
+from libcoveocds.util import SetEncoder
+from libcoveocds.util import json as fast_json
+
+
+class _Service:
+    """
+    Validate packages with the server's configuration, and keep request statistics.
+
+    Schemas are built once per profile (version, extensions, package schema, etc.) and then reused, via the
+    process-wide cache of :mod:`libcoveocds.schema`.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.total = 0
+        self.failed = 0
+
+    def status(self):
+        with self.lock:
+            requests = {"active": self.active, "total": self.total, "failed": self.failed}
+        return {
+            "uptime": time.time() - self.started,
+            "requests": requests,
+            "schema_cache": schema_cache_info()._asdict(),
+        }
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """
+    Handle requests to the validation service.
+
+    -  ``GET /status`` returns the uptime, request counts and schema cache statistics.
+    -  ``POST /validate`` accepts a JSON package as the request body, and returns the same JSON as the command-line
+       interface. Set the ``schema_version`` query string parameter to force a version. Set ``stream=1`` to read the
+       releases or records one at a time. Set ``valid_only=1`` to only determine whether the data is valid, stopping at
+       the first error.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self):
+        # Unix sockets have no client address.
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return "unix"
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/status":
+            self._send(200, self.server.service.status())
+        else:
+            self._send(404, {"error": "Not found. Use GET /status or POST /validate."})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/validate":
+            self._send(404, {"error": "Not found. Use GET /status or POST /validate."})
+            return
+
+        query = parse_qs(url.query)
+
+        service = self.server.service
+        with service.lock:
+            service.active += 1
+            service.total += 1
+        status = 500
+        try:
+            try:
+                length = int(self.headers["Content-Length"])
+            except (TypeError, ValueError):  # missing or malformed
+                length = -1
+            if length < 0:
+                # The body can't be read, so the connection can't be reused.
+                self.close_connection = True
+                status, result = 400, {"error": "The Content-Length header is missing or invalid."}
+            else:
+                status, result = self._validate(service.config, self.rfile.read(length), query)
+        finally:
+            with service.lock:
+                service.active -= 1
+                if status != 200:  # noqa: PLR2004
+                    service.failed += 1
+
+        self._send(status, result)
+
+    def _validate(self, config, body, query):
+        schema_version = query.get("schema_version", [None])[0]
+        stream = query.get("stream", ["0"])[0] not in {"0", "false", ""}
+        valid_only = query.get("valid_only", ["0"])[0] not in {"0", "false", ""}
+
+        output_dir = tempfile.mkdtemp(prefix="lib-cove-ocds-serve-", dir=tempfile.gettempdir())
+        try:
+            if stream:
+                path = os.path.join(output_dir, "package.json")
+                with open(path, "wb") as f:
+                    f.write(body)
+                kwargs = {"file": path, "stream": True}
+            else:
+                try:
+                    data = fast_json.loads(body)
+                except ValueError as e:
+                    return 400, {"error": f"The request body is not valid JSON: {e}"}
+                if not isinstance(data, dict):
+                    return 400, {"error": "The request body is not a JSON object."}
+                kwargs = {"json_data": data}
+
+            result = libcoveocds.api.ocds_json_output(
+                output_dir, schema_version=schema_version, lib_cove_ocds_config=config, valid_only=valid_only, **kwargs
+            )
+        except LibCoveOCDSError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:  # noqa: BLE001 # one request's error mustn't stop the service
+            self.log_error("%s: %s", type(e).__name__, e)
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            shutil.rmtree(output_dir)
+
+        return 200, result
+
+    def _send(self, status, data):
+        output = json.dumps(data, indent=2, cls=SetEncoder).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(output)))
+        self.end_headers()
+        self.wfile.write(output)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(config, host="127.0.0.1", port=8000, socket_path=None):
+    """
+    Return a server that handles each request in a thread. Call its ``serve_forever()`` method to start it.
+
+    If ``socket_path`` is set, listen on a Unix socket at that path, replacing any existing socket. Otherwise, listen
+    on the ``host`` and ``port``.
+    """
+    if socket_path:
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.remove(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, Handler)
+    else:
+        server = http.server.ThreadingHTTPServer((host, port), Handler)
+    server.service = _Service(config)
+    return server
@@ -0,0 +1,856 @@
+import hashlib
+import json
+import re
+import typing
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from jsonschema import FormatChecker
+from jsonschema.exceptions import ValidationError, _RefResolutionError
+from libcove.lib.common import (
+    LANGUAGE_RE,
+    _get_schema_deprecated_paths,
+    _get_schema_non_required_ids,
+    get_fields_present_with_examples,
+    get_json_data_deprecated_fields,
+    get_json_data_generic_paths,
+    get_schema_validation_errors,
+    validator,
+)
+from referencing.exceptions import Unresolvable
+
+from libcoveocds.common_checks import VALIDATION_LOCK, _ErrorsSchema, get_id_names, is_fast_valid, is_valid
+from libcoveocds.config import LibCoveOCDSConfig
+from libcoveocds.exceptions import LibCoveOCDSError
+from libcoveocds.item_cache import ItemCache
+from libcoveocds.lib.additional_checks import get_additional_checks_results, get_checks
+from libcoveocds.lib.common_checks import AdditionalCodelistValues, BadOcidPrefixes
+from libcoveocds.lib.limits import Limiter, add_truncated
+from libcoveocds.lib.traversal import traverse, traverse_item
+from libcoveocds.schema import SchemaOCDS
+from libcoveocds.util import json as fast_json
+from libcoveocds.util import open_file
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+
+    STREAM_EXTRA_INSTALLED = True
+except ImportError:
+    STREAM_EXTRA_INSTALLED = False
+
+KEYS = ("records", "releases")
+# The number of releases or records that a worker checks at once.
+CHUNK_SIZE = 100
+
+# The checks of a worker process.
+_worker_checks = None
+
+
+def read_metadata(file):
+    """
+    Read the package metadata incrementally, without reading the releases or records into memory.
+
+    Return a tuple of the package metadata and the key of the releases or records array (or ``None``, if there is no
+    such array). The array's value is an empty list in the metadata, to preserve the order of fields.
+
+    Return ``None`` if the data can't be streamed: that is, if it isn't an object, or if it has both arrays.
+    """
+    metadata = {}
+    keys = []
+
+    with open_file(file) as f:
+        events = ijson.parse(f, use_float=True)
+
+        _, event, _ = next(events)
+        if event != "start_map":
+            return None
+
+        field = None
+        builder = None
+        # Whether the next event is the first event of a field's value.
+        first = False
+        # Whether the field's value is the releases or records array.
+        skip = False
+
+        for prefix, event, value in events:
+            # Each field of the package starts with a `map_key` event, and the package ends with an `end_map` event.
+            if not prefix:
+                if builder:
+                    metadata[field] = builder.value
+                    builder = None
+                field = value
+                first = True
+                continue
+
+            if first:
+                first = False
+                skip = field in KEYS and event == "start_array"
+                if skip:
+                    metadata[field] = []
+                    keys.append(field)
+                else:
+                    builder = ObjectBuilder()
+
+            if not skip:
+                builder.event(event, value)
+
+    if len(keys) > 1:
+        return None
+    return metadata, keys[0] if keys else None
+
+
+def split_package(data):
+    """
+    Split the package into its metadata, the key of the releases or records array, and the releases or records.
+
+    Return ``None`` if the data can't be split, like :func:`~libcoveocds.stream.read_metadata`.
+    """
+    if not isinstance(data, dict):
+        return None
+
+    keys = [key for key in KEYS if isinstance(data.get(key), list)]
+    if len(keys) > 1:
+        return None
+
+    key = keys[0] if keys else None
+    metadata = {field: [] if field == key else value for field, value in data.items()}
+    return metadata, key, data[key] if key else []
+
+
+def iter_items(file, key):
+    """Yield the releases or records in the file, one at a time."""
+    with open_file(file) as f:
+        yield from ijson.items(f, f"{key}.item", use_float=True)
+
+
+def _iter_lines(f):
+    # Blank lines are only allowed at the end, so that the index of a release or record is its line's index.
+    blank = None
+    for number, line in enumerate(f, 1):
+        if not line.strip():
+            blank = blank or number
+            continue
+        if blank:
+            raise LibCoveOCDSError(f"Line {blank} is blank")
+        try:
+            yield number, fast_json.loads(line)
+        except ValueError as e:
+            raise LibCoveOCDSError(f"Line {number} is not valid JSON: {e}") from e
+
+
+def read_lines_metadata(file, record_pkg=None):
+    """
+    Read the first line of a JSON Lines file, in which each line is a release, a record or a package.
+
+    Return a tuple of the package metadata, the key of the releases or records array (or ``None``, if the file has no
+    lines), and whether each line is a package. If each line is a package, the metadata is the first package's, and
+    the array's value is an empty list. Otherwise, the metadata is ``None``, and the key is ``records`` if
+    ``record_pkg`` is truthy or, if ``record_pkg`` is ``None``, if the first line looks like a record.
+    """
+    with open_file(file) as f:
+        first = next((value for _, value in _iter_lines(f)), None)
+
+    if first is None:
+        return None, None, False
+
+    if isinstance(first, dict):
+        for key in KEYS:
+            # A record has a "releases" array, but a release package has no "ocid".
+            if isinstance(first.get(key), list) and not (key == "releases" and "ocid" in first):
+                return {field: [] if field == key else value for field, value in first.items()}, key, True
+
+    if record_pkg is None:
+        record_pkg = (
+            isinstance(first, dict) and "ocid" in first and ("releases" in first or "compiledRelease" in first)
+        )
+    return None, "records" if record_pkg else "releases", False
+
+
+def iter_lines(file, key, *, packages=False):
+    """
+    Yield the releases or records in the JSON Lines file, one at a time.
+
+    If ``packages`` is truthy, each line is a package, and the releases or records in its ``key`` array are yielded.
+    """
+    with open_file(file) as f:
+        for number, value in _iter_lines(f):
+            if not packages:
+                yield value
+            elif isinstance(value, dict) and isinstance(value.get(key), list):
+                yield from value[key]
+            else:
+                raise LibCoveOCDSError(f"Line {number} is not a package with a {key} array")
+
+
+class _ItemSchema:
+    """
+    Proxy a schema, to validate a release or record against the items subschema of the package schema.
+
+    Errors are reported at the path of the release or record in the package.
+    """
+
+    def __init__(self, schema_obj, key, index):
+        self.schema_obj = schema_obj
+        self.prefix = (index, key)  # reversed, for extendleft()
+
+    def get_pkg_schema_obj(self):
+        return self.schema_obj.get_pkg_schema_obj()
+
+    def validator(self, validator, format_checker):
+        package_validator = self.schema_obj.validator(validator, format_checker)
+        self.item_validator = package_validator.evolve(
+            schema=package_validator.schema["properties"][self.prefix[1]]["items"]
+        )
+        return self
+
+    def iter_errors(self, instance):
+        for error in self.item_validator.iter_errors(instance):
+            error.path.extendleft(self.prefix)
+            yield error
+
+
+def _digest(item):
+    # A digest is stable across processes, unlike hash().
+    return hashlib.blake2b(json.dumps(item, sort_keys=True).encode(), digest_size=16).digest()
+
+
+def _ids(item, id_names):
+    """Return the values of the identifier fields of the release or record, or ``None`` if any is missing."""
+    if isinstance(item, dict):
+        ids = tuple(item.get(id_name) for id_name in id_names)
+        if all(value is not None and not isinstance(value, (dict, list)) for value in ids):
+            return ids
+    return None
+
+
+def _get_additional_fields_info(fields_present, schema_fields):
+    # Adapted from libcove.lib.common.get_additional_fields_info(), to use fields that are counted incrementally.
+    additional_fields = {}
+    root_additional_fields = set()
+
+    for field, field_info in fields_present.items():
+        if field in schema_fields:
+            continue
+        if LANGUAGE_RE.search(field.split("/")[-1]):
+            continue
+
+        for root_additional_field in root_additional_fields:
+            if field.startswith(root_additional_field):
+                field_info["root_additional_field"] = False
+                additional_fields[root_additional_field]["additional_field_descendance"][field] = field_info
+                break
+        else:
+            field_info["root_additional_field"] = True
+            field_info["additional_field_descendance"] = {}
+            root_additional_fields.add(field)
+
+        field_info["path"] = "/".join(field.split("/")[:-1])
+        field_info["field_name"] = field.split("/")[-1]
+        additional_fields[field] = field_info
+
+    return additional_fields
+
+
+class ItemChecks:
+    """
+    Perform all checks, one release or record at a time, and merge the results.
+
+    :meth:`~libcoveocds.stream.ItemChecks.check` returns the results for one release or record, and
+    :meth:`~libcoveocds.stream.ItemChecks.add` merges them. The results are plain data, so that they can be computed
+    elsewhere, like in another process.
+    """
+
+    def __init__(self, schema_obj, metadata, key, *, costs=False):
+        """
+        Initialize the checks.
+
+        :param schema_obj: the schema
+        :param metadata: the package metadata, in which the releases or records array is an empty list, or ``None`` if
+                         the releases or records aren't in a package
+        :param key: "releases" or "records", or ``None`` if the package has no such array
+        :param costs: whether to measure the time spent in each additional check
+        """
+        self.schema_obj = schema_obj
+        self.metadata = metadata
+        self.key = key
+        self.measure_costs = costs
+
+        config = schema_obj.config.config
+        self.skip_aggregates = config["skip_aggregates"]
+        self.additional_checks = get_checks(config["additional_checks"])
+
+        # These are calculated once, instead of by lib-cove for each release or record.
+        self.deprecated_paths = [path for path, _ in _get_schema_deprecated_paths(schema_obj)]
+        self.non_required_ids = _get_schema_non_required_ids(schema_obj)
+
+        self.array_schema = schema_obj.get_pkg_schema_obj()["properties"][key] if key else {}
+        self.id_names = get_id_names(self.array_schema)
+
+        # The fields before and after the array are checked before and after the releases or records, respectively,
+        # to preserve the order of results.
+        fields = list(metadata.items()) if metadata is not None else []
+        index = list(metadata).index(key) + 1 if key and fields else len(fields)
+        self.before = dict(fields[:index])
+        self.after = dict(fields[index:])
+
+        self.first_item_is_dict = None
+
+        per_type = config["max_errors_per_type"]
+        self.validation_errors = Limiter(per_type, config["max_validation_errors"])
+        self.fields_present = {}
+        self.deprecated_data_paths = {}
+        self.missing_ids = []
+        self.bad_ocid_prefixes = Limiter(per_type)
+        self.count = 0
+        self.unique_ocids = set()
+        self.additional_codelist_values = {}
+        self.additional_checks_results = Limiter(per_type)
+        self.costs = defaultdict(float)
+
+        self.all_ids = set()
+        self.non_unique_ids = set()
+        self.without_ids = False
+        self.hashes = set()
+        self.non_unique_items = False
+
+        self._add_metadata(self.before)
+
+    def _generic_paths_results(self, generic_paths):
+        deprecated_data_paths = {
+            path: list(generic_paths[path]) for path in self.deprecated_paths if path in generic_paths
+        }
+        # Adapted from libcove.lib.common.get_json_data_missing_ids(), to use the pre-calculated schema paths.
+        missing_ids = [
+            "/".join(map(str, (*specific_path, "id")))
+            for path in self.non_required_ids
+            for specific_path, value in generic_paths.get(path[:-1], {}).items()
+            if type(specific_path[-1]) is int and isinstance(value, dict) and "id" not in value
+        ]
+        return deprecated_data_paths, missing_ids
+
+    def _add_metadata(self, data):
+        self._merge_fields_present(get_fields_present_with_examples(data))
+        self._merge_generic_paths_results(
+            *self._generic_paths_results(get_json_data_generic_paths(data, generic_paths={}))
+        )
+        additional_codelist_values = AdditionalCodelistValues(self.schema_obj)
+        traverse(data, [additional_codelist_values])
+        self._merge_additional_codelist_values(additional_codelist_values.results)
+
+    def _merge_fields_present(self, fields_present):
+        for field, info in fields_present.items():
+            if field in self.fields_present:
+                merged = self.fields_present[field]
+                merged["count"] += info["count"]
+                merged["examples"].extend(info["examples"][: 3 - len(merged["examples"])])
+            else:
+                self.fields_present[field] = {"count": info["count"], "examples": list(info["examples"])}
+
+    def _merge_generic_paths_results(self, deprecated_data_paths, missing_ids):
+        for path, specific_paths in deprecated_data_paths.items():
+            self.deprecated_data_paths.setdefault(path, {}).update(dict.fromkeys(specific_paths))
+        self.missing_ids.extend(missing_ids)
+
+    def _merge_additional_codelist_values(self, additional_codelist_values):
+        for path, info in additional_codelist_values.items():
+            if path in self.additional_codelist_values:
+                self.additional_codelist_values[path]["values"].update(info["values"])
+            else:
+                self.additional_codelist_values[path] = {**info, "values": set(info["values"])}
+
+    def check(self, index, item, digest=None):
+        """
+        Return the results of the checks for the release or record at the index of the array.
+
+        :param digest: the release's or record's digest, if already calculated
+        """
+        key = self.key
+        schema_obj = self.schema_obj
+        is_dict = isinstance(item, dict)
+
+        result = {"index": index, "is_dict": is_dict}
+
+        # The first release or record is validated with the package metadata, to report errors in the metadata once.
+        # If the fast validator determines that the data is valid, there are no errors to report.
+        if index or self.metadata is None:
+            if is_fast_valid(schema_obj, item, key):
+                result["validation_errors"] = {}
+            else:
+                with VALIDATION_LOCK:
+                    result["validation_errors"] = get_schema_validation_errors(
+                        item, _ItemSchema(schema_obj, key, index), "-", {}, {}
+                    )
+        else:
+            package = {**self.metadata, key: [item]}
+            if is_fast_valid(schema_obj, package):
+                result["validation_errors"] = {}
+            else:
+                with VALIDATION_LOCK:
+                    result["validation_errors"] = get_schema_validation_errors(package, schema_obj, "-", {}, {})
+
+        # fields_present_generator() skips items that aren't objects.
+        result["fields_present"] = get_fields_present_with_examples(item, f"/{key}") if is_dict else {}
+
+        generic_paths = {(key,): {(key, index): item}}
+        if isinstance(item, (dict, list)):
+            get_json_data_generic_paths(item, generic_paths, (key, index), (key,))
+        result["deprecated_data_paths"], result["missing_ids"] = self._generic_paths_results(generic_paths)
+
+        if is_dict:
+            ocid = item.get("ocid")
+            result["ocid"] = ocid if ocid and isinstance(ocid, typing.Hashable) else None
+
+        if (ids := _ids(item, self.id_names)) is not None:
+            result["ids"] = ids
+
+        result["hash"] = digest or _digest(item)
+
+        bad_ocid_prefixes = BadOcidPrefixes()
+        additional_codelist_values = AdditionalCodelistValues(schema_obj)
+        additional_checks = [check() for check in self.additional_checks]
+        costs = {} if self.measure_costs else None
+        traverse_item(key, index, item, [bad_ocid_prefixes, additional_codelist_values, *additional_checks], costs)
+
+        result["bad_ocid_prefixes"] = bad_ocid_prefixes.results
+        # Codelists are only checked if the first release or record is an object. add() ignores these results, if not.
+        result["additional_codelist_values"] = additional_codelist_values.results
+        if additional_checks:
+            result["additional_checks"] = get_additional_checks_results(additional_checks)
+        if costs is not None:
+            result["costs"] = {check.name: costs.get(type(check), 0) for check in additional_checks}
+
+        return result
+
+    def relocatable(self, result):
+        """Return whether the results for a release or record can be relocated to another index."""
+        # lib-cove reports some errors about the release or record itself with its index, like "Array element '1' is
+        # not a JSON object".
+        path = f"{self.key}/{result['index']}"
+        return not any(
+            json.loads(json_key)["header"] == result["index"]
+            for json_key, values in result["validation_errors"].items()
+            if any(value["path"] == path for value in values)
+        )
+
+    def relocate(self, result, index):
+        """
+        Return the results for a release or record, as if they were for the release or record at the index.
+
+        The results must be :meth:`~libcoveocds.stream.ItemChecks.relocatable`.
+        """
+        old = result["index"]
+        if old == index:
+            return result
+
+        key = self.key
+        old_path = f"{key}/{old}"
+        new_path = f"{key}/{index}"
+        start = len(old_path)
+
+        result = {
+            **result,
+            "index": index,
+            "validation_errors": {
+                json_key: [{**value, "path": new_path + value["path"][start:]} for value in values]
+                for json_key, values in result["validation_errors"].items()
+            },
+            "deprecated_data_paths": {
+                path: [(key, index, *specific_path[2:]) for specific_path in specific_paths]
+                for path, specific_paths in result["deprecated_data_paths"].items()
+            },
+            "missing_ids": [new_path + path[start:] for path in result["missing_ids"]],
+            "bad_ocid_prefixes": [(ocid, new_path + path[start:]) for ocid, path in result["bad_ocid_prefixes"]],
+        }
+        if "additional_checks" in result:
+            classes = {check.name: check for check in self.additional_checks}
+            result["additional_checks"] = {
+                name: [classes[name].relocate(output, old_path, new_path) for output in outputs]
+                for name, outputs in result["additional_checks"].items()
+            }
+        return result
+
+    def add(self, result):
+        """Merge the results of the checks for a release or record. Results must be added in order."""
+        if result["index"] == 0:
+            self.first_item_is_dict = result["is_dict"]
+
+        for json_key, values in result["validation_errors"].items():
+            self.validation_errors.add(json_key, values)
+
+        self._merge_fields_present(result["fields_present"])
+        self._merge_generic_paths_results(result["deprecated_data_paths"], result["missing_ids"])
+        if result["bad_ocid_prefixes"]:
+            self.bad_ocid_prefixes.add("ocds_prefixes_bad_format", result["bad_ocid_prefixes"])
+
+        if result["is_dict"]:
+            self.count += 1
+            if result["ocid"] is not None:
+                self.unique_ocids.add(result["ocid"])
+
+        if "ids" in result:
+            ids = result["ids"]
+            if ids in self.all_ids:
+                self.non_unique_ids.add(ids)
+            self.all_ids.add(ids)
+        else:
+            self.without_ids = True
+
+        if result["hash"] in self.hashes:
+            self.non_unique_items = True
+        self.hashes.add(result["hash"])
+
+        if self.first_item_is_dict and "additional_codelist_values" in result:
+            self._merge_additional_codelist_values(result["additional_codelist_values"])
+
+        for name, outputs in result.get("additional_checks", {}).items():
+            self.additional_checks_results.add(name, outputs)
+        for name, cost in result.get("costs", {}).items():
+            self.costs[name] += cost
+
+    def _unique_items_errors(self):
+        # Adapted from libcove.lib.common.unique_ids(), to use the IDs and digests that are collected incrementally.
+        #
+        # unique_ids() compares entire releases or records if any lack IDs. Instead, their digests are compared.
+        if self.without_ids and self.non_unique_items:
+            error = ValidationError(
+                "Array has non-unique elements",
+                validator="uniqueItems",
+                validator_value=self.array_schema["uniqueItems"],
+                instance=[],
+                schema=self.array_schema,
+                path=[self.key],
+            )
+            error.error_id = "uniqueItems_no_ids"
+            return [error]
+
+        errors = []
+        for non_unique_id in sorted(self.non_unique_ids):
+            if len(self.id_names) == 1:
+                message = f"Non-unique {self.id_names[0]} values"
+            else:
+                message = f"Non-unique combination of {', '.join(self.id_names)} values"
+            error = ValidationError(
+                message,
+                validator="uniqueItems",
+                validator_value=self.array_schema["uniqueItems"],
+                instance=", ".join(map(str, non_unique_id)),
+                schema=self.array_schema,
+                path=[self.key],
+            )
+            error.error_id = f"uniqueItems_with_{'__'.join(self.id_names)}"
+            errors.append(error)
+        return errors
+
+    def finish(self, context):
+        """Add the merged results to the context, like :func:`~libcoveocds.common_checks.common_checks_ocds`."""
+        schema_obj = self.schema_obj
+
+        # If there are no releases or records, validate the package metadata alone.
+        if self.first_item_is_dict is None:
+            if self.metadata is not None and not is_fast_valid(schema_obj, self.metadata):
+                with VALIDATION_LOCK:
+                    validation_errors = get_schema_validation_errors(self.metadata, schema_obj, "-", {}, {})
+                for json_key, values in validation_errors.items():
+                    self.validation_errors.add(json_key, values)
+        elif self.array_schema.get("uniqueItems"):
+            errors = _ErrorsSchema(schema_obj, self._unique_items_errors())
+            with VALIDATION_LOCK:
+                validation_errors = get_schema_validation_errors(None, errors, "-", {}, {})
+            for json_key, values in validation_errors.items():
+                self.validation_errors.add(json_key, values)
+
+        self._add_metadata(self.after)
+
+        # Same as libcove.lib.common.common_checks_context().
+        context["version_used"] = schema_obj.version
+        if not schema_obj.api:
+            context.update(
+                {
+                    "version_display_choices": tuple(
+                        (version, display_url[0]) for version, display_url in schema_obj.version_choices.items()
+                    ),
+                    "version_used_display": schema_obj.version_choices[schema_obj.version][0],
+                }
+            )
+
+        additional_fields = _get_additional_fields_info(self.fields_present, schema_obj.get_pkg_schema_fields())
+        data_only = sorted(
+            (info["path"], info["field_name"], info["count"])
+            for info in additional_fields.values()
+            if info["root_additional_field"]
+        )
+        context.update(
+            {
+                "data_only": data_only,
+                "additional_fields": additional_fields,
+                "additional_fields_count": sum(item[2] for item in data_only),
+            }
+        )
+
+        extensions = None
+        if schema_obj.extensions:
+            extensions = {
+                "extensions": schema_obj.extensions,
+                "invalid_extension": schema_obj.invalid_extension,
+                "is_extended_schema": schema_obj.extended,
+                "extended_schema_url": schema_obj.extended_schema_url,
+            }
+
+        context.update(
+            {
+                "schema_url": schema_obj.pkg_schema_url,
+                "extensions": extensions,
+                "validation_errors": sorted(self.validation_errors.outputs.items()),
+                "validation_errors_count": self.validation_errors.count(),
+                "common_error_types": [],
+            }
+        )
+
+        context["deprecated_fields"] = get_json_data_deprecated_fields(self.deprecated_data_paths, schema_obj)
+        if self.missing_ids:
+            context["structure_warnings"] = {"missing_ids": sorted(self.missing_ids)}
+
+        # Same as libcoveocds.common_checks.common_checks_ocds().
+        if bad_ocid_prefixes := self.bad_ocid_prefixes.outputs.get("ocds_prefixes_bad_format"):
+            context["conformance_errors"] = {"ocds_prefixes_bad_format": bad_ocid_prefixes}
+
+        if not self.skip_aggregates:
+            context["count"] = self.count
+            context["unique_ocids_count"] = len(self.unique_ocids)
+
+        for value in self.additional_codelist_values.values():
+            value["values"] = sorted(value["values"])
+        context["additional_closed_codelist_values"] = {
+            key: value for key, value in self.additional_codelist_values.items() if not value["isopen"]
+        }
+        context["additional_open_codelist_values"] = {
+            key: value for key, value in self.additional_codelist_values.items() if value["isopen"]
+        }
+
+        if self.additional_checks:
+            context["additional_checks"] = (
+                {name: outputs for name, outputs in self.additional_checks_results.outputs.items() if outputs}
+                if self.key
+                else {}
+            )
+
+        add_truncated(context, "validation_errors", self.validation_errors.truncated())
+        add_truncated(context, "conformance_errors", self.bad_ocid_prefixes.truncated())
+        add_truncated(context, "additional_checks", self.additional_checks_results.truncated())
+
+        return context
+
+
+def _init_worker(version, metadata, key, config, record_pkg, costs):
+    global _worker_checks  # noqa: PLW0603
+
+    # If the process is forked, the schema is already in the parent's cache.
+    schema_obj = SchemaOCDS(version, metadata, config, record_pkg=record_pkg)
+    _worker_checks = ItemChecks(schema_obj, metadata, key, costs=costs)
+
+
+def _check_chunk(pairs):
+    try:
+        return [_worker_checks.check(index, item) for index, item in pairs]
+    except (Unresolvable, _RefResolutionError) as e:
+        # referencing's exceptions can't be pickled.
+        raise _RefResolutionError(str(e)) from None
+
+
+def _lookup(checks, cache, index, item):
+    """Return the cached results for the release or record, or ``None`` if missing, and the digest of the item."""
+    # The first release or record is validated with the package metadata, so its results aren't cached.
+    if cache is None or not index:
+        return None, None
+    digest = _digest(item)
+    result = cache.get(digest)
+    if result is not None:
+        result = checks.relocate(result, index)
+    return result, digest
+
+
+def _store(checks, cache, result):
+    if cache is not None and result["index"] and checks.relocatable(result):
+        cache.set(result)
+
+
+def _iter_results(checks, items, cache=None):
+    for index, item in enumerate(items):
+        result, digest = _lookup(checks, cache, index, item)
+        if result is None:
+            result = checks.check(index, item, digest)
+            _store(checks, cache, result)
+        yield result
+
+
+def _iter_results_parallel(checks, items, workers, cache=None):
+    schema_obj = checks.schema_obj
+    # Workers don't profile, and the hook might not be picklable.
+    config = LibCoveOCDSConfig({**schema_obj.config.config, "profile": False, "profile_hook": None})
+    initargs = (
+        schema_obj.version,
+        checks.metadata,
+        checks.key,
+        config,
+        schema_obj.package_schema_name == "record-package-schema.json",
+        checks.measure_costs,
+    )
+
+    def merge(cached, future):
+        results = future.result() if future else []
+        for result in results:
+            _store(checks, cache, result)
+        if cached:
+            results = sorted(results + cached, key=lambda result: result["index"])
+        return results
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as executor:
+        futures = deque()
+        iterator = enumerate(items)
+        while chunk := list(islice(iterator, CHUNK_SIZE)):
+            # Only the releases or records whose results aren't cached are sent to the workers.
+            cached = []
+            pairs = []
+            for index, item in chunk:
+                result, _ = _lookup(checks, cache, index, item)
+                if result is None:
+                    pairs.append((index, item))
+                else:
+                    cached.append(result)
+            futures.append((cached, executor.submit(_check_chunk, pairs) if pairs else None))
+            # Limit the number of chunks in memory, in case the items are streamed.
+            if len(futures) > workers * 2:
+                yield from merge(*futures.popleft())
+        while futures:
+            yield from merge(*futures.popleft())
+
+
+def common_checks_ocds_stream(context, metadata, key, items, schema_obj, profiler=None):
+    """
+    Perform all checks, like :func:`~libcoveocds.common_checks.common_checks_ocds`, one release or record at a time.
+
+    Only the package metadata and one release or record are in memory at once, unless the ``workers`` configuration is
+    greater than 1, in which case chunks of releases or records are checked in that many processes. Errors are not
+    formatted for a web context, and the JSON data is not added to the context.
+
+    If the ``item_cache_dir`` configuration is set, the results for each release or record are reused from, or stored
+    in, an :class:`~libcoveocds.item_cache.ItemCache`, so that only new or changed releases or records are checked.
+
+    :param metadata: the package metadata, in which the releases or records array is an empty list, or ``None`` if the
+                     releases or records aren't in a package
+    :param key: "releases" or "records", or ``None`` if the package has no such array
+    :param items: an iterable of the releases or records
+    :param profiler: a :class:`~libcoveocds.profiling.Profiler`, to which to add each additional check's costs
+    """
+    workers = schema_obj.config.config["workers"]
+    costs = profiler is not None and profiler.enabled
+
+    try:
+        checks = ItemChecks(schema_obj, metadata, key, costs=costs)
+        cache = ItemCache.open(checks)
+        try:
+            if workers > 1 and key:
+                results = _iter_results_parallel(checks, items, workers, cache)
+            else:
+                results = _iter_results(checks, items, cache)
+            for result in results:
+                checks.add(result)
+        finally:
+            if cache is not None:
+                cache.close()
+        checks.finish(context)
+    except (Unresolvable, _RefResolutionError) as e:
+        # For example: "PointerToNowhere: '/definitions/Unresolvable' does not exist within {big JSON blob}"
+        schema_obj.json_deref_error = re.sub(r" within .+", "", str(e))
+        return context
+
+    if costs:
+        for check in checks.additional_checks:
+            profiler.add(
+                f"additional_checks/{check.name}",
+                {
+                    "wall": checks.costs[check.name],
+                    "findings": checks.additional_checks_results.counts.get(check.name, 0),
+                },
+            )
+
+    return context
+
+
+def is_valid_ocds_stream(context, metadata, key, items, schema_obj):
+    """
+    Add whether the data is valid, like :func:`~libcoveocds.common_checks.is_valid_ocds`, one item at a time.
+
+    The validation stops at the first invalid release or record, without reading the rest. The ``workers``
+    configuration is ignored.
+
+    :param metadata: the package metadata, in which the releases or records array is an empty list, or ``None`` if the
+                     releases or records aren't in a package
+    :param key: "releases" or "records", or ``None`` if the package has no such array
+    :param items: an iterable of the releases or records
+    """
+    context["version_used"] = schema_obj.version
+    context["schema_url"] = schema_obj.pkg_schema_url
+    context["valid"] = False
+
+    try:
+        package_validator = schema_obj.validator(validator, FormatChecker())
+        if not key:
+            context["valid"] = (
+                metadata is None or is_fast_valid(schema_obj, metadata) or is_valid(package_validator, metadata)
+            )
+            return context
+
+        array_schema = package_validator.schema["properties"][key]
+        item_validator = package_validator.evolve(schema=array_schema["items"])
+        unique = array_schema.get("uniqueItems")
+        id_names = get_id_names(array_schema)
+
+        # Like ItemChecks._unique_items_errors().
+        all_ids = set()
+        without_ids = False
+        hashes = set()
+        non_unique_items = False
+        empty = True
+
+        for index, item in enumerate(items):
+            empty = False
+            # The first release or record is validated with the package metadata, like ItemChecks.check().
+            if index or metadata is None:
+                valid = is_fast_valid(schema_obj, item, key) or is_valid(item_validator, item)
+            else:
+                package = {**metadata, key: [item]}
+                valid = is_fast_valid(schema_obj, package) or is_valid(package_validator, package)
+            if not valid:
+                return context
+
+            if unique:
+                if (ids := _ids(item, id_names)) is None:
+                    without_ids = True
+                elif ids in all_ids:
+                    return context
+                else:
+                    all_ids.add(ids)
+
+                digest = _digest(item)
+                non_unique_items |= digest in hashes
+                if without_ids and non_unique_items:
+                    return context
+                hashes.add(digest)
+
+        # If there are no releases or records, validate the package metadata alone, like ItemChecks.finish().
+        if (
+            empty
+            and metadata is not None
+            and not is_fast_valid(schema_obj, metadata)
+            and not is_valid(package_validator, metadata)
+        ):
+            return context
+    except (Unresolvable, _RefResolutionError) as e:
+        schema_obj.json_deref_error = re.sub(r" within .+", "", str(e))
+        return context
+
+    context["valid"] = True
+    return context
@@ -1,4 +1,184 @@
+import contextlib
+import gzip
+import io
+import json as stdlib_json
+import mmap
+import os
+import shutil
+import zipfile
+from pathlib import PurePath
+
+from libcoveocds.exceptions import LibCoveOCDSError
+
 try:
     import orjson as json
+
+    ORJSON_INSTALLED = True
 except ImportError:
-    import json  # noqa: F401
+    import json
+
+    ORJSON_INSTALLED = False
+
+try:
+    import zstandard
+
+    ZSTD_EXTRA_INSTALLED = True
+except ImportError:
+    ZSTD_EXTRA_INSTALLED = False
+
+# The magic numbers of the supported compression and archive formats.
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+def locate(file):
+    """
+    Return the path to the file and the name of the member of the ZIP archive, or ``None`` if not an archive member.
+
+    A member of a ZIP archive is identified by a path that continues from the archive's path, like
+    ``archive.zip/path/to/file.json``, as for :mod:`zipimport`.
+    """
+    if os.path.exists(file):
+        return file, None
+    path = PurePath(file)
+    for parent in path.parents:
+        if os.path.isfile(parent):
+            if zipfile.is_zipfile(parent):
+                return str(parent), path.relative_to(parent).as_posix()
+            break
+    return file, None
+
+
+def _decompress(stack, f):
+    magic = f.peek(4)[:4]
+    if magic.startswith(GZIP_MAGIC):
+        return stack.enter_context(gzip.GzipFile(fileobj=f))
+    if magic == ZSTD_MAGIC:
+        if not ZSTD_EXTRA_INSTALLED:
+            raise LibCoveOCDSError("zstandard is not installed. Run: pip install libcoveocds[zstd]")
+        reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        # The reader doesn't support reading lines.
+        return stack.enter_context(io.BufferedReader(reader))
+    return f
+
+
+@contextlib.contextmanager
+def open_file(file):
+    """
+    Open the file at the path for reading in binary mode, decompressing it while it is read, if needed.
+
+    Gzip and Zstandard files are decompressed. Zstandard requires ``pip install libcoveocds[zstd]``. A ZIP archive
+    must contain one file, unless the path identifies a member of the archive: see :func:`~libcoveocds.util.locate`.
+    No decompressed copy is written to disk.
+    """
+    path, member = locate(file)
+    with contextlib.ExitStack() as stack:
+        f = stack.enter_context(open(path, "rb"))
+        if member is not None or f.peek(4)[:4] == ZIP_MAGIC:
+            archive = stack.enter_context(zipfile.ZipFile(f))
+            if member is None:
+                names = [info.filename for info in archive.infolist() if not info.is_dir()]
+                if len(names) != 1:
+                    raise LibCoveOCDSError(
+                        f"The ZIP archive {path} contains {len(names)} files. Add the name of the file to check to "
+                        f"the path, like {os.path.join(path, 'file.json')}"
+                    )
+                member = names[0]
+            try:
+                f = stack.enter_context(archive.open(member))
+            except KeyError as e:
+                raise LibCoveOCDSError(f"The ZIP archive {path} has no file named {member}") from e
+        yield _decompress(stack, f)
+
+
+def _is_uncompressed(f):
+    return isinstance(getattr(f, "raw", None), io.FileIO)
+
+
+def is_compressed(file):
+    """Return whether the file at the path is compressed, or is a member of an archive."""
+    with open_file(file) as f:
+        return not _is_uncompressed(f)
+
+
+def load(file):
+    """
+    Parse and return the JSON data in the file at the path.
+
+    If orjson is installed, an uncompressed file is memory-mapped and parsed from the mapping, so that its contents
+    aren't copied into a bytes object before parsing. Otherwise, or if the file can't be mapped (like an empty file or
+    a pipe), the file is read. Compressed files and archive members are decompressed in memory: see
+    :func:`~libcoveocds.util.open_file`.
+    """
+    with open_file(file) as f:
+        if ORJSON_INSTALLED and _is_uncompressed(f):
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass
+            else:
+                # The view must be released before the mapping is closed.
+                with mapping, memoryview(mapping) as view:
+                    return json.loads(view)
+        return json.loads(f.read())
+
+
+def compact(data):
+    """
+    Replace equal strings in the parsed JSON data with one shared string, in place, and return the data.
+
+    Packages repeat many strings, like codes, dates, currencies and organization identifiers, which the JSON parser
+    allocates once per occurrence. Sharing them reduces the memory usage of a package by about 30%. The data is
+    otherwise unchanged, so that all checks can read it as before.
+    """
+    strings = {}
+    stack = [data] if isinstance(data, (dict, list)) else []
+    while stack:
+        node = stack.pop()
+        # Assigning to existing keys doesn't change the size of the dict while iterating.
+        for key, value in node.items() if isinstance(node, dict) else enumerate(node):
+            if type(value) is str:
+                node[key] = strings.setdefault(value, value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return data
+
+
+def link_or_copy(src, directory):
+    """
+    Hard link the file at the ``src`` path into the ``directory``, or copy it if it can't be linked.
+
+    A hard link shares the file's contents and metadata, without reading or writing them. It fails if the directory is
+    on another filesystem. The copy preserves the file's metadata, and is performed by the kernel where possible.
+    """
+    dst = os.path.join(directory, os.path.basename(src))
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def _default(obj):
+    if isinstance(obj, set):
+        return list(obj)
+    raise TypeError
+
+
+def dumps(obj):
+    """
+    Serialize the object as compact JSON, and return the UTF-8 bytes. Sets are serialized as arrays.
+
+    If orjson is installed, it is used to serialize the object.
+    """
+    if ORJSON_INSTALLED:
+        return json.dumps(obj, default=_default)
+    return stdlib_json.dumps(obj, cls=SetEncoder, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class SetEncoder(stdlib_json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, set):
+            return list(obj)
+        return stdlib_json.JSONEncoder.default(self, obj)
@@ -183,3 +183,33 @@ def test_context_api_transform_deprecations():
         assert len(deprecated_field["paths"]) == 2
         assert len(deprecated_field["explanation"]) == 2
         assert deprecated_field.get("field")
+
+
+def test_context_api_transform_truncated():
+    context = {
+        "validation_errors": [
+            [
+                '{"message_type":"type_a", "message":"description_a", "path_no_number":"field_a"}',
+                [{"path": "path_to_a", "value": "a_value"}],
+            ],
+        ],
+        "validation_errors_count": 5,
+        "truncated": {
+            "validation_errors": {
+                '{"message_type":"type_a", "message":"description_a", "path_no_number":"field_a"}': 5,
+            },
+            "additional_checks": {"empty_field": 10},
+        },
+        "data_only": [],
+        "additional_fields": {},
+        "additional_fields_count": 0,
+        "deprecated_fields": {},
+        "extensions": {},
+    }
+
+    transformed = context_api_transform(context)
+
+    assert transformed["truncated"] == {
+        "validation_errors": [{"type": "type_a", "field": "field_a", "description": "description_a", "count": 5}],
+        "additional_checks": {"empty_field": 10},
+    }
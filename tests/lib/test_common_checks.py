@@ -1,7 +1,10 @@
 import json
 import os
 
-from libcoveocds.lib.common_checks import get_bad_ocid_prefixes
+import pytest
+
+from libcoveocds.lib.common_checks import Aggregates, BadOcidPrefixes, get_bad_ocid_prefixes
+from libcoveocds.lib.traversal import traverse
 from tests import fixture_path
 
 
@@ -36,3 +39,32 @@ def test_record_bad_ocid_prefixes_with_bad_compiled_release():
         user_data = json.load(fp)
 
     assert get_bad_ocid_prefixes(user_data) == results
+
+
+@pytest.mark.parametrize(
+    ("data", "count", "unique_ocids_count"),
+    [
+        ({"releases": [{"ocid": "a"}, {"ocid": "a"}, {"ocid": ["b"]}, "c"]}, 3, 1),
+        ({"records": [{"ocid": "a"}], "releases": [{"ocid": "b"}, {"ocid": "c"}]}, 1, 1),
+        ({"records": [], "releases": [{"ocid": "b"}]}, 1, 1),
+        ({"releases": {"ocid": "a"}}, 0, 0),
+    ],
+)
+def test_aggregates(data, count, unique_ocids_count):
+    aggregates = Aggregates()
+    traverse(data, [aggregates])
+
+    context = {}
+    aggregates.finish(context)
+
+    assert context == {"count": count, "unique_ocids_count": unique_ocids_count}
+
+
+def test_bad_ocid_prefixes_check():
+    with open(fixture_path("fixtures", "lib", "record_check_ocids.json")) as fp:
+        user_data = json.load(fp)
+
+    bad_ocid_prefixes = BadOcidPrefixes()
+    traverse(user_data, [bad_ocid_prefixes])
+
+    assert bad_ocid_prefixes.results == get_bad_ocid_prefixes(user_data)
@@ -0,0 +1,53 @@
+import pytest
+
+from libcoveocds.lib.limits import Limiter, add_truncated, room
+
+
+@pytest.mark.parametrize(("limit", "used", "expected"), [(None, 5, None), (3, 1, 2), (3, 3, 0), (3, 5, 0)])
+def test_room(limit, used, expected):
+    assert room(limit, used) == expected
+
+
+def test_add_truncated():
+    context = {}
+
+    add_truncated(context, "validation_errors", {})
+    assert context == {}
+
+    add_truncated(context, "validation_errors", {"a": 3})
+    add_truncated(context, "additional_checks", {"empty_field": 2})
+    assert context == {"truncated": {"validation_errors": {"a": 3}, "additional_checks": {"empty_field": 2}}}
+
+
+def test_limiter_unlimited():
+    limiter = Limiter()
+    limiter.add("a", [1, 2])
+    limiter.add("a", [3])
+
+    assert limiter.outputs == {"a": [1, 2, 3]}
+    assert limiter.count() == 3
+    assert limiter.truncated() == {}
+
+
+def test_limiter_per_type():
+    limiter = Limiter(per_type=2)
+    limiter.add("a", [1])
+    limiter.add("a", [2, 3])
+    limiter.add("b", [4, 5, 6])
+    limiter.add("c", [7])
+
+    assert limiter.outputs == {"a": [1, 2], "b": [4, 5], "c": [7]}
+    assert limiter.counts == {"a": 3, "b": 3, "c": 1}
+    assert limiter.count() == 7
+    assert limiter.truncated() == {"a": 3, "b": 3}
+
+
+def test_limiter_total():
+    limiter = Limiter(per_type=2, total=3)
+    limiter.add("a", [1, 2, 3])
+    limiter.add("b", [4, 5])
+    limiter.add("c", [6])
+
+    assert limiter.outputs == {"a": [1, 2], "b": [4], "c": []}
+    assert limiter.count() == 6
+    assert limiter.truncated() == {"a": 3, "b": 2, "c": 1}
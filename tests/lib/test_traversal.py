@@ -0,0 +1,109 @@
+from libcoveocds.lib.traversal import Check, traverse, traverse_item
+
+
+class Recorder(Check):
+    def start(self, data):
+        self.events = [("start", data)]
+
+    def enter(self, key, index, item):
+        self.events.append(("enter", key, index, item))
+
+    def leave(self, key, index, item):
+        self.events.append(("leave", key, index, item))
+
+    def field(self, path, generic_path, key, value):
+        self.events.append(("field", (*path, key), (*generic_path, key), value))
+
+    def array_item(self, path, generic_path, index, value):
+        self.events.append(("array_item", (*path, index), generic_path, value))
+
+
+def test_traverse():
+    party = {"id": "1"}
+    release = {"tag": ["a", ["b"]], "parties": [party]}
+    data = {"uri": "x", "releases": [release, "c"]}
+
+    check = Recorder()
+    traverse(data, [check])
+
+    assert check.events == [
+        ("start", data),
+        ("field", ("uri",), ("uri",), "x"),
+        ("field", ("releases",), ("releases",), [release, "c"]),
+        ("enter", "releases", 0, release),
+        ("field", ("releases", 0, "tag"), ("releases", "tag"), ["a", ["b"]]),
+        ("array_item", ("releases", 0, "tag", 0), ("releases", "tag"), "a"),
+        ("array_item", ("releases", 0, "tag", 1), ("releases", "tag"), ["b"]),
+        ("field", ("releases", 0, "parties"), ("releases", "parties"), [party]),
+        ("array_item", ("releases", 0, "parties", 0), ("releases", "parties"), party),
+        ("field", ("releases", 0, "parties", 0, "id"), ("releases", "parties", "id"), "1"),
+        ("leave", "releases", 0, release),
+        ("enter", "releases", 1, "c"),
+        ("leave", "releases", 1, "c"),
+    ]
+
+
+def test_traverse_not_object():
+    check = Recorder()
+    traverse([{"id": "1"}], [check])
+
+    assert check.events == [("start", [{"id": "1"}])]
+
+
+def test_traverse_item():
+    record = {"ocid": "x"}
+
+    check = Recorder()
+    traverse_item("records", 3, record, [check])
+
+    assert check.events == [
+        ("start", {"records": [record]}),
+        ("enter", "records", 3, record),
+        ("field", ("records", 3, "ocid"), ("records", "ocid"), "x"),
+        ("leave", "records", 3, record),
+    ]
+
+
+class ScopedRecorder(Recorder):
+    paths = frozenset({("releases", "tender", "items"), ("releases", "tender", "items", "id")})
+
+
+def test_traverse_paths():
+    item = {"id": "1", "classification": {"id": "x"}}
+    release = {"ocid": "x", "tender": {"id": "1", "items": [item]}, "awards": [{"items": [{"id": "2"}]}]}
+    data = {"uri": "x", "releases": [release]}
+
+    check = ScopedRecorder()
+    traverse(data, [check])
+
+    assert check.events == [
+        ("start", data),
+        ("field", ("releases",), ("releases",), [release]),
+        ("enter", "releases", 0, release),
+        ("field", ("releases", 0, "tender"), ("releases", "tender"), release["tender"]),
+        ("field", ("releases", 0, "tender", "items"), ("releases", "tender", "items"), [item]),
+        ("array_item", ("releases", 0, "tender", "items", 0), ("releases", "tender", "items"), item),
+        ("field", ("releases", 0, "tender", "items", 0, "id"), ("releases", "tender", "items", "id"), "1"),
+        (
+            "field",
+            ("releases", 0, "tender", "items", 0, "classification"),
+            ("releases", "tender", "items", "classification"),
+            {"id": "x"},
+        ),
+        (
+            "field",
+            ("releases", 0, "tender", "items", 0, "classification", "id"),
+            ("releases", "tender", "items", "classification", "id"),
+            "x",
+        ),
+        ("leave", "releases", 0, release),
+    ]
+
+
+def test_traverse_costs():
+    check = Recorder()
+    costs = {}
+    traverse({"releases": [{"id": "1"}]}, [check], costs)
+
+    assert list(costs) == [Recorder]
+    assert costs[Recorder] > 0
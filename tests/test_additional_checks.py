@@ -1,6 +1,16 @@
 import json
 
-from libcoveocds.lib.additional_checks import CHECKS, run_additional_checks
+import pytest
+
+from libcoveocds.exceptions import LibCoveOCDSError
+from libcoveocds.lib.additional_checks import (
+    CHECKS,
+    AdditionalCheck,
+    EmptyField,
+    get_checks,
+    register,
+    run_additional_checks,
+)
 
 checks = CHECKS["all"]
 
@@ -72,3 +82,54 @@ def test_empty_fields_all_fine():
         data = json.load(json_file)
 
     assert run_additional_checks(data, checks) == {}
+
+
+class LongTitle(AdditionalCheck):
+    name = "long_title"
+    paths = frozenset({("releases", "tender", "title")})
+
+    def field(self, path, generic_path, key, value):  # noqa: ARG002
+        if self.active and key == "title" and len(value) > 10:
+            self.report({"json_location": "/".join(map(str, (*path, key)))})
+
+
+@pytest.fixture
+def long_title():
+    registered = CHECKS["all"].copy()
+    register(LongTitle)
+    yield LongTitle
+    CHECKS["all"][:] = registered
+
+
+@pytest.mark.parametrize(
+    ("selection", "expected"),
+    [
+        ("all", [EmptyField]),
+        ("none", []),
+        ("empty_field", [EmptyField]),
+        ("empty_field, empty_field", [EmptyField, EmptyField]),
+        (["empty_field"], [EmptyField]),
+    ],
+)
+def test_get_checks(selection, expected):
+    assert get_checks(selection) == expected
+
+
+def test_get_checks_error():
+    with pytest.raises(LibCoveOCDSError) as excinfo:
+        get_checks("empty_field,missing")
+
+    assert str(excinfo.value) == "'missing' is not a registered check: empty_field"
+
+
+def test_register(long_title):
+    data = {"releases": [{"tender": {"title": "A long title", "description": ""}, "title": "A long title"}]}
+
+    assert get_checks("all") == [EmptyField, long_title]
+    assert run_additional_checks(data, get_checks("long_title")) == {
+        "long_title": [{"json_location": "releases/0/tender/title"}]
+    }
+    assert run_additional_checks(data, get_checks("all")) == {
+        "empty_field": [{"json_location": "releases/0/tender/description"}],
+        "long_title": [{"json_location": "releases/0/tender/title"}],
+    }
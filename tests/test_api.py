@@ -1,12 +1,16 @@
+import gzip
 import json
 import os
 import shutil
 import tempfile
+import zipfile
 
 import pytest
 
 from libcoveocds.api import ocds_json_output
-from libcoveocds.exceptions import OCDSVersionError
+from libcoveocds.config import LibCoveOCDSConfig
+from libcoveocds.exceptions import LibCoveOCDSError, OCDSVersionError
+from libcoveocds.util import ZSTD_EXTRA_INSTALLED, compact, is_compressed, link_or_copy, load
 from tests import fixture_path
 
 
@@ -62,3 +66,236 @@ def test_ocds_json_output_bad_data(json_data, exception, expected):
         assert str(excinfo.value) in expected
     finally:
         shutil.rmtree(cove_temp_folder)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        ("api", "basic_1.json"),
+        ("api", "basic_record_package.json"),
+        ("common_checks", "dupe_ids_1.json"),
+        ("common_checks", "records_non_unique.json"),
+        ("common_checks", "records_non_unique_no_ocid.json"),
+        ("common_checks", "releases_non_unique_no_id.json"),
+        ("additional_checks", "empty_fields_records.json"),
+    ],
+)
+@pytest.mark.parametrize(("stream", "workers"), [(True, 1), (False, 2), (True, 2)])
+def test_ocds_json_output_stream_or_workers(filename, stream, workers):
+    cove_temp_folder = tempfile.mkdtemp(prefix="lib-cove-ocds-tests-", dir=tempfile.gettempdir())
+    json_filename = fixture_path("fixtures", *filename)
+
+    config = LibCoveOCDSConfig({"context": "api", "workers": workers})
+
+    try:
+        expected = ocds_json_output(cove_temp_folder, json_filename)
+        results = ocds_json_output(cove_temp_folder, json_filename, lib_cove_ocds_config=config, stream=stream)
+
+        assert json.dumps(results) == json.dumps(expected)
+    finally:
+        shutil.rmtree(cove_temp_folder)
+
+
+@pytest.mark.parametrize(
+    ("filename", "valid"),
+    [
+        (("api", "basic_1.json"), True),
+        (("api", "basic_record_package.json"), True),
+        (("common_checks", "dupe_ids_1.json"), False),
+        (("common_checks", "releases_non_unique_no_id.json"), False),
+        (("common_checks", "records_non_unique.json"), False),
+        (("common_checks", "records_invalid_releases.json"), False),
+    ],
+)
+@pytest.mark.parametrize("stream", [False, True])
+def test_ocds_json_output_valid_only(filename, valid, stream):
+    cove_temp_folder = tempfile.mkdtemp(prefix="lib-cove-ocds-tests-", dir=tempfile.gettempdir())
+    json_filename = fixture_path("fixtures", *filename)
+
+    try:
+        expected = ocds_json_output(cove_temp_folder, json_filename)
+        results = ocds_json_output(cove_temp_folder, json_filename, stream=stream, valid_only=True)
+
+        assert results == {
+            "file_type": "json",
+            "version_used": expected["version_used"],
+            "schema_url": expected["schema_url"],
+            "valid": valid,
+        }
+        assert valid == (not expected["validation_errors"])
+    finally:
+        shutil.rmtree(cove_temp_folder)
+
+
+def test_compact():
+    data = json.loads('{"a": ["tender", {"b": "tender", "c": 1}], "d": "tender", "e": null}')
+
+    assert compact(data) == {"a": ["tender", {"b": "tender", "c": 1}], "d": "tender", "e": None}
+    assert data["a"][0] is data["a"][1]["b"] is data["d"]
+    assert compact("tender") == "tender"
+
+
+def test_load(tmp_path):
+    path = fixture_path("fixtures", "api", "basic_1.json")
+    with open(path) as f:
+        expected = json.load(f)
+
+    assert load(path) == expected
+
+    empty = tmp_path / "empty.json"
+    empty.touch()
+
+    with pytest.raises(json.JSONDecodeError):
+        load(empty)
+
+
+def test_link_or_copy(tmp_path):
+    src = tmp_path / "package.json"
+    src.write_text("{}")
+    directory = tmp_path / "output"
+    directory.mkdir()
+
+    dst = link_or_copy(str(src), str(directory))
+
+    assert dst == str(directory / "package.json")
+    assert os.path.samefile(src, dst)
+
+
+def compress(tmp_path, filename, compression):
+    with open(filename, "rb") as f:
+        data = f.read()
+
+    if compression == "gzip":
+        path = tmp_path / "package.json.gz"
+        path.write_bytes(gzip.compress(data))
+    elif compression == "zstd":
+        import zstandard  # noqa: PLC0415 # optional
+
+        path = tmp_path / "package.json.zst"
+        path.write_bytes(zstandard.ZstdCompressor().compress(data))
+    else:
+        path = tmp_path / "package.zip"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            if compression == "zip":
+                archive.writestr("package.json", data)
+            else:
+                archive.writestr("other.json", b"{}")
+                archive.writestr("path/to/package.json.gz", gzip.compress(data))
+                path = path / "path" / "to" / "package.json.gz"
+
+    return str(path)
+
+
+COMPRESSIONS = [
+    "gzip",
+    pytest.param("zstd", marks=pytest.mark.skipif(not ZSTD_EXTRA_INSTALLED, reason="zstandard not installed")),
+    "zip",
+    "member",
+]
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_load_compressed(tmp_path, compression):
+    filename = fixture_path("fixtures", "api", "basic_1.json")
+    path = compress(tmp_path, filename, compression)
+
+    assert is_compressed(path)
+    assert not is_compressed(filename)
+    assert load(path) == load(filename)
+
+
+def test_load_zip_errors(tmp_path):
+    path = tmp_path / "package.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("a.json", b"{}")
+        archive.writestr("b.json", b"{}")
+
+    with pytest.raises(LibCoveOCDSError, match=r"contains 2 files"):
+        load(path)
+
+    with pytest.raises(LibCoveOCDSError, match=r"has no file named c\.json"):
+        load(path / "c.json")
+
+    assert load(path / "b.json") == {}
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+@pytest.mark.parametrize("stream", [False, True])
+def test_ocds_json_output_compressed(tmp_path, compression, stream):
+    filename = fixture_path("fixtures", "common_checks", "dupe_ids_1.json")
+    path = compress(tmp_path, filename, compression)
+
+    expected = ocds_json_output(str(tmp_path), filename, stream=stream)
+    results = ocds_json_output(str(tmp_path), path, stream=stream)
+
+    assert json.dumps(results) == json.dumps(expected)
+
+    with pytest.raises(LibCoveOCDSError, match=r"can't be converted"):
+        ocds_json_output(str(tmp_path), path, convert=True)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        ("api", "basic_record_package.json"),
+        ("common_checks", "dupe_ids_1.json"),
+        ("common_checks", "records_invalid_releases.json"),
+        ("common_checks", "releases_non_unique.json"),
+    ],
+)
+def test_ocds_json_output_lines(tmp_path, filename):
+    filename = fixture_path("fixtures", *filename)
+    with open(filename) as f:
+        data = json.load(f)
+    key = "records" if "records" in data else "releases"
+
+    expected = ocds_json_output(str(tmp_path), filename)
+
+    # One package per line.
+    path = tmp_path / "packages.jsonl"
+    with path.open("w") as f:
+        for item in data[key]:
+            f.write(json.dumps({field: [item] if field == key else value for field, value in data.items()}) + "\n")
+
+    results = ocds_json_output(str(tmp_path), str(path), lines=True)
+
+    assert json.dumps(results) == json.dumps(expected)
+
+    # One release or record per line.
+    path = tmp_path / "items.jsonl"
+    with path.open("w") as f:
+        f.writelines(json.dumps(item) + "\n" for item in data[key])
+
+    results = ocds_json_output(str(tmp_path), str(path), lines=True)
+
+    assert results["validation_errors"] == [
+        error for error in expected["validation_errors"] if error["path"].split("/")[0] == key
+    ]
+    assert results["count"] == expected["count"]
+
+    with pytest.raises(LibCoveOCDSError, match=r"can't be converted"):
+        ocds_json_output(str(tmp_path), str(path), convert=True, lines=True)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        ("api", "basic_1.json"),
+        ("api", "basic_record_package.json"),
+        ("common_checks", "dupe_ids_1.json"),
+        ("additional_checks", "empty_fields_records.json"),
+    ],
+)
+def test_ocds_json_output_compact_data(filename):
+    cove_temp_folder = tempfile.mkdtemp(prefix="lib-cove-ocds-tests-", dir=tempfile.gettempdir())
+    json_filename = fixture_path("fixtures", *filename)
+
+    config = LibCoveOCDSConfig({"context": "api", "compact_data": True})
+
+    try:
+        expected = ocds_json_output(cove_temp_folder, json_filename)
+        results = ocds_json_output(cove_temp_folder, json_filename, lib_cove_ocds_config=config)
+
+        assert json.dumps(results) == json.dumps(expected)
+    finally:
+        shutil.rmtree(cove_temp_folder)
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from libcoveocds.batch import expand_paths, iter_results
+from tests import CONFIG, fixture_path
+
+
+def test_expand_paths():
+    directory = fixture_path("fixtures", "common_checks")
+
+    paths = list(expand_paths([os.path.join(directory, "basic_*.json"), "missing.json", "missing*.json"]))
+
+    assert paths[0] == os.path.join(directory, "basic_1.json")
+    assert all(path.startswith(os.path.join(directory, "basic_")) for path in paths[:-2])
+    assert paths == [*sorted(paths[:-2]), "missing.json", "missing*.json"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_iter_results_error(tmp_path, jobs):
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text("{")
+
+    results = list(iter_results([str(invalid), "missing.json"], CONFIG, jobs=jobs))
+
+    assert results[0]["file"] == str(invalid)
+    assert results[0]["error"].startswith("JSONDecodeError: ")
+    assert results[1] == {
+        "file": "missing.json",
+        "error": "FileNotFoundError: [Errno 2] No such file or directory: 'missing.json'",
+    }
@@ -0,0 +1,20 @@
+import io
+import json
+
+import pytest
+
+from benchmarks.generate import package, write_package
+
+
+@pytest.mark.parametrize("package_type", ["release", "record"])
+@pytest.mark.parametrize("errors", [False, True])
+@pytest.mark.parametrize("extensions", [[], ["http://example.com/extension.json"]])
+def test_write_package(package_type, errors, extensions):
+    f = io.StringIO()
+    write_package(f, package_type, 12, errors=errors, extensions=extensions)
+
+    data = json.loads(f.getvalue())
+
+    assert data == package(package_type, 12, errors=errors, extensions=extensions)
+    assert len(data[f"{package_type}s"]) == 12
+    assert ("extensions" in data) is bool(extensions)
@@ -3,9 +3,11 @@ import os
 import shutil
 import tempfile
 
+import pytest
 from click.testing import CliRunner
 
 from libcoveocds.__main__ import main
+from libcoveocds.lib.api import FINDINGS
 
 
 def test_basic():
@@ -28,6 +30,47 @@ def test_old_schema():
     assert data.get("version_used") == "1.0"
 
 
+def test_valid_only():
+    runner = CliRunner()
+    result = runner.invoke(
+        main, ["--valid-only", os.path.join("tests", "fixtures", "common_checks", "records_invalid_releases.json")]
+    )
+    data = json.loads(result.output)
+
+    assert result.exit_code == 1
+    assert data["valid"] is False
+
+
+@pytest.mark.parametrize("filename", ["dupe_ids_1.json", "records_invalid_releases.json"])
+def test_output_format_jsonl(filename):
+    filename = os.path.join("tests", "fixtures", "common_checks", filename)
+
+    runner = CliRunner()
+    expected = json.loads(runner.invoke(main, [filename]).output)
+    result = runner.invoke(main, ["--output-format", "jsonl", filename])
+    lines = [json.loads(line) for line in result.output.splitlines()]
+
+    assert result.exit_code == 0
+    assert list(lines[-1]) == ["summary"]
+
+    # Reassemble the results from the findings.
+    context = {}
+    for line in lines:
+        ((name, value),) = line.items()
+        if name == "summary":
+            context.update(value)
+        elif name == "validation_errors":
+            context.setdefault(name, []).append(value)
+        else:
+            ((key, item),) = value.items()
+            if name in {"conformance_errors", "additional_checks"}:
+                context.setdefault(name, {}).setdefault(key, []).append(item)
+            else:
+                context.setdefault(name, {})[key] = item
+
+    assert context == {key: value for key, value in expected.items() if value or key not in FINDINGS}
+
+
 def test_set_output_dir():
     output_dir = tempfile.mkdtemp(
         prefix="lib-cove-ocds-tests-",
@@ -116,3 +159,16 @@ def test_set_output_dir_and_convert():
         assert filename.endswith(".csv")
 
     shutil.rmtree(output_dir)
+
+
+def test_batch():
+    path = os.path.join("tests", "fixtures", "common_checks", "basic_1.json")
+    runner = CliRunner()
+    result = runner.invoke(main, ["batch", path, "missing.json"])
+    lines = [json.loads(line) for line in result.output.splitlines()]
+
+    assert result.exit_code == 1
+    assert lines[0]["file"] == path
+    assert lines[0]["result"]["version_used"] == "1.1"
+    assert lines[1]["file"] == "missing.json"
+    assert lines[1]["error"].startswith("FileNotFoundError: ")
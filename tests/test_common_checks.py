@@ -567,3 +567,43 @@ def test_ref_error(tmpdir):
     schema = libcoveocds.schema.SchemaOCDS("1.1", json_data)
 
     libcoveocds.common_checks.common_checks_ocds({"file_type": "json"}, tmpdir, json_data, schema)
+
+
+def test_ref_error_not_shared(tmpdir):
+    libcoveocds.schema.schema_cache_clear()
+    url = "https://raw.githubusercontent.com/open-contracting/lib-cove-ocds/main/tests/fixtures/extensions/unresolvable/extension.json"
+    bad = {"version": "1.1", "extensions": [url], "releases": [{"unresolvable": "1"}]}
+    good = {"version": "1.1", "extensions": [url], "releases": [{"id": "1"}]}
+
+    schema = libcoveocds.schema.SchemaOCDS("1.1", bad, CONFIG)
+    libcoveocds.common_checks.common_checks_ocds({"file_type": "json"}, tmpdir, bad, schema)
+    assert schema.json_deref_error == "PointerToNowhere: '/definitions/Unresolvable' does not exist"
+
+    # The error depends on the data, so it isn't shared with other instances with the same profile.
+    other = libcoveocds.schema.SchemaOCDS("1.1", good, CONFIG)
+    libcoveocds.common_checks.common_checks_ocds({"file_type": "json"}, tmpdir, good, other)
+    assert other.builder is schema.builder
+    assert other.json_deref_error is None
+
+
+@pytest.mark.skipif(CONFIG, reason="not in web context")
+def test_schema_path_index():
+    output_dir = tempfile.mkdtemp(prefix="libcoveocds-tests-", dir=tempfile.gettempdir())
+    schema = libcoveocds.schema.SchemaOCDS(record_pkg=True)
+    with open(fixture_path("fixtures", "common_checks", "records_invalid_releases.json")) as fp:
+        json_data = json.load(fp)
+
+    try:
+        libcoveocds.common_checks.common_checks_ocds({"file_type": "json"}, output_dir, json_data, schema)
+    finally:
+        shutil.rmtree(output_dir)
+
+    index = schema.get_schema_path_index()
+
+    assert index["records/releases"] == {
+        "schema_title": "Releases",
+        "schema_description_safe": "<p>An array of linking identifiers or releases</p>\n",
+        "docs_ref": "record-package-schema.json,/definitions/record,releases",
+    }
+    # The index is shared by schemas with the same profile.
+    assert libcoveocds.schema.SchemaOCDS(record_pkg=True).get_schema_path_index() is index
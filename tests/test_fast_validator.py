@@ -0,0 +1,152 @@
+import json
+import shutil
+import tempfile
+
+import pytest
+from jsonschema import FormatChecker
+from libcove.lib.common import get_schema_validation_errors, validator
+from referencing import Registry, Resource
+
+from libcoveocds import fast_validator
+from libcoveocds.api import ocds_json_output
+from libcoveocds.config import LibCoveOCDSConfig
+from libcoveocds.schema import SchemaOCDS
+from tests import fixture_path
+
+RELEASE_SCHEMA = {
+    "id": "https://example.com/release-schema.json",
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "type": "object",
+    "required": ["ocid", "id"],
+    "properties": {
+        "ocid": {"type": "string", "pattern": "^ocds-"},
+        "id": {"type": ["string", "integer"]},
+        "date": {"type": "string", "format": "date-time"},
+        "tag": {
+            "type": "array",
+            "items": {"type": "string", "enum": ["planning", "tender"], "isCodelist": True},
+            "minItems": 1,
+        },
+        "awards": {"type": "array", "items": {"$ref": "#/definitions/Award"}, "uniqueItems": True},
+        "value": {"type": "number", "minimum": 0, "multipleOf": 1},
+        "closed": {"type": "object", "properties": {"a": {}}, "additionalProperties": False},
+    },
+    "definitions": {
+        "Award": {"type": "object", "required": ["id"], "properties": {"id": {"type": ["string", "integer"]}}},
+    },
+}
+PACKAGE_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "type": "object",
+    "required": ["releases"],
+    "properties": {
+        "uri": {"type": "string", "format": "uri"},
+        "releases": {
+            "type": "array",
+            "minItems": 1,
+            "items": {"$ref": "https://example.com/release-schema.json"},
+            "uniqueItems": True,
+        },
+    },
+}
+
+
+class Schema:
+    def get_pkg_schema_obj(self):
+        return PACKAGE_SCHEMA
+
+    def validator(self, cls, format_checker):
+        registry = Registry().with_resource(RELEASE_SCHEMA["id"], Resource.from_contents(RELEASE_SCHEMA))
+        return cls(PACKAGE_SCHEMA, format_checker=format_checker, registry=registry)
+
+
+@pytest.fixture(scope="module")
+def validators():
+    package_validator = Schema().validator(validator, FormatChecker())
+    assert fast_validator.supported(package_validator)
+    return fast_validator.load(fast_validator.generate(package_validator, ["releases", "records"]))
+
+
+@pytest.mark.parametrize(
+    ("release", "expected"),
+    [
+        ({"ocid": "ocds-1", "id": "1"}, True),
+        ({"ocid": "ocds-1", "id": 1, "date": "2020-01-01T00:00:00Z", "awards": [{"id": "1"}, {"id": "2"}]}, True),
+        # lib-cove doesn't report invalid codes.
+        ({"ocid": "ocds-1", "id": "1", "tag": ["other"]}, True),
+        ({"ocid": "ocds-1", "id": "1", "closed": {"a": 1}}, True),
+        ({"ocid": "ocds-1"}, False),
+        ({"ocid": "x", "id": "1"}, False),
+        ({"ocid": "ocds-1", "id": True}, False),
+        ({"ocid": "ocds-1", "id": "1", "date": "2020-13-01"}, False),
+        ({"ocid": "ocds-1", "id": "1", "tag": []}, False),
+        ({"ocid": "ocds-1", "id": "1", "awards": [{"id": "1"}, {"id": "1"}]}, False),
+        ({"ocid": "ocds-1", "id": "1", "closed": {"b": 1}}, False),
+        # "multipleOf" isn't compiled.
+        ({"ocid": "ocds-1", "id": "1", "value": 1}, False),
+        ("release", False),
+    ],
+)
+def test_generate(validators, release, expected):
+    package = {"releases": [release]}
+
+    assert validators[None](package) is expected
+    assert validators["releases"](release) is expected
+    assert "records" not in validators
+    # The fast validator never determines that invalid data is valid.
+    if expected:
+        assert not get_schema_validation_errors(package, Schema(), "-", {}, {})
+
+
+def test_generate_unresolvable():
+    schema = {"properties": {"a": {"$ref": "#/definitions/missing"}, "b": {"type": "string"}}}
+    validators = fast_validator.load(fast_validator.generate(validator(schema), []))
+
+    assert validators[None]({"b": "x"})
+    assert not validators[None]({"b": 1})
+    # lib-cove's validator raises an error.
+    assert not validators[None]({"a": 1})
+
+
+def test_get_fast_validators(tmp_path):
+    config = LibCoveOCDSConfig({"context": "api", "fast_validation": True, "schema_cache_dir": str(tmp_path)})
+    schema = SchemaOCDS(lib_cove_ocds_config=config)
+    validators = schema.get_fast_validators()
+
+    with open(fixture_path("fixtures", "api", "basic_1.json")) as f:
+        data = json.load(f)
+
+    assert validators[None](data)
+    assert validators["releases"](data["releases"][0])
+    assert not validators["releases"]({})
+    # The generated source is executed, so it isn't persisted.
+    assert not list(tmp_path.glob("*-fast-validator.json"))
+
+    assert SchemaOCDS(lib_cove_ocds_config=LibCoveOCDSConfig({"context": "api"})).get_fast_validators() is None
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        ("api", "basic_1.json"),
+        ("api", "basic_record_package.json"),
+        ("common_checks", "dupe_ids_1.json"),
+        ("common_checks", "records_invalid_releases.json"),
+        ("common_checks", "releases_non_unique_no_id.json"),
+        ("additional_checks", "empty_fields_records.json"),
+    ],
+)
+@pytest.mark.parametrize("stream", [False, True])
+def test_ocds_json_output_fast_validation(filename, stream):
+    cove_temp_folder = tempfile.mkdtemp(prefix="lib-cove-ocds-tests-", dir=tempfile.gettempdir())
+    json_filename = fixture_path("fixtures", *filename)
+
+    config = LibCoveOCDSConfig({"context": "api", "fast_validation": True})
+
+    try:
+        expected = ocds_json_output(cove_temp_folder, json_filename, stream=stream)
+        results = ocds_json_output(cove_temp_folder, json_filename, lib_cove_ocds_config=config, stream=stream)
+
+        assert json.dumps(results) == json.dumps(expected)
+    finally:
+        shutil.rmtree(cove_temp_folder)
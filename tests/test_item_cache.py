@@ -0,0 +1,95 @@
+import json
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from libcoveocds.api import ocds_json_output
+from libcoveocds.config import LibCoveOCDSConfig
+from libcoveocds.item_cache import ItemCache
+from libcoveocds.schema import SchemaOCDS
+from libcoveocds.stream import ItemChecks
+from tests import fixture_path
+
+
+def test_item_cache(tmp_path):
+    cache = ItemCache(str(tmp_path), ["a"], ttl=60)
+    assert cache.get(b"1") is None
+    cache.set({"hash": b"1", "index": 1, "costs": {"empty_field": 1.0}})
+    assert cache.get(b"1") == {"hash": b"1", "index": 1}
+    cache.close()
+
+    # Results are keyed by the profile.
+    cache = ItemCache(str(tmp_path), ["b"], ttl=60)
+    assert cache.get(b"1") is None
+    cache.close()
+
+    cache = ItemCache(str(tmp_path), ["a"], ttl=60)
+    assert cache.get(b"1") == {"hash": b"1", "index": 1}
+    cache.connection.execute("UPDATE results SET written = ?", (time.time() - 120,))
+
+    # Results expire ttl seconds after they are stored, even if they are used.
+    assert cache.get(b"1") is None
+    cache.close()
+
+    # Expired results are removed when the cache is closed.
+    cache = ItemCache(str(tmp_path), ["a"], ttl=0)
+    assert cache.connection.execute("SELECT COUNT(*) FROM results").fetchone() == (0,)
+    cache.close()
+
+
+@pytest.mark.parametrize(("transient", "expected"), [(False, ItemCache), (True, type(None))])
+def test_item_cache_open(tmp_path, monkeypatch, transient, expected):
+    config = LibCoveOCDSConfig({"context": "api", "item_cache_dir": str(tmp_path)})
+    schema_obj = SchemaOCDS(lib_cove_ocds_config=config)
+    monkeypatch.setattr(schema_obj, "has_transient_errors", lambda: transient)
+    checks = SimpleNamespace(schema_obj=schema_obj, key="releases", additional_checks=[])
+
+    cache = ItemCache.open(checks)
+
+    assert type(cache) is expected
+    if cache is not None:
+        cache.close()
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ocds_json_output_item_cache(tmp_path, monkeypatch, stream, workers):
+    cove_temp_folder = tempfile.mkdtemp(prefix="lib-cove-ocds-tests-", dir=tempfile.gettempdir())
+
+    with open(fixture_path("fixtures", "common_checks", "releases_unique.json")) as f:
+        data = json.load(f)
+    path = tmp_path / "package.json"
+    path.write_text(json.dumps(data))
+
+    config = LibCoveOCDSConfig({"context": "api", "workers": workers, "item_cache_dir": str(tmp_path / "cache")})
+
+    try:
+        ocds_json_output(cove_temp_folder, str(path), lib_cove_ocds_config=config, stream=stream)
+
+        # Insert a release before the others, so that the others move.
+        data["releases"].insert(0, {**data["releases"][0], "id": "new"})
+        path.write_text(json.dumps(data))
+
+        expected = ocds_json_output(cove_temp_folder, str(path), stream=stream)
+
+        indices = []
+        check = ItemChecks.check
+
+        def wrapper(self, index, item, digest=None):
+            indices.append(index)
+            return check(self, index, item, digest)
+
+        if workers == 1:
+            monkeypatch.setattr(ItemChecks, "check", wrapper)
+
+        results = ocds_json_output(cove_temp_folder, str(path), lib_cove_ocds_config=config, stream=stream)
+
+        assert json.dumps(results) == json.dumps(expected)
+        if workers == 1:
+            # The first release is new. The second release was first, and the first release's results aren't cached.
+            assert indices == [0, 1]
+    finally:
+        shutil.rmtree(cove_temp_folder)
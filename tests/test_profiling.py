@@ -0,0 +1,66 @@
+import tracemalloc
+
+import pytest
+
+from libcoveocds.config import LibCoveOCDSConfig
+from libcoveocds.profiling import Profiler
+
+
+@pytest.mark.parametrize(("profile", "hook"), [(False, False), (True, False), (False, True), (True, True)])
+def test_profiler(profile, hook):
+    calls = []
+    config = LibCoveOCDSConfig(
+        {"profile": profile, "profile_hook": (lambda *args: calls.append(args)) if hook else None}
+    )
+    profiler = Profiler(config.config)
+
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            data = [0] * 100_000
+        del data
+        with profiler.stage("other"):
+            pass
+
+    context = profiler.finish({})
+
+    assert not tracemalloc.is_tracing()
+    if profile or hook:
+        assert list(profiler.timings) == ["outer/inner", "outer/other", "outer"]
+        assert profiler.timings["outer/inner"]["peak_memory"] >= 800_000
+        assert profiler.timings["outer"]["peak_memory"] >= profiler.timings["outer/inner"]["peak_memory"]
+        assert profiler.timings["outer/other"]["peak_memory"] < 800_000
+        assert profiler.timings["outer"]["wall"] >= profiler.timings["outer/inner"]["wall"]
+    else:
+        assert profiler.timings == {}
+    if profile:
+        assert context == {"timings": profiler.timings}
+    else:
+        assert context == {}
+    if hook:
+        assert calls == list(profiler.timings.items())
+    else:
+        assert calls == []
+
+
+def test_profiler_overlap():
+    config = LibCoveOCDSConfig({"profile": True})
+    first = Profiler(config.config)
+    second = Profiler(config.config)
+
+    with first.stage("outer"):
+        with second.stage("other"):
+            pass
+        second.finish({})
+
+        # The first profiler is still active.
+        assert tracemalloc.is_tracing()
+
+    with first.stage("after"):
+        pass
+    first.finish({})
+
+    assert not tracemalloc.is_tracing()
+    # tracemalloc's peak is shared, so it isn't reported for the stages during which both profilers were active.
+    assert first.timings["outer"]["peak_memory"] is None
+    assert second.timings["other"]["peak_memory"] is None
+    assert first.timings["after"]["peak_memory"] is not None
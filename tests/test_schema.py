@@ -1,8 +1,13 @@
 import copy
 import json
+import os
+import time
 
 import pytest
+import requests
 from libcove.lib.common import get_additional_codelist_values
+from ocdsextensionregistry.codelist import Codelist
+from ocdsextensionregistry.profile_builder import ProfileBuilder
 
 import libcoveocds.config
 import libcoveocds.schema
@@ -159,8 +164,12 @@ def test_schema_ocds_constructor(
         ),
     ],
 )
-def test_schema_ocds_extensions(package_data, extensions, invalid_extension, extended, extends_schema):
-    schema = libcoveocds.schema.SchemaOCDS(package_data=package_data)
+@pytest.mark.parametrize("fetch_workers", [1, 10])
+def test_schema_ocds_extensions(package_data, extensions, invalid_extension, extended, extends_schema, fetch_workers):
+    libcoveocds.schema.schema_cache_clear()
+    config = libcoveocds.config.LibCoveOCDSConfig({"fetch_workers": fetch_workers})
+
+    schema = libcoveocds.schema.SchemaOCDS(package_data=package_data, lib_cove_ocds_config=config)
     assert schema.extensions == extensions
     assert not schema.extended
 
@@ -202,3 +211,135 @@ def test_get_additional_codelist_values_replaced():
         "codelist_amend_urls": [],
         "values": ["foo"],
     }
+
+
+def test_get_codelist_table():
+    schema_obj = libcoveocds.schema.SchemaOCDS(select_version="1.1")
+
+    table = schema_obj.get_codelist_table()
+    field = table[("releases", "tender")]["status"]
+
+    assert "active" in field.codes
+    assert isinstance(field.codes, frozenset)
+    assert field.path == "releases/tender/status"
+    assert field.info["codelist"] == "tenderStatus.csv"
+    assert field.info["isopen"] is False
+    # Fields with the same codelist share its codes.
+    assert table[("releases", "tender", "documents")]["documentType"].codes is (
+        table[("releases", "awards", "documents")]["documentType"].codes
+    )
+    # The table is shared by schemas with the same profile.
+    assert libcoveocds.schema.SchemaOCDS(select_version="1.1").get_codelist_table() is table
+
+
+@pytest.mark.parametrize("record_pkg", [False, True])
+def test_schema_cache(record_pkg):
+    libcoveocds.schema.schema_cache_clear()
+
+    first = libcoveocds.schema.SchemaOCDS(package_data={"version": "1.1", "extensions": ["a", "b"]})
+    second = libcoveocds.schema.SchemaOCDS(package_data={"extensions": ["a", "b", "a"]})
+    other = libcoveocds.schema.SchemaOCDS(package_data={"extensions": ["b", "a"]}, record_pkg=record_pkg)
+
+    assert first.builder is second.builder
+    assert first.builder is not other.builder
+    assert libcoveocds.schema.schema_cache_info() == (1, 2, 32, 2)
+
+    first.invalid_extension["a"] = "fetching failed"
+    assert second.invalid_extension == {"a": "fetching failed"}
+    assert other.invalid_extension == {}
+
+
+@pytest.mark.parametrize(("schema_cache_size", "currsize"), [(0, 0), (1, 1)])
+def test_schema_cache_size(schema_cache_size, currsize):
+    libcoveocds.schema.schema_cache_clear()
+    config = libcoveocds.config.LibCoveOCDSConfig({"schema_cache_size": schema_cache_size})
+
+    first = libcoveocds.schema.SchemaOCDS(lib_cove_ocds_config=config)
+    libcoveocds.schema.SchemaOCDS(lib_cove_ocds_config=config, record_pkg=True)
+    third = libcoveocds.schema.SchemaOCDS(lib_cove_ocds_config=config)
+
+    assert first.builder is not third.builder
+    assert libcoveocds.schema.schema_cache_info() == (0, 3, schema_cache_size, currsize)
+
+
+def test_schema_cache_transient(monkeypatch):
+    libcoveocds.schema.schema_cache_clear()
+    calls = []
+
+    def flaky(self):
+        calls.append(self)
+        if len(calls) == 1:
+            raise requests.ConnectionError
+        codelist = Codelist("releaseTag.csv")
+        codelist.extend([{"Code": "tender"}])
+        return [codelist]
+
+    monkeypatch.setattr(ProfileBuilder, "standard_codelists", flaky)
+    monkeypatch.setattr(libcoveocds.schema, "get_schema_codelist_paths", lambda *args, **kwargs: {})
+
+    first = libcoveocds.schema.SchemaOCDS()
+    first.process_codelists()
+    assert first.core_codelists == {}
+    # The profile is discarded, so that the next instance retries the fetch.
+    assert libcoveocds.schema.schema_cache_info().currsize == 0
+
+    second = libcoveocds.schema.SchemaOCDS()
+    second.process_codelists()
+    assert second.core_codelists == {"releaseTag.csv": {"tender"}}
+    assert first.builder is not second.builder
+    assert libcoveocds.schema.schema_cache_info().currsize == 1
+
+    third = libcoveocds.schema.SchemaOCDS()
+    third.process_codelists()
+    assert third.builder is second.builder
+    assert len(calls) == 2
+
+
+def test_schema_cache_dir(tmp_path, monkeypatch):
+    libcoveocds.schema.schema_cache_clear()
+    config = libcoveocds.config.LibCoveOCDSConfig({"schema_cache_dir": str(tmp_path)})
+    package_data = {"version": "1.1", "extensions": [METRICS_EXT]}
+
+    schema = libcoveocds.schema.SchemaOCDS(package_data=package_data, lib_cove_ocds_config=config)
+    schema_obj = schema.get_schema_obj()
+    schema.process_codelists()
+    extended_codelists = schema.extended_codelists
+
+    # A new process would have an empty in-memory cache.
+    libcoveocds.schema.schema_cache_clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError
+
+    monkeypatch.setattr("ocdsextensionregistry.ProfileBuilder.get_standard_file_contents", fail)
+    monkeypatch.setattr("ocdsextensionregistry.ProfileBuilder.patched_release_schema", fail)
+    monkeypatch.setattr("ocdsextensionregistry.ProfileBuilder.standard_codelists", fail)
+
+    schema = libcoveocds.schema.SchemaOCDS(package_data=package_data, lib_cove_ocds_config=config)
+    assert schema.get_schema_obj() == schema_obj
+    assert schema.extended is True
+    assert schema.invalid_extension == {}
+    assert schema.extensions[METRICS_EXT]["name"] == "Metrics"
+    schema.process_codelists()
+    assert schema.extended_codelists == extended_codelists
+    assert "Metric" in schema.get_schema_obj(deref=True)["definitions"]
+
+
+def test_schema_cache_dir_expiry_and_eviction(tmp_path):
+    cache = libcoveocds.schema._DiskCache(str(tmp_path), ("1__1__5",), ttl=60, max_bytes=20)  # noqa: SLF001
+
+    assert cache.get("a") is None
+    cache.set("a", {"value": 1})
+    assert cache.get("a") == {"value": 1}
+
+    path = tmp_path / f"{cache.digest}-a.json"
+    os.utime(path, (time.time() - 120, time.time() - 120))
+    assert cache.get("a") is None
+
+    cache.set("b", "b" * 5)
+    cache.set("c", "c" * 5)
+    cache.set("d", "d" * 5)
+    assert sorted(p.name.split("-")[1] for p in tmp_path.iterdir()) == ["c.json", "d.json"]
+
+    (tmp_path / f"{cache.digest}-c.json").write_text("{")
+    assert cache.get("c") is None
@@ -0,0 +1,130 @@
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from libcoveocds.api import ocds_json_output
+from libcoveocds.config import LibCoveOCDSConfig
+from libcoveocds.server import make_server
+from tests import fixture_path
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+@pytest.fixture
+def config():
+    config = LibCoveOCDSConfig()
+    config.config["context"] = "api"
+    return config
+
+
+@pytest.fixture
+def server(config):
+    server = make_server(config, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None):
+    connection = http.client.HTTPConnection(*server.server_address[:2])
+    connection.request(method, path, body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_status(server):
+    status, data = request(server, "GET", "/status")
+
+    assert status == 200
+    assert data["requests"] == {"active": 0, "total": 0, "failed": 0}
+    assert set(data["schema_cache"]) == {"hits", "misses", "maxsize", "currsize"}
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "body", "expected_status", "error"),
+    [
+        ("GET", "/validate", None, 404, "Not found"),
+        ("POST", "/status", b"{}", 404, "Not found"),
+        ("POST", "/validate", b"{", 400, "The request body is not valid JSON"),
+        ("POST", "/validate", b"[]", 400, "The request body is not a JSON object."),
+    ],
+)
+def test_error(server, method, path, body, expected_status, error):
+    status, data = request(server, method, path, body)
+
+    assert status == expected_status
+    assert data["error"].startswith(error)
+
+
+@pytest.mark.parametrize("content_length", [None, "x", "-1"])
+def test_error_content_length(server, content_length):
+    connection = http.client.HTTPConnection(*server.server_address[:2])
+    connection.putrequest("POST", "/validate")
+    if content_length is not None:
+        connection.putheader("Content-Length", content_length)
+    connection.endheaders()
+    response = connection.getresponse()
+
+    assert response.status == 400
+    assert json.loads(response.read()) == {"error": "The Content-Length header is missing or invalid."}
+    assert request(server, "GET", "/status")[1]["requests"] == {"active": 0, "total": 1, "failed": 1}
+
+
+def test_validate(server, config):
+    path = fixture_path("fixtures", "common_checks", "basic_1.json")
+    with open(path, "rb") as f:
+        body = f.read()
+
+    status, data = request(server, "POST", "/validate", body)
+
+    assert status == 200
+    assert data == json.loads(json.dumps(ocds_json_output(tempfile.mkdtemp(), path, lib_cove_ocds_config=config)))
+    assert request(server, "GET", "/status")[1]["requests"] == {"active": 0, "total": 1, "failed": 0}
+
+
+def test_validate_concurrent(server, config):
+    # The validation errors of this package include lib-cove's oneOf errors.
+    path = fixture_path("fixtures", "common_checks", "records_invalid_releases.json")
+    with open(path, "rb") as f:
+        body = f.read()
+
+    expected = json.loads(json.dumps(ocds_json_output(tempfile.mkdtemp(), path, lib_cove_ocds_config=config)))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda _: request(server, "POST", "/validate", body), range(16)))
+
+    assert responses == [(200, expected)] * 16
+    assert request(server, "GET", "/status")[1]["requests"] == {"active": 0, "total": 16, "failed": 0}
+
+
+def test_unix_socket(config):
+    path = os.path.join(tempfile.mkdtemp(), "libcoveocds.sock")
+    server = make_server(config, socket_path=path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        connection = UnixHTTPConnection(path)
+        connection.request("GET", "/status")
+        response = connection.getresponse()
+
+        assert response.status == 200
+        assert json.loads(response.read())["requests"]["total"] == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+        os.remove(path)
@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from libcoveocds.common_checks import WEB_EXTRA_INSTALLED
+
+
+def imported(code):
+    script = f"import sys\n{code}\nprint(__import__('json').dumps(sorted(sys.modules)))"
+    return set(json.loads(subprocess.run([sys.executable, "-c", script], capture_output=True, check=True).stdout))
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["bleach", "markdown_it", "libcoveocds.lib.web", "libcove.lib.converters", "libcoveocds.server"],
+)
+def test_import_api(module):
+    assert module not in imported("import libcoveocds.api")
+
+
+@pytest.mark.parametrize("module", ["libcoveocds.api", "libcove.lib.common", "jsonschema", "ocdsextensionregistry"])
+def test_import_cli(module):
+    assert module not in imported("import libcoveocds.__main__")
+
+
+@pytest.mark.skipif(not WEB_EXTRA_INSTALLED, reason="web extra not installed")
+def test_import_web():
+    modules = imported(
+        "from libcoveocds.api import ocds_json_output\n"
+        "from libcoveocds.config import LibCoveOCDSConfig\n"
+        "ocds_json_output('', 'tests/fixtures/api/basic_1.json', "
+        "lib_cove_ocds_config=LibCoveOCDSConfig({'context': 'web'}))"
+    )
+
+    assert {"bleach", "markdown_it", "libcoveocds.lib.web"} <= modules
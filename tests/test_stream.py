@@ -0,0 +1,86 @@
+import pytest
+
+from libcoveocds.exceptions import LibCoveOCDSError
+from libcoveocds.stream import iter_items, iter_lines, read_lines_metadata, read_metadata
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (
+            '{"uri": "x", "releases": [{"id": "1"}], "version": "1.1"}',
+            ({"uri": "x", "releases": [], "version": "1.1"}, "releases"),
+        ),
+        (
+            '{"records": [], "publisher": {"name": "x", "scheme": [1, {}]}}',
+            ({"records": [], "publisher": {"name": "x", "scheme": [1, {}]}}, "records"),
+        ),
+        ('{"releases": {"id": "1"}}', ({"releases": {"id": "1"}}, None)),
+        ('{"version": 1.1}', ({"version": 1.1}, None)),
+        ('{"releases": [], "records": []}', None),
+        ('[{"id": "1"}]', None),
+    ],
+)
+def test_read_metadata(tmp_path, data, expected):
+    path = tmp_path / "package.json"
+    path.write_text(data)
+
+    assert read_metadata(path) == expected
+
+
+def test_iter_items(tmp_path):
+    path = tmp_path / "package.json"
+    path.write_text('{"releases": [{"id": "1", "value": 1.5}, 2], "records": [{"ocid": "x"}]}')
+
+    assert list(iter_items(path, "releases")) == [{"id": "1", "value": 1.5}, 2]
+
+
+@pytest.mark.parametrize(
+    ("data", "record_pkg", "expected"),
+    [
+        (
+            '{"uri": "x", "releases": [{"id": "1"}]}\n{"releases": []}\n',
+            None,
+            ({"uri": "x", "releases": []}, "releases", True),
+        ),
+        ('{"records": [{"ocid": "x"}]}\n', None, ({"records": []}, "records", True)),
+        ('{"ocid": "x", "id": "1"}\n', None, (None, "releases", False)),
+        ('{"ocid": "x", "id": "1"}\n', True, (None, "records", False)),
+        ('{"ocid": "x", "releases": [{"url": "y"}]}\n', None, (None, "records", False)),
+        ('{"ocid": "x", "compiledRelease": {}}\n', None, (None, "records", False)),
+        ("1\n", None, (None, "releases", False)),
+        ("\n", None, (None, None, False)),
+    ],
+)
+def test_read_lines_metadata(tmp_path, data, record_pkg, expected):
+    path = tmp_path / "package.jsonl"
+    path.write_text(data)
+
+    assert read_lines_metadata(path, record_pkg) == expected
+
+
+def test_iter_lines(tmp_path):
+    path = tmp_path / "package.jsonl"
+    path.write_text('{"id": "1", "value": 1.5}\n2\n\n')
+
+    assert list(iter_lines(path, "releases")) == [{"id": "1", "value": 1.5}, 2]
+
+    path.write_text('{"releases": [{"id": "1"}, 2]}\n{"releases": [], "uri": "x"}\n{"releases": [3]}')
+
+    assert list(iter_lines(path, "releases", packages=True)) == [{"id": "1"}, 2, 3]
+
+
+@pytest.mark.parametrize(
+    ("data", "packages", "message"),
+    [
+        ('{"id": "1"}\n\n{"id": "2"}\n', False, "Line 2 is blank"),
+        ('{"id": "1"}\n{"id": \n', False, "Line 2 is not valid JSON: "),
+        ('{"releases": []}\n{"records": []}\n', True, "Line 2 is not a package with a releases array"),
+    ],
+)
+def test_iter_lines_error(tmp_path, data, packages, message):
+    path = tmp_path / "package.jsonl"
+    path.write_text(data)
+
+    with pytest.raises(LibCoveOCDSError, match=message):
+        list(iter_lines(path, "releases", packages=packages))